@@ -0,0 +1,163 @@
+"""
+Buffered audit log of the commands carried out by the bot.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+TEXT = "text"
+JSONL = "jsonl"
+
+# strftime format of the timestamps written in the TEXT format.
+TIME_FORMAT = "%m/%d/%Y %H:%M:%S"
+
+
+class AuditLog(object):
+    """Appends timestamped messages to a log file from a background thread.
+
+    'log' only records the time and message in an in-memory ring buffer, so
+    it is cheap to call from command handlers. A flusher thread writes the
+    buffered messages out in batches, whenever 'flush_size' messages are
+    waiting or 'flush_interval' seconds have passed. If messages arrive faster
+    than they can be written and the buffer fills up, the oldest are discarded
+    and counted in 'dropped'.
+
+    The file may be rotated when it grows beyond 'max_bytes' or when it is
+    older than 'rotate_interval' seconds: 'log.txt' is renamed to 'log.txt.1',
+    'log.txt.1' to 'log.txt.2', and so on, keeping at most 'backups' old
+    files.
+
+    Buffered messages are always written out by 'close', which is also called
+    automatically when the interpreter exits.
+    """
+    def __init__(self, path="log.txt", format=TEXT, capacity=4096,
+                 flush_size=64, flush_interval=0.5, max_bytes=None,
+                 rotate_interval=None, backups=5):
+        """
+        :param path: The file to which messages are appended.
+        :param format: TEXT for lines of the form '[time] message', or JSONL
+                       for one JSON object per line, with keys 'time' (a UNIX
+                       timestamp) and 'message'.
+        :param capacity: The maximum number of messages held in memory.
+        :param flush_size: The number of buffered messages that triggers an
+                           immediate write.
+        :param flush_interval: The maximum time, in seconds, that a message
+                               stays in memory before it is written.
+        :param max_bytes: The size, in bytes, above which the file is rotated,
+                          or None to disable size-based rotation.
+        :param rotate_interval: The age, in seconds, above which the file is
+                                rotated, or None to disable time-based
+                                rotation.
+        :param backups: The number of rotated files to keep.
+        """
+        if format not in (TEXT, JSONL):
+            raise ValueError('Unknown log format: %r.' % format)
+
+        self.path = path
+        self.format = format
+        self.capacity = capacity
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backups = backups
+        self.dropped = 0
+
+        self._buffer = deque(maxlen=capacity)
+        self._wake = threading.Event()
+        self._closed = False
+        self._write_lock = threading.Lock()
+        self._open()
+
+        self._thread = threading.Thread(
+            target=self._run, name="Audit Log Flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, message):
+        """Queue 'message' to be written to the log with the current time."""
+        if len(self._buffer) == self.capacity:
+            self.dropped += 1
+        self._buffer.append((time.time(), message))
+        if len(self._buffer) >= self.flush_size:
+            self._wake.set()
+
+    def flush(self):
+        """Write out all buffered messages immediately."""
+        with self._write_lock:
+            self._write_batch()
+
+    def close(self):
+        """Write out all buffered messages, stop the flusher thread and close
+           the file. Further calls have no effect.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        with self._write_lock:
+            self._write_batch()
+            self._file.close()
+        atexit.unregister(self.close)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            with self._write_lock:
+                self._write_batch()
+
+    def _open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._opened_at = time.time()
+        # Cache of the last formatted timestamp, as consecutive messages are
+        # usually logged within the same second.
+        self._last_second, self._last_stamp = None, None
+
+    def _write_batch(self):
+        # The caller must hold '_write_lock'.
+        buffer = self._buffer
+        if not buffer:
+            return
+        lines = []
+        while buffer:
+            lines.append(self._format(*buffer.popleft()))
+        self._file.write("".join(lines))
+        self._file.flush()
+        if self._should_rotate():
+            self._rotate()
+
+    def _format(self, timestamp, message):
+        if self.format == JSONL:
+            return json.dumps({"time": timestamp, "message": message}) + "\n"
+        second = int(timestamp)
+        if second != self._last_second:
+            self._last_second = second
+            self._last_stamp = time.strftime(
+                TIME_FORMAT, time.localtime(second))
+        return "[%s] %s\n" % (self._last_stamp, message)
+
+    def _should_rotate(self):
+        if self.max_bytes is not None and self._file.tell() >= self.max_bytes:
+            return True
+        return self.rotate_interval is not None and \
+            time.time() - self._opened_at >= self.rotate_interval
+
+    def _rotate(self):
+        self._file.close()
+        if self.backups > 0:
+            for index in range(self.backups - 1, 0, -1):
+                source = "%s.%d" % (self.path, index)
+                if os.path.exists(source):
+                    os.replace(source, "%s.%d" % (self.path, index + 1))
+            os.replace(self.path, "%s.1" % self.path)
+        else:
+            os.remove(self.path)
+        self._open()
@@ -0,0 +1,63 @@
+"""Measures the rate at which audit events are logged by 'AuditLog', compared
+   with opening the log file, formatting the time and closing the file for
+   each event, as 'main.py' once did. Run from the repository's root
+   directory:
+
+       python -m benchmarks.auditlog
+"""
+import os
+import shutil
+import tempfile
+import timeit
+from datetime import datetime
+
+from auditlog import AuditLog, JSONL, TEXT
+
+EVENTS = 20000
+REPEAT = 5
+
+
+def open_per_event_log(path, message):
+    # The former way of logging each event.
+    now = datetime.now()
+    dt_str = now.strftime("%m/%d/%Y %H:%M:%S")
+    with open(path, "a") as f:
+        f.write(f"[{dt_str}] {message}\n")
+
+
+def best_time(function):
+    return min(timeit.repeat(function, number=1, repeat=REPEAT))
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'log.txt')
+    messages = ['[realm] Sent player%d home' % event
+                for event in range(EVENTS)]
+    try:
+        def open_per_event():
+            for message in messages:
+                open_per_event_log(path, message)
+
+        def audit_log(format):
+            # Every event is written by the time 'close' returns.
+            def run():
+                audit = AuditLog(path, format=format, capacity=EVENTS)
+                log = audit.log
+                for message in messages:
+                    log(message)
+                audit.close()
+            return run
+
+        results = [('Open per event', best_time(open_per_event))]
+        for format in (TEXT, JSONL):
+            results.append(('AuditLog, %s' % format,
+                            best_time(audit_log(format))))
+        for title, seconds in results:
+            print('%-32s %10.0f events/s' % (title, EVENTS / seconds))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Measures the time taken to route a chat message to its command handler by
+   'CommandRegistry.dispatch', with the commands registered by 'RealmBot',
+   compared with the 'if'/'elif' chain once used by 'main.py'. The handlers
+   themselves do nothing. Run from the repository's root directory:
+
+       python -m benchmarks.commands
+"""
+import timeit
+
+from commands import CommandRegistry
+from host import coordinate
+
+MESSAGES = (
+    ('Chat', 'hello there, how is everyone?'),
+    ('!home', '!home'),
+    ('!tp NAME', '!tp player'),
+    ('!sethome X Y Z', '!sethome 100 64 -2.5'),
+    ('!sethome, wrong arity', '!sethome 100 64'),
+    ('Unknown command', '!warp spawn'),
+)
+
+NUMBER, REPEAT = 100000, 5
+
+
+def ignore(*args):
+    pass
+
+
+def registry():
+    commands = CommandRegistry()
+    commands.handle_usage_error = commands.handle_unknown = ignore
+    commands.register("tp", ignore, str, usage="!tp NAME")
+    commands.register("sethome", ignore, coordinate, coordinate, coordinate,
+                      usage="!sethome X Y Z")
+    commands.register("home", ignore)
+    return commands
+
+
+def if_elif_dispatch(name, message):
+    # The former routing of chat messages, whose handlers then checked their
+    # own arguments.
+    if message is not None and len(message) > 1:
+        if message[0] == "!":
+            x = message.split()
+
+            if x[0] == "!tp":
+                ignore(x, name)
+            elif x[0] == "!sethome":
+                ignore(x, name)
+            elif x[0] == "!home":
+                ignore(name)
+            else:
+                ignore("Invalid Command :(")
+
+
+def best_time(function, message):
+    # The least time taken by one call, in nanoseconds.
+    return min(timeit.repeat(lambda: function('player', message),
+                             number=NUMBER, repeat=REPEAT)) / NUMBER * 1e9
+
+
+def main():
+    dispatch = registry().dispatch
+    print('%-24s %10s %16s' % ('', 'if/elif', 'CommandRegistry'))
+    for title, message in MESSAGES:
+        print('%-24s %7.0f ns %13.0f ns'
+              % (title, best_time(if_elif_dispatch, message),
+                 best_time(dispatch, message)))
+
+
+if __name__ == '__main__':
+    main()
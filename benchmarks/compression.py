@@ -0,0 +1,163 @@
+"""Measures the time taken to replay a packet capture of a play session with
+   compression enabled, decompressing each packet only as far as it is read,
+   compared with decompressing each in full before reading its ID, as
+   'PacketReactor.decode_packet' once did. Run from the repository's root
+   directory:
+
+       python -m benchmarks.compression [CAPTURE_FILE]
+
+   Without a capture file, a synthetic one is used: that of 'benchmarks.replay'
+   with a compression threshold of 256 bytes, under which its packets are
+   sent uncompressed, and with a compressed 32 KB chunk, which pyCraft does
+   not decode, about every 4 ticks, as when walking, and a whole-map update
+   about every 100 ticks.
+"""
+import io
+import random
+import sys
+import timeit
+import zlib
+
+from minecraft.networking import packets
+from minecraft.networking.capture import PacketCapture, read_capture, replay
+from minecraft.networking.connection import Connection, PlayingReactor
+from minecraft.networking.packets import Packet
+from minecraft.networking.types import VarInt
+
+from benchmarks.replay import TICK, synthetic_capture
+from test.test_map_packet import map_update
+
+COMPRESSION_THRESHOLD = 256
+CHUNK_SIZE = 32768
+
+# The number of frames of the synthetic capture between chunks and between
+# map updates.
+CHUNK_FRAMES = 4 * len(TICK)
+MAP_FRAMES = 100 * len(TICK)
+
+# The ID of the chunk data packet in the latest protocol version.
+CHUNK_DATA_ID = 0x20
+
+# The two reactors are measured alternately, 'REPEAT' times each, as the time
+# taken may vary over the run.
+REPEAT = 7
+
+
+class FullDecompressionReactor(PlayingReactor):
+    """Decodes packets as 'PlayingReactor' once did, decompressing each in
+       full before reading its ID.
+    """
+    def decode_packet(self, frame):
+        packet_data = packets.PacketView(frame)
+
+        if self.connection.options.compression_enabled:
+            decompressed_size = VarInt.read(packet_data)
+            if decompressed_size > 0:
+                decompressor = zlib.decompressobj()
+                decompressed_packet = decompressor.decompress(
+                    packet_data.data[packet_data.offset:])
+                assert len(decompressed_packet) == decompressed_size, \
+                    'decompressed length %d, but expected %d' % \
+                    (len(decompressed_packet), decompressed_size)
+                packet_data = packets.PacketView(decompressed_packet)
+
+        packet_id = VarInt.read(packet_data)
+        packet_class = self.clientbound_packets.get(packet_id)
+
+        if self.connection.options.skip_unused_packets and \
+           not self.packet_needed(packet_class or packets.Packet):
+            return None
+
+        if packet_class is not None:
+            packet = packet_class()
+            packet.context = self.connection.context
+            packet.read(packet_data)
+        else:
+            packet = packets.Packet()
+            packet.context = self.connection.context
+            packet.id = packet_id
+        return packet
+
+
+def compressed_frame(data):
+    # The frame of the packet data 'data', compressed as by a server.
+    if len(data) < COMPRESSION_THRESHOLD:
+        return b'\x00' + data
+    return VarInt.encode(len(data)) + zlib.compress(data)
+
+
+def compressed_capture():
+    # The synthetic capture of 'benchmarks.replay', compressed, with chunks
+    # and map updates added.
+    rng = random.Random(0)
+    connection = Connection('localhost')
+    connection.options.compression_enabled = True
+    connection.options.compression_threshold = COMPRESSION_THRESHOLD
+
+    file = io.BytesIO()
+    capture = PacketCapture(file)
+    for index, (_time, protocol_version, _threshold, frame) in enumerate(
+            read_capture(io.BytesIO(synthetic_capture()))):
+        context = connection.context
+        context.protocol_version = protocol_version
+        capture.record(compressed_frame(frame), connection)
+        if index % CHUNK_FRAMES == 0:
+            # Chunk sections hold runs of a few block states.
+            chunk = VarInt.encode(CHUNK_DATA_ID) + b''.join(
+                bytes((rng.choice(b'\x01\x02\x03\x09'),))
+                * rng.randint(1, 64) for _ in range(CHUNK_SIZE // 32))
+            capture.record(compressed_frame(chunk), connection)
+        if index % MAP_FRAMES == 0:
+            packet = map_update(index // MAP_FRAMES, 0, 0, 128, 128,
+                                seed=index)
+            packet_buffer = packets.PacketBuffer()
+            VarInt.send(packet.id, packet_buffer)
+            packet.write_fields(packet_buffer)
+            capture.record(compressed_frame(packet_buffer.get_writable()),
+                           connection)
+    capture.close()
+    return file.getvalue()
+
+
+def replay_times(data, reactor_classes, listen, **kwds):
+    # The least time taken to replay the capture 'data', in seconds, through
+    # a new connection made with the keyword arguments 'kwds', reacting to
+    # packets with each of 'reactor_classes' in turn, on which a listener for
+    # every packet is registered if 'listen' is True.
+    def run(reactor_class):
+        connection = Connection('localhost', **kwds)
+        if listen:
+            connection.register_packet_listener(lambda packet: None, Packet)
+        replay(connection, io.BytesIO(data), reactor_class=reactor_class)
+
+    times = [float('inf')] * len(reactor_classes)
+    for _ in range(REPEAT):
+        for index, reactor_class in enumerate(reactor_classes):
+            times[index] = min(times[index], timeit.timeit(
+                lambda: run(reactor_class), number=1))
+    return times
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            data = file.read()
+    else:
+        data = compressed_capture()
+    frames = sum(1 for _frame in read_capture(io.BytesIO(data)))
+    print('%d frames, %d bytes' % (frames, len(data)))
+
+    print('%-32s %14s %14s' % ('', 'Full (before)', 'Incremental'))
+    for title, listen, kwds in (
+        ('Listener for every packet', True, {}),
+        ('No listeners, unused skipped', False,
+         {'skip_unused_packets': True}),
+    ):
+        times = replay_times(
+            data, (FullDecompressionReactor, PlayingReactor), listen, **kwds)
+        print('%-32s' % title + ''.join(
+            ' %11.1f ms' % (seconds * 1000) for seconds in times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Measures the time taken by N concurrent connections to a local fake server
+   to log in and receive a stream of chat messages, using 'AsyncConnection'
+   on one event loop compared with 'Connection' and its networking threads.
+   The server's own threads are the same in both cases. Run from the
+   repository's root directory:
+
+       python -m benchmarks.connections
+"""
+import asyncio
+import threading
+import timeit
+
+from minecraft.networking.async_connection import AsyncConnection
+from minecraft.networking.connection import Connection
+from minecraft.networking.packets import clientbound
+
+from test.fake_server import FakeServer
+from test.test_packets import sample_packet
+
+CLIENTS = 1, 10, 50, 100
+MESSAGES = 500
+TIMEOUT = 60
+
+
+class ChatServer(FakeServer):
+    """Sends 'MESSAGES' chat messages to each client, followed by a
+       keep-alive, and then waits for the client to close the connection.
+    """
+    def play(self, connection):
+        chat = sample_packet(clientbound.play.ChatMessagePacket,
+                             connection.context)
+        for _ in range(MESSAGES):
+            connection.write_packet(chat)
+        connection.write_packet(
+            clientbound.play.KeepAlivePacket(keep_alive_id=1))
+        while True:
+            connection.read_frame()
+
+
+def threaded_time(server, clients):
+    # The time until every 'Connection' has received the final keep-alive.
+    done = threading.Semaphore(0)
+    connections = []
+    start = timeit.default_timer()
+    try:
+        for _ in range(clients):
+            # Errors once the server stops are of no interest.
+            connection = Connection(server.address, server.port,
+                                    username='bot', handle_exception=False)
+            connection.register_packet_listener(
+                lambda packet: None, clientbound.play.ChatMessagePacket)
+            connection.register_packet_listener(
+                lambda packet: done.release(),
+                clientbound.play.KeepAlivePacket)
+            connection.connect()
+            connections.append(connection)
+        for _ in range(clients):
+            if not done.acquire(timeout=TIMEOUT):
+                raise RuntimeError('A connection did not finish.')
+        return timeit.default_timer() - start
+    finally:
+        for connection in connections:
+            connection.disconnect(immediate=True)
+
+
+def async_time(server, clients):
+    # The time until every 'AsyncConnection' has received the final
+    # keep-alive, all on one event loop.
+    async def run():
+        loop = asyncio.get_running_loop()
+        connections = []
+        start = loop.time()
+        try:
+            finished = []
+            for _ in range(clients):
+                connection = AsyncConnection(
+                    server.address, server.port, username='bot',
+                    handle_exception=False)
+                done = asyncio.Event()
+                connection.register_packet_listener(
+                    lambda packet: None, clientbound.play.ChatMessagePacket)
+                connection.register_packet_listener(
+                    lambda packet, done=done: done.set(),
+                    clientbound.play.KeepAlivePacket)
+                connection.connect()
+                connections.append(connection)
+                finished.append(done.wait())
+            await asyncio.wait_for(asyncio.gather(*finished), TIMEOUT)
+            return loop.time() - start
+        finally:
+            for connection in connections:
+                connection.disconnect()
+            await asyncio.gather(*(connection.wait_closed()
+                                   for connection in connections))
+    return asyncio.run(run())
+
+
+def main():
+    print('%7s %20s %20s' % ('Clients', 'Connection', 'AsyncConnection'))
+    for clients in CLIENTS:
+        results = []
+        for measure in (threaded_time, async_time):
+            server = ChatServer()
+            try:
+                results.append(measure(server, clients))
+            finally:
+                server.stop()
+        print('%7d' % clients + ''.join(
+            ' %8.3f s %6.0f k/s' % (seconds, clients * MESSAGES / seconds
+                                    / 1000) for seconds in results))
+    print('(k/s: thousands of chat messages received per second)')
+
+
+if __name__ == '__main__':
+    main()
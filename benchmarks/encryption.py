@@ -0,0 +1,173 @@
+"""Measures the rate at which encrypted packet data is received and sent over
+   a local socket pair through 'EncryptedFileObjectWrapper' and
+   'EncryptedSocketWrapper', compared with the original wrappers, which are
+   reproduced here, and with the AES/CFB8 cipher alone. The data is that of
+   the frames of a packet capture (see 'benchmarks.replay'), which are split
+   into frames when received, but not decoded. Run from the repository's root
+   directory:
+
+       python -m benchmarks.encryption [CAPTURE_FILE]
+"""
+import io
+import os
+import socket
+import sys
+import threading
+import timeit
+
+from minecraft.networking.capture import read_capture
+from minecraft.networking.encryption import (
+    EncryptedFileObjectWrapper, EncryptedSocketWrapper, create_AES_cipher,
+)
+from minecraft.networking.types import VarInt
+
+from benchmarks.framing import read_frames_buffered, read_frames_per_byte
+from benchmarks.replay import synthetic_capture
+
+# The size of the batches in which packets are sent, as by 'Connection'.
+BATCH_SIZE = 65536
+
+REPEAT = 5
+
+
+class OriginalFileObjectWrapper(object):
+    # The original 'EncryptedFileObjectWrapper', which could only 'read'.
+    def __init__(self, file_object, decryptor):
+        self.actual_file_object = file_object
+        self.decryptor = decryptor
+
+    def read(self, length):
+        return self.decryptor.update(self.actual_file_object.read(length))
+
+    def fileno(self):
+        return self.actual_file_object.fileno()
+
+
+class CopyingFileObjectWrapper(EncryptedFileObjectWrapper):
+    # 'readinto' as first added, decrypting into a new object and copying it.
+    def readinto(self, buffer):
+        length = self.actual_file_object.readinto(buffer)
+        if length:
+            buffer[:length] = self.decryptor.update(buffer[:length])
+        return length
+
+
+class OriginalSocketWrapper(object):
+    # The original 'EncryptedSocketWrapper', which sent with 'send', and so
+    # could send only part of the data, once it was encrypted.
+    def __init__(self, socket, encryptor, decryptor):
+        self.actual_socket = socket
+        self.encryptor = encryptor
+        self.decryptor = decryptor
+
+    def send(self, data):
+        self.actual_socket.send(self.encryptor.update(data))
+
+
+def receive_time(cipher, data, count, wrapper_class, read_frames):
+    # The time taken to receive the 'count' frames in 'data', encrypted with
+    # 'cipher', through 'wrapper_class' with 'read_frames'.
+    server, client = socket.socketpair()
+    stream = wrapper_class(client.makefile('rb', 0), cipher.decryptor())
+    sender = threading.Thread(target=server.sendall,
+                              args=(cipher.encryptor().update(data),))
+    try:
+        start = timeit.default_timer()
+        sender.start()
+        read_frames(stream, count)
+        seconds = timeit.default_timer() - start
+        sender.join()
+        return seconds
+    finally:
+        client.close()
+        server.close()
+
+
+def send_time(cipher, chunks, wrapper_class, method):
+    # The time taken to send each of 'chunks' through 'wrapper_class' with the
+    # method named 'method', while another thread receives them.
+    server, client = socket.socketpair()
+    wrapper = wrapper_class(client, cipher.encryptor(), cipher.decryptor())
+    send = getattr(wrapper, method)
+    total = sum(map(len, chunks))
+
+    def receive():
+        received, buffer = 0, bytearray(BATCH_SIZE)
+        while received < total:
+            received += server.recv_into(buffer)
+    receiver = threading.Thread(target=receive)
+    try:
+        start = timeit.default_timer()
+        receiver.start()
+        for chunk in chunks:
+            send(chunk)
+        receiver.join()
+        return timeit.default_timer() - start
+    finally:
+        client.close()
+        server.close()
+
+
+def batches(frames):
+    # The frames with their length prefixes, joined into batches of about
+    # 'BATCH_SIZE' bytes.
+    batches, batch = [], bytearray()
+    for frame in frames:
+        batch += frame
+        if len(batch) >= BATCH_SIZE:
+            batches.append(bytes(batch))
+            batch = bytearray()
+    return batches + [bytes(batch)] if batch else batches
+
+
+def cipher_time(cipher, data):
+    decryptor = cipher.decryptor()
+    start = timeit.default_timer()
+    for index in range(0, len(data), BATCH_SIZE):
+        decryptor.update(data[index:index + BATCH_SIZE])
+    return timeit.default_timer() - start
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            capture = file.read()
+    else:
+        capture = synthetic_capture()
+    frames = [VarInt.encode(len(frame)) + frame for _time, _version,
+              _threshold, frame in read_capture(io.BytesIO(capture))]
+    data = b''.join(frames)
+    count = len(frames)
+    cipher = create_AES_cipher(os.urandom(16))
+    print('%d frames, %d bytes' % (count, len(data)))
+
+    benchmarks = (
+        ('Receive, original', lambda: receive_time(
+            cipher, data, count, OriginalFileObjectWrapper,
+            read_frames_per_byte)),
+        ('Receive, readinto and copy', lambda: receive_time(
+            cipher, data, count, CopyingFileObjectWrapper,
+            read_frames_buffered)),
+        ('Receive, readinto in place', lambda: receive_time(
+            cipher, data, count, EncryptedFileObjectWrapper,
+            read_frames_buffered)),
+        ('Send frames, original', lambda: send_time(
+            cipher, frames, OriginalSocketWrapper, 'send')),
+        ('Send frames, sendall', lambda: send_time(
+            cipher, frames, EncryptedSocketWrapper, 'sendall')),
+        ('Send batches, sendall', lambda: send_time(
+            cipher, batches(frames), EncryptedSocketWrapper, 'sendall')),
+        ('Cipher alone', lambda: cipher_time(cipher, data)),
+    )
+    # Each benchmark is run in turn, 'REPEAT' times, as the time taken may
+    # vary over the run.
+    times = [float('inf')] * len(benchmarks)
+    for _ in range(REPEAT):
+        for index, (_title, function) in enumerate(benchmarks):
+            times[index] = min(times[index], function())
+    for (title, _function), seconds in zip(benchmarks, times):
+        print('%-28s %7.1f MB/s' % (title, len(data) / seconds / 1e6))
+
+
+if __name__ == '__main__':
+    main()
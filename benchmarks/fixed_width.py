@@ -0,0 +1,156 @@
+"""Measures the time taken to read and write fixed-width fields, such as
+   'Integer' and 'Double', with the precompiled structs of 'FixedWidthType'
+   and its 'read_from' and 'write_into' methods, compared with the former
+   types, which passed a format string to 'struct' on every call and are
+   reproduced here. Also measures 'SpawnPlayerPacket', whose fields are
+   mostly of fixed width, read in place from a 'PacketView' and, as every
+   packet once was, through 'read' calls on a file-like object. Run from the
+   repository's root directory:
+
+       python -m benchmarks.fixed_width
+"""
+import io
+import struct
+import timeit
+
+from minecraft import SUPPORTED_PROTOCOL_VERSIONS
+from minecraft.networking.connection import ConnectionContext
+from minecraft.networking.packets import (
+    PacketBuffer, PacketView, clientbound,
+)
+from minecraft.networking.types import (
+    Boolean, Byte, Short, UnsignedShort, Integer, Long, Float, Double,
+    VarInt, PrefixedArray,
+)
+
+from test.test_packets import sample_packet
+
+# '(type, value)' of each of a sequence of fields of mixed types.
+FIELDS = ((Boolean, True), (Byte, -5), (Short, -300), (UnsignedShort, 60000),
+          (Integer, -70000), (Long, -2 ** 40), (Float, 1.5), (Double, 2.25))
+
+# Each pair of functions is measured alternately, 'ROUNDS' times each, as the
+# time taken may vary over the run.
+NUMBER, ROUNDS = 1000, 10
+
+
+class OldFixedWidthType(object):
+    format = size = None
+
+    @classmethod
+    def read(cls, file_object):
+        return struct.unpack(cls.format, file_object.read(cls.size))[0]
+
+    @classmethod
+    def send(cls, value, socket):
+        socket.send(struct.pack(cls.format, value))
+
+
+def old_type(data_type):
+    # The former implementation of the fixed-width type 'data_type'.
+    return type(data_type.__name__, (OldFixedWidthType,), {
+        'format': data_type.packer.format, 'size': data_type.packer.size})
+
+
+def best_times(functions):
+    # The least time taken by one call to each of 'functions', in
+    # microseconds, or None for each function that is None.
+    times = [None if function is None else float('inf')
+             for function in functions]
+    for _ in range(ROUNDS):
+        for index, function in enumerate(functions):
+            if function is not None:
+                times[index] = min(times[index], timeit.timeit(
+                    function, number=NUMBER) / NUMBER * 1e6)
+    return times
+
+
+def field_benchmarks(fields):
+    # '(title, function)' of each way of reading or writing 'fields', a
+    # sequence of '(type, value)', or '(title, None)' if 'fields' are the
+    # former types, which do not support it.
+    packet_buffer = PacketBuffer()
+    for data_type, value in fields:
+        data_type.send(value, packet_buffer)
+    data = packet_buffer.get_writable()
+    buffer = bytearray(len(data))
+    in_place = not issubclass(fields[0][0], OldFixedWidthType)
+
+    def read_view():
+        view = PacketView(data)
+        for data_type, _value in fields:
+            data_type.read(view)
+
+    def read_stream():
+        stream = io.BytesIO(data)
+        for data_type, _value in fields:
+            data_type.read(stream)
+
+    def read_from():
+        offset = 0
+        for data_type, _value in fields:
+            _value, offset = data_type.read_from(data, offset)
+
+    def send():
+        packet_buffer = PacketBuffer()
+        for data_type, value in fields:
+            data_type.send(value, packet_buffer)
+
+    def write_into():
+        offset = 0
+        for data_type, value in fields:
+            offset = data_type.write_into(value, buffer, offset)
+
+    return (('read PacketView', read_view), ('read BytesIO', read_stream),
+            ('read_from', in_place and read_from), ('send', send),
+            ('write_into', in_place and write_into))
+
+
+def array_benchmark(element_type):
+    # Reading a 100-element 'PrefixedArray' of 'element_type' in place.
+    array_type = PrefixedArray(VarInt, element_type)
+    packet_buffer = PacketBuffer()
+    array_type.send(list(range(100)), packet_buffer)
+    data = packet_buffer.get_writable()
+    return lambda: array_type.read(PacketView(data))
+
+
+def print_row(title, before, after):
+    print('%-32s' % title + ''.join(
+        ' %10s' % '-' if time is None else ' %10.2f' % time
+        for time in best_times((before or None, after or None))))
+
+
+def main():
+    print('%-32s %10s %10s  (us)' % ('', 'Before', 'After'))
+    old_fields = tuple((old_type(data_type), value)
+                       for data_type, value in FIELDS)
+    for (title, before), (_title, after) in zip(
+            field_benchmarks(old_fields), field_benchmarks(FIELDS)):
+        print_row('8 fields, %s' % title, before, after)
+    print_row('100 Integers, read PacketView',
+              array_benchmark(old_type(Integer)), array_benchmark(Integer))
+
+    context = ConnectionContext(
+        protocol_version=max(SUPPORTED_PROTOCOL_VERSIONS))
+    packet = sample_packet(clientbound.play.SpawnPlayerPacket, context)
+    packet_buffer = PacketBuffer()
+    packet.write_fields(packet_buffer)
+    data = packet_buffer.get_writable()
+
+    def read_stream():
+        packet_buffer = PacketBuffer()
+        packet_buffer.send(data)
+        packet_buffer.reset_cursor()
+        clientbound.play.SpawnPlayerPacket(context).read(packet_buffer)
+
+    print_row('SpawnPlayerPacket, read', read_stream, lambda:
+              clientbound.play.SpawnPlayerPacket(context).read(
+                  PacketView(data)))
+    print_row('SpawnPlayerPacket, write_fields', None,
+              lambda: packet.write_fields(PacketBuffer()))
+    print('(Before: SpawnPlayerPacket read through a PacketBuffer.)')
+
+
+if __name__ == '__main__':
+    main()
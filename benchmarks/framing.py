@@ -0,0 +1,91 @@
+"""Measures the rate at which frames are read from a socket by 'ReceiveBuffer',
+   compared with reading each length prefix a byte at a time and the frame
+   into a new 'PacketBuffer', as 'PacketReactor.read_packet' once did. The
+   frames of a packet capture (see 'benchmarks.replay') are sent through a
+   local socket pair, and only split into frames, not decoded. Run from the
+   repository's root directory:
+
+       python -m benchmarks.framing [CAPTURE_FILE]
+"""
+import io
+import select
+import socket
+import sys
+import threading
+import timeit
+
+from minecraft.networking.capture import read_capture
+from minecraft.networking.framing import ReceiveBuffer
+from minecraft.networking.packets import PacketBuffer
+from minecraft.networking.types import VarInt
+
+from benchmarks.replay import synthetic_capture
+
+REPEAT = 3
+
+
+def read_frames_per_byte(stream, count):
+    # The former way of reading frames, with a 'select' for each frame.
+    for _ in range(count):
+        select.select([stream], [], [], None)
+        length = VarInt.read(stream)
+        packet_data = PacketBuffer()
+        packet_data.send(stream.read(length))
+        while len(packet_data.get_writable()) < length:
+            packet_data.send(
+                stream.read(length - len(packet_data.get_writable())))
+        packet_data.reset_cursor()
+
+
+def read_frames_buffered(stream, count):
+    # As 'PacketReactor.read_packet' reads frames, waiting with 'select'
+    # only when no complete frame has been buffered.
+    receive_buffer = ReceiveBuffer()
+    for _ in range(count):
+        frame = receive_buffer.next_frame()
+        while frame is None:
+            select.select([stream], [], [], None)
+            receive_buffer.fill(stream)
+            frame = receive_buffer.next_frame()
+
+
+def transfer_time(data, count, read_frames):
+    # The time taken to receive the 'count' frames in 'data' by
+    # 'read_frames', while another thread sends them.
+    server, client = socket.socketpair()
+    stream = client.makefile('rb', 0)
+    sender = threading.Thread(target=server.sendall, args=(data,))
+    try:
+        start = timeit.default_timer()
+        sender.start()
+        read_frames(stream, count)
+        seconds = timeit.default_timer() - start
+        sender.join()
+        return seconds
+    finally:
+        stream.close()
+        client.close()
+        server.close()
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            capture = file.read()
+    else:
+        capture = synthetic_capture()
+    frames = [frame for _time, _version, _threshold, frame
+              in read_capture(io.BytesIO(capture))]
+    data = b''.join(VarInt.encode(len(frame)) + frame for frame in frames)
+    print('%d frames, %d bytes' % (len(frames), len(data)))
+
+    for title, read_frames in (('Byte at a time', read_frames_per_byte),
+                               ('ReceiveBuffer', read_frames_buffered)):
+        seconds = min(transfer_time(data, len(frames), read_frames)
+                      for _ in range(REPEAT))
+        print('%-16s %10.0f packets/s  %7.1f MB/s'
+              % (title, len(frames) / seconds, len(data) / seconds / 1e6))
+
+
+if __name__ == '__main__':
+    main()
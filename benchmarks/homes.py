@@ -0,0 +1,83 @@
+"""Measures the rate at which a burst of 1,000 '!home' lookups, one from each
+   of 1,000 players, is served by 'HomeStore', compared with opening a new
+   SQLite connection for each command, as 'main.py' once did. Run from the
+   repository's root directory:
+
+       python -m benchmarks.homes
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import timeit
+
+from executor import CommandExecutor
+from homes import HomeStore
+
+PLAYERS = 1000
+REPEAT = 5
+
+
+def connect_per_command_home(path, name):
+    # The lookup of the former 'home' command, which opened a connection to
+    # the database for each command, and never closed it.
+    dbcon = sqlite3.connect(path)
+    cur = dbcon.cursor()
+    cur.execute(""" SELECT * FROM homes WHERE user = ? """, [name])
+    rows = cur.fetchall()
+    return rows[0][2:] if len(rows) == 1 else None
+
+
+def burst_time(function):
+    # The least time taken to call 'function' once for each player.
+    names = ['player%d' % player for player in range(PLAYERS)]
+    return min(timeit.repeat(lambda: [function(name) for name in names],
+                             number=1, repeat=REPEAT))
+
+
+def executor_burst_time(store, workers):
+    # The least time taken by 'workers' command workers to serve a lookup
+    # submitted at once by each player, as the chat handlers do.
+    executor = CommandExecutor(workers=workers, max_pending=PLAYERS)
+    try:
+        def burst():
+            done = threading.Semaphore(0)
+
+            def home(name):
+                store.get_home(name)
+                done.release()
+
+            for player in range(PLAYERS):
+                name = 'player%d' % player
+                executor.submit(name, home, name)
+            for _player in range(PLAYERS):
+                done.acquire()
+        return min(timeit.repeat(burst, number=1, repeat=REPEAT))
+    finally:
+        executor.shutdown()
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'homes.db')
+        with HomeStore(path) as store:
+            for player in range(PLAYERS):
+                store.set_home('player%d' % player, player, 64, -player)
+
+            results = [
+                ('Connection per command', burst_time(
+                    lambda name: connect_per_command_home(path, name))),
+                ('HomeStore', burst_time(store.get_home)),
+                ('HomeStore, 4 command workers',
+                 executor_burst_time(store, workers=4)),
+            ]
+        for title, seconds in results:
+            print('%-30s %9.0f commands/s' % (title, PLAYERS / seconds))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Measures the rate at which map updates of several sizes are applied to a
+   map by 'MapPacket.apply_to_map', with the map's pixels in a 'bytearray'
+   and, if NumPy is installed, in a NumPy array, compared with copying each
+   pixel in turn, as was once done. Also measures 'MapSet.apply_packets' on a
+   sequence of updates in which most whole-map updates are superseded. Run
+   from the repository's root directory:
+
+       python -m benchmarks.maps
+"""
+import timeit
+
+from minecraft.networking.packets import clientbound
+from minecraft.networking.packets.clientbound.play import map_packet
+
+from test.test_map_packet import apply_pixels_per_pixel, map_update
+
+MapPacket = clientbound.play.MapPacket
+
+# '(title, x, z, width, height)' of each kind of update.
+UPDATES = (
+    ('Full 128x128', 0, 0, 128, 128),
+    ('Rows 128x8', 0, 60, 128, 8),
+    ('Partial 32x32', 40, 40, 32, 32),
+    ('Column 1x128', 64, 0, 1, 128),
+    ('Pixel 1x1', 10, 10, 1, 1),
+)
+
+REPEAT = 5
+
+
+def rate(function, number):
+    # The greatest number of calls to 'function' per second.
+    return number / min(timeit.repeat(function, number=number,
+                                      repeat=REPEAT))
+
+
+def main():
+    methods = [('Per pixel', False, apply_pixels_per_pixel),
+               ('apply_to_map', False, MapPacket.apply_to_map)]
+    if map_packet.numpy is not None:
+        methods.append(('With NumPy', True, MapPacket.apply_to_map))
+
+    print('%-16s' % '' + ''.join('%14s' % title for title, _, _ in methods)
+          + '  (updates/s)')
+    for title, x, z, width, height in UPDATES:
+        packet = map_update(1, x, z, width, height)
+        rates = []
+        for _title, use_numpy, apply in methods:
+            map = MapPacket.Map(1, use_numpy=use_numpy)
+            number = 20 if apply is apply_pixels_per_pixel and \
+                width * height > 1000 else 2000
+            rates.append(rate(lambda: apply(packet, map), number))
+        print('%-16s' % title + ''.join('%14.0f' % r for r in rates))
+
+    # Ten maps, each updated in full ten times, with partial updates between.
+    packets = []
+    for _ in range(10):
+        for map_id in range(10):
+            packets.append(map_update(map_id, 0, 0, 128, 128))
+            packets.append(map_update(map_id, 40, 40, 32, 32))
+
+    def apply_each():
+        map_set = MapPacket.MapSet()
+        for packet in packets:
+            packet.apply_to_map_set(map_set)
+
+    def apply_batch():
+        MapPacket.MapSet().apply_packets(packets)
+
+    print()
+    for title, function in (('apply_to_map_set', apply_each),
+                            ('apply_packets', apply_batch)):
+        print('%-16s %14.0f updates/s'
+              % (title, len(packets) * rate(function, 50)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Measures the time taken to read and to write each clientbound play packet
+   at the latest protocol version, with the sample field values used by the
+   round-trip tests. Run from the repository's root directory:
+
+       python -m benchmarks.packet_codecs
+"""
+import timeit
+
+from minecraft import SUPPORTED_PROTOCOL_VERSIONS
+from minecraft.networking.connection import ConnectionContext
+from minecraft.networking.packets import PacketBuffer, PacketView
+
+from test.test_packets import definition_packets, sample_packet
+
+NUMBER, REPEAT = 2000, 5
+
+
+def best_time(function):
+    # The least time taken by one call to 'function', in microseconds.
+    return min(timeit.repeat(function, number=NUMBER, repeat=REPEAT)) \
+        / NUMBER * 1e6
+
+
+def main():
+    context = ConnectionContext(
+        protocol_version=max(SUPPORTED_PROTOCOL_VERSIONS))
+    total_read = total_write = 0
+    for packet_class in sorted(definition_packets(context),
+                               key=lambda packet_class: packet_class.__name__):
+        packet = sample_packet(packet_class, context)
+        packet_buffer = PacketBuffer()
+        packet.write_fields(packet_buffer)
+        data = packet_buffer.get_writable()
+
+        read = best_time(lambda: packet_class(context).read(PacketView(data)))
+        write = best_time(lambda: packet.write_fields(PacketBuffer()))
+        total_read += read
+        total_write += write
+        print('%-36s read %6.2f us  write %6.2f us'
+              % (packet_class.__name__, read, write))
+    print('%-36s read %6.2f us  write %6.2f us'
+          % ('Total', total_read, total_write))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""Measures the time taken to encode and to decode a sample of common play
+   packets, with each packet's ID, definition and codec found in its
+   'ProtocolRegistry', compared with calling 'get_id' and 'get_definition'
+   for every access, as 'Packet.id' and 'Packet.definition' once did. Also
+   measures the lookups alone. Run from the repository's root directory:
+
+       python -m benchmarks.registry
+"""
+import timeit
+
+from minecraft.networking.connection import ConnectionContext
+from minecraft.networking.packets import (
+    PacketBuffer, PacketCodec, PacketView, ProtocolRegistry, clientbound,
+)
+from minecraft.networking.types import VarInt, overridable_property
+
+from test.test_packets import sample_packet
+
+# Protocol versions 753 (1.16.3) and 340 (1.12.2).
+PROTOCOL_VERSIONS = 753, 340
+
+PACKETS = (clientbound.play.EntityLookPacket,
+           clientbound.play.EntityPositionDeltaPacket,
+           clientbound.play.EntityVelocityPacket,
+           clientbound.play.TimeUpdatePacket,
+           clientbound.play.SpawnPlayerPacket,
+           clientbound.play.ChatMessagePacket)
+
+# The old and new lookups are measured alternately, 'ROUNDS' times each, as
+# the time taken may vary over the run.
+NUMBER, ROUNDS = 2000, 10
+
+
+class PerCallLookup(object):
+    """Mixed into a packet class, gives it the former 'id', 'definition' and
+       'codec' properties, which call 'get_id' or 'get_definition' on each
+       access, and find codecs in a cache keyed by protocol version.
+    """
+    _codecs = {}
+
+    @overridable_property
+    def id(self):
+        return None if self.context is None else self.get_id(self.context)
+
+    @overridable_property
+    def definition(self):
+        return None if self.context is None else \
+               self.get_definition(self.context)
+
+    @overridable_property
+    def codec(self):
+        if self.context is None:
+            return None
+        key = type(self), self.context.protocol_version
+        codec = self._codecs.get(key)
+        if codec is None:
+            codec = PacketCodec(self.get_definition(self.context), type(self))
+            self._codecs[key] = codec
+        return codec
+
+
+def per_call_class(packet_class):
+    # A subclass of 'packet_class' with the former properties, except where
+    # 'packet_class' gives its 'id' or 'definition' as a class attribute,
+    # which then takes precedence, as it did over the former properties.
+    attributes = {}
+    for name in 'id', 'definition':
+        value = next(vars(base)[name] for base in packet_class.__mro__
+                     if name in vars(base))
+        if not isinstance(value, overridable_property):
+            attributes[name] = value
+    return type(packet_class.__name__, (PerCallLookup, packet_class),
+                attributes)
+
+
+class NullSocket(object):
+    def send(self, data):
+        pass
+
+
+def call_time(function, number):
+    # The time taken by one call to 'function', in microseconds.
+    return timeit.timeit(function, number=number) / number * 1e6
+
+
+def functions(context, packet_classes, table):
+    # Functions encoding, decoding and finding the ID of an instance of each
+    # of 'packet_classes', whose IDs are the keys of 'table'.
+    packets = [sample_packet(packet_class, context)
+               for packet_class in packet_classes]
+    frames = []
+    for packet in packets:
+        packet_buffer = PacketBuffer()
+        VarInt.send(packet.id, packet_buffer)
+        packet.write_fields(packet_buffer)
+        frames.append(packet_buffer.get_writable())
+    socket = NullSocket()
+
+    def encode():
+        for packet in packets:
+            packet.write(socket)
+
+    def decode():
+        for frame in frames:
+            packet_data = PacketView(frame)
+            packet = table[VarInt.read(packet_data)]()
+            packet.context = context
+            packet.read(packet_data)
+
+    def packet_ids():
+        for packet in packets:
+            packet.id
+
+    return encode, decode, packet_ids
+
+
+def main():
+    print('%-8s %-12s %10s %10s %10s  (us/packet)'
+          % ('Version', 'Lookup', 'encode', 'decode', 'packet.id'))
+    for protocol_version in PROTOCOL_VERSIONS:
+        context = ConnectionContext(protocol_version=protocol_version)
+        registry = ProtocolRegistry.for_context(context)
+
+        per_call = [per_call_class(packet_class) for packet_class in PACKETS]
+        old = functions(context, per_call, {
+            packet_class.get_id(context): packet_class
+            for packet_class in per_call})
+        new = functions(context, PACKETS, registry.packets_by_id(
+            clientbound.play.get_packets))
+        times = {old: [float('inf')] * 3, new: [float('inf')] * 3}
+        for _ in range(ROUNDS):
+            for index in range(3):
+                for lookup in old, new:
+                    times[lookup][index] = min(times[lookup][index], call_time(
+                        lookup[index], NUMBER) / len(PACKETS))
+        for title, lookup in (('Per call', old), ('Registry', new)):
+            print('%-8d %-12s' % (protocol_version, title)
+                  + ''.join(' %10.3f' % time for time in times[lookup]))
+
+    context = ConnectionContext(protocol_version=PROTOCOL_VERSIONS[0])
+    print('\nProtocolRegistry.for_context %.3f us'
+          % min(call_time(lambda: ProtocolRegistry.for_context(context),
+                          NUMBER * 10) for _ in range(ROUNDS)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Measures the time taken to replay a packet capture (see
+   'minecraft.networking.capture') through a connection without a server,
+   i.e. to decode the captured packets and call the connection's reactor and
+   packet listeners, with several connection options. Run from the
+   repository's root directory:
+
+       python -m benchmarks.replay [CAPTURE_FILE]
+
+   Without a capture file, a synthetic one is used, resembling a busy play
+   session at the latest protocol version: mostly entity movement, with some
+   block changes, sounds, chat messages and keep-alives.
+"""
+import io
+import sys
+import timeit
+
+from minecraft import SUPPORTED_PROTOCOL_VERSIONS
+from minecraft.networking.capture import PacketCapture, read_capture, replay
+from minecraft.networking.connection import Connection
+from minecraft.networking.packets import Packet, PacketBuffer
+from minecraft.networking.packets import clientbound
+from minecraft.networking.types import VarInt
+
+from test.test_packets import sample_packet
+
+REPEAT = 5
+
+# The packets received in each tick of the synthetic capture.
+TICK = (
+    ['EntityPositionDeltaPacket'] * 12 + ['EntityLookPacket'] * 6 +
+    ['EntityVelocityPacket'] * 4 + ['BlockChangePacket'] * 2 +
+    ['SoundEffectPacket', 'TimeUpdatePacket', 'ChatMessagePacket']
+)
+TICKS = 2000
+
+
+def synthetic_capture():
+    connection = Connection('localhost')
+    context = connection.context
+    context.protocol_version = max(SUPPORTED_PROTOCOL_VERSIONS)
+    frames = {}
+    for name in set(TICK) | {'KeepAlivePacket'}:
+        packet = sample_packet(getattr(clientbound.play, name), context)
+        packet_buffer = PacketBuffer()
+        VarInt.send(packet.get_id(context), packet_buffer)
+        packet.write_fields(packet_buffer)
+        frames[name] = packet_buffer.get_writable()
+
+    file = io.BytesIO()
+    capture = PacketCapture(file)
+    for tick in range(TICKS):
+        for name in TICK:
+            capture.record(frames[name], connection)
+        if tick % 20 == 0:
+            capture.record(frames['KeepAlivePacket'], connection)
+    capture.close()
+    return file.getvalue()
+
+
+def replay_time(data, listen, **kwds):
+    # The least time taken to replay the capture 'data', in seconds, through
+    # a new connection made with the keyword arguments 'kwds', on which a
+    # listener for every packet is registered if 'listen' is True.
+    def run():
+        connection = Connection('localhost', **kwds)
+        if listen:
+            connection.register_packet_listener(lambda packet: None, Packet)
+        replay(connection, io.BytesIO(data))
+    return min(timeit.repeat(run, number=1, repeat=REPEAT))
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            data = file.read()
+    else:
+        data = synthetic_capture()
+    frames = sum(1 for _frame in read_capture(io.BytesIO(data)))
+    print('%d frames, %d bytes' % (frames, len(data)))
+
+    for title, listen, kwds in (
+        ('Listener for every packet', True, {}),
+        ('Listener for every packet, lazy', True, {'lazy_packets': True}),
+        ('No listeners, unused skipped', False,
+         {'skip_unused_packets': True}),
+    ):
+        seconds = replay_time(data, listen, **kwds)
+        print('%-36s %6.2f us/frame  %9.0f frames/s'
+              % (title, seconds / frames * 1e6, frames / seconds))
+
+
+if __name__ == '__main__':
+    main()
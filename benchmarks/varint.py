@@ -0,0 +1,137 @@
+"""Measures the time taken to read, write and size VarInts of several lengths
+   with 'VarInt', compared with the former implementation, which read each
+   byte with a separate call to 'read' and built each encoding with 'struct',
+   and which is reproduced here. Run from the repository's root directory:
+
+       python -m benchmarks.varint
+"""
+import io
+import struct
+import timeit
+
+from minecraft.networking.packets import PacketView
+from minecraft.networking.types import VarInt
+
+# '(title, value)' of VarInts of 1, 3 and 5 bytes.
+VALUES = (('1 byte', 100), ('3 bytes', 300000), ('5 bytes', 2**31 - 1))
+
+# The number of VarInts read or written by each call of a benchmark.
+COUNT = 1000
+
+REPEAT = 5
+
+VARINT_SIZE_TABLE = {2 ** (7 * size): size for size in range(1, 13)}
+
+
+class OldVarInt(object):
+    max_bytes = 5
+
+    @classmethod
+    def read(cls, file_object):
+        number = 0
+        bytes_encountered = 0
+        while True:
+            byte = file_object.read(1)
+            if len(byte) < 1:
+                raise EOFError("Unexpected end of message.")
+
+            byte = ord(byte)
+            number |= (byte & 0x7F) << 7 * bytes_encountered
+            if not byte & 0x80:
+                break
+
+            bytes_encountered += 1
+            if bytes_encountered > cls.max_bytes:
+                raise ValueError("Tried to read too long of a VarInt")
+        return number
+
+    @staticmethod
+    def send(value, socket):
+        out = bytes()
+        while True:
+            byte = value & 0x7F
+            value >>= 7
+            out += struct.pack("B", byte | (0x80 if value > 0 else 0))
+            if value == 0:
+                break
+        socket.send(out)
+
+    @staticmethod
+    def size(value):
+        for max_value, size in VARINT_SIZE_TABLE.items():
+            if value < max_value:
+                return size
+        raise ValueError("Integer too large")
+
+
+class NullSocket(object):
+    def send(self, data):
+        pass
+
+
+def time_per_varint(function):
+    # The least time taken by 'function', which handles 'COUNT' VarInts,
+    # per VarInt, in nanoseconds.
+    return min(timeit.repeat(function, number=20, repeat=REPEAT)) \
+        / 20 / COUNT * 1e9
+
+
+def benchmarks(varint, value):
+    # '(title, function)' of each operation of 'varint' on 'value', or
+    # '(title, None)' if 'varint' does not support it.
+    data = VarInt.encode(value) * COUNT
+    size = VarInt.size(value)
+    buffer = bytearray(len(data))
+    socket = NullSocket()
+    counts = range(COUNT)
+
+    def read_view():
+        view = PacketView(data)
+        for _ in counts:
+            varint.read(view)
+
+    def read_stream():
+        stream = io.BytesIO(data)
+        for _ in counts:
+            varint.read(stream)
+
+    def read_from():
+        offset = 0
+        for _ in counts:
+            _value, offset = VarInt.read_from(data, offset)
+
+    def send():
+        for _ in counts:
+            varint.send(value, socket)
+
+    def encode():
+        for _ in counts:
+            VarInt.encode(value)
+
+    def write_into():
+        for offset in range(0, len(data), size):
+            VarInt.write_into(value, buffer, offset)
+
+    def size_of():
+        for _ in counts:
+            varint.size(value)
+
+    new = varint is VarInt
+    return (('read PacketView', read_view), ('read BytesIO', read_stream),
+            ('read_from', new and read_from), ('send', send),
+            ('encode', new and encode), ('write_into', new and write_into),
+            ('size', size_of))
+
+
+def main():
+    print('%-24s %10s %10s  (ns/VarInt)' % ('', 'Before', 'After'))
+    for value_title, value in VALUES:
+        for (title, old), (_title, new) in zip(
+                benchmarks(OldVarInt, value), benchmarks(VarInt, value)):
+            print('%-24s' % ('%s, %s' % (title, value_title)) + ''.join(
+                ' %10.0f' % time_per_varint(function) if function else
+                ' %10s' % '-' for function in (old, new)))
+
+
+if __name__ == '__main__':
+    main()
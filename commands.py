@@ -0,0 +1,122 @@
+"""
+Registration and dispatch of the chat commands understood by the bot.
+"""
+
+
+class Command(object):
+    """A chat command registered with a 'CommandRegistry'."""
+    __slots__ = ('name', 'handler', 'arg_types', 'converters', 'usage',
+                 'usage_error')
+
+    def __init__(self, name, handler, arg_types, usage):
+        self.name = name
+        self.handler = handler
+        self.arg_types = arg_types
+        # The argument types which actually need to be applied, as arguments
+        # arrive as strings already; None if there are no such types.
+        converters = tuple(None if t is str else t for t in arg_types)
+        self.converters = converters if any(converters) else None
+        self.usage = usage
+        # The message sent back to a player who used the command incorrectly,
+        # built once here rather than for every failed attempt.
+        self.usage_error = "Failed! - Usage: %s" % usage
+
+    def __repr__(self):
+        return 'Command(%r)' % self.usage
+
+
+class CommandRegistry(object):
+    """Maps command names to handler functions.
+
+    Each handler is called with the name of the player who sent the command,
+    followed by the command's arguments, each converted by the corresponding
+    argument type given on registration, e.g.:
+
+        commands = CommandRegistry()
+
+        @commands.command("tp", str, usage="!tp NAME")
+        def teleport(sender, target):
+            ...
+
+    If a command is given the wrong number of arguments, or an argument type
+    raises ValueError, 'handle_usage_error' is called instead of the handler.
+    If no command of the given name is registered, 'handle_unknown' is called.
+    Either of these may be replaced by assigning a different function to the
+    corresponding attribute of the registry.
+    """
+    def __init__(self, prefix="!"):
+        """
+        :param prefix: The text that marks the start of a chat command.
+        """
+        self.prefix = prefix
+        self.commands = {}
+
+    def command(self, name, *arg_types, **kwds):
+        """Decorator registering a function as the handler of the command
+           'name', which takes one argument of each of the given types.
+
+        :param usage: A short description of the correct use of the command.
+        """
+        usage = kwds.pop('usage', None)
+        assert not kwds, 'Unexpected keyword arguments: %r' % (kwds,)
+        if usage is None:
+            usage = ' '.join((self.prefix + name,) + tuple(
+                t.__name__.upper() for t in arg_types))
+
+        def command_decorator(handler_func):
+            self.register(name, handler_func, *arg_types, usage=usage)
+            return handler_func
+
+        return command_decorator
+
+    def register(self, name, handler_func, *arg_types, **kwds):
+        """Registers 'handler_func' as the handler of the command 'name'. See
+           'command' for the meaning of the arguments.
+        """
+        usage = kwds.pop('usage', None) or self.prefix + name
+        assert not kwds, 'Unexpected keyword arguments: %r' % (kwds,)
+        self.commands[self.prefix + name] = Command(
+            name, handler_func, arg_types, usage)
+
+    def is_command(self, message):
+        """Whether the given chat message should be treated as a command."""
+        return len(message) > len(self.prefix) and \
+            message.startswith(self.prefix)
+
+    def dispatch(self, sender, message):
+        """Run the command contained in a chat message, if there is one.
+
+        :param sender: The name of the player who sent the message.
+        :param message: The text of the message.
+        :return: True if the message was a command, whether or not it was
+                 used correctly, or False otherwise.
+        """
+        if not self.is_command(message):
+            return False
+
+        words = message.split()
+        command = self.commands.get(words[0])
+        if command is None:
+            self.handle_unknown(sender, words[0])
+            return True
+
+        if len(words) != len(command.arg_types) + 1:
+            self.handle_usage_error(sender, command)
+            return True
+        args = words[1:]
+        if command.converters is not None:
+            try:
+                args = [a if t is None else t(a)
+                        for t, a in zip(command.converters, args)]
+            except ValueError:
+                self.handle_usage_error(sender, command)
+                return True
+
+        command.handler(sender, *args)
+        return True
+
+    def handle_usage_error(self, sender, command):
+        print("%s: %s" % (sender, command.usage_error))
+
+    def handle_unknown(self, sender, name):
+        print("Invalid Command :(")
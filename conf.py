@@ -3,5 +3,7 @@ options = {
         "password" : "password",       # Minecraft account password
         "username" : "MyUsername",     # Minecraft account username (Case Sensitive)
         "version" : "1.16.3",          # Realm Minecraft Version
-        "rname" : "My Realm"           # Your Realm's name (Case Sensitive)
+        "rname" : "My Realm",          # Your Realm's name (Case Sensitive)
+        "echo_chat" : True,            # Print players' chat to the console
+        "realms" : []                  # Names of any other Realms to join at the same time
     }
\ No newline at end of file
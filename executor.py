@@ -0,0 +1,73 @@
+"""
+Runs chat commands on worker threads, away from the networking thread.
+"""
+
+import queue
+import threading
+import traceback
+
+
+class CommandExecutor(object):
+    """A fixed pool of worker threads, each with its own bounded queue.
+
+    Every task is submitted with a key, usually identifying the player who
+    issued the command. All tasks with the same key are run by the same
+    worker, so they are run one at a time in the order they were submitted,
+    while tasks with different keys may run concurrently.
+
+    Submitting never blocks: packet listeners run on the networking thread,
+    which must stay free to read packets and answer keep-alives, so a task
+    is rejected instead when its worker's queue is full.
+    """
+    _STOP = object()
+
+    def __init__(self, workers=4, max_pending=256):
+        """
+        :param workers: The number of worker threads.
+        :param max_pending: The maximum number of tasks that may wait in the
+                            queue of each worker.
+        """
+        self._queues = [queue.Queue(max_pending) for i in range(workers)]
+        self._threads = []
+        for index, task_queue in enumerate(self._queues):
+            thread = threading.Thread(
+                target=self._work, args=(task_queue,),
+                name="Command Worker %d" % index, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, key, function, *args, **kwds):
+        """Queue 'function(*args, **kwds)' to be called on a worker thread.
+
+        :param key: A hashable value; tasks with equal keys are run in order.
+        :return: True if the task was queued, or False if it was rejected
+                 because too many tasks are already pending for its worker.
+        """
+        task_queue = self._queues[hash(key) % len(self._queues)]
+        try:
+            task_queue.put_nowait((function, args, kwds))
+        except queue.Full:
+            return False
+        return True
+
+    def shutdown(self, wait=True):
+        """Stop the workers after they have run every task already queued.
+
+        :param wait: If True, block until all of the workers have stopped.
+        """
+        for task_queue in self._queues:
+            task_queue.put(self._STOP)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _work(self, task_queue):
+        while True:
+            task = task_queue.get()
+            if task is self._STOP:
+                return
+            function, args, kwds = task
+            try:
+                function(*args, **kwds)
+            except Exception:
+                traceback.print_exc()
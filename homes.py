@@ -0,0 +1,100 @@
+"""
+Persistent storage for player home locations.
+"""
+
+import sqlite3
+import threading
+
+
+DEFAULT_DATABASE = "mc_server.db"
+
+# Settings applied to the connection when the store is opened. WAL lets
+# readers proceed while a write is committing, and with WAL 'NORMAL'
+# synchronisation is still safe against corruption on power loss.
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -2000",
+)
+
+CREATE_HOMES_TABLE = """ CREATE TABLE IF NOT EXISTS homes(home_id INTEGER PRIMARY KEY, user TEXT, x TEXT, y TEXT, z TEXT, realm TEXT NOT NULL DEFAULT '') """
+
+# Databases created before homes were kept per realm lack the 'realm' column;
+# their homes are treated as belonging to the default realm, ''.
+ADD_HOMES_REALM_COLUMN = """ ALTER TABLE homes ADD COLUMN realm TEXT NOT NULL DEFAULT '' """
+
+CREATE_HOMES_INDEX = """ CREATE INDEX IF NOT EXISTS homes_realm_user ON homes(realm, user) """
+
+DROP_OLD_HOMES_INDEX = """ DROP INDEX IF EXISTS homes_user """
+
+# The statements below are always executed with exactly this text, so that
+# sqlite3's per-connection statement cache compiles each of them only once.
+SET_HOME = """ insert or replace into homes (home_id, realm, user, x, y, z) values
+                ((select home_id from homes where realm = ? and user = ?), ?, ?, ?, ?, ?) """
+
+GET_HOME = """ SELECT x, y, z FROM homes WHERE realm = ? AND user = ? LIMIT 2 """
+
+
+class HomeStore(object):
+    """Stores the home location of each player in a SQLite database.
+
+    Homes are kept separately for each realm, identified by a string, which is
+    empty for the default realm.
+
+    A single connection is opened when the store is created and is kept open
+    until 'close' is called. Every method may be called from any thread; calls
+    are serialised by an internal lock, so chat handlers running on different
+    threads, or for different realms, can share one store.
+    """
+    def __init__(self, path=DEFAULT_DATABASE):
+        """
+        :param path: The file name of the database, which is created along
+                     with the 'homes' table if it does not already exist.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, cached_statements=16)
+
+        with self._lock:
+            for pragma in PRAGMAS:
+                self._connection.execute(pragma)
+            with self._connection:
+                self._connection.execute(CREATE_HOMES_TABLE)
+                columns = [row[1] for row in self._connection.execute(
+                    "PRAGMA table_info(homes)")]
+                if 'realm' not in columns:
+                    self._connection.execute(ADD_HOMES_REALM_COLUMN)
+                self._connection.execute(DROP_OLD_HOMES_INDEX)
+                self._connection.execute(CREATE_HOMES_INDEX)
+
+    def set_home(self, user, x, y, z, realm=''):
+        """Record '(x, y, z)' as the home of 'user' on 'realm', replacing any
+           existing home of that user on that realm.
+        """
+        user = str(user)
+        with self._lock, self._connection:
+            self._connection.execute(
+                SET_HOME, (realm, user, realm, user, str(x), str(y), str(z)))
+
+    def get_home(self, user, realm=''):
+        """Return the home of 'user' on 'realm' as a tuple of strings
+           '(x, y, z)', or None if the user has no unique home there.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                GET_HOME, (realm, str(user))).fetchall()
+        return rows[0] if len(rows) == 1 else None
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,289 @@
+"""
+Runs the bot on any number of realms from a single process.
+"""
+
+import collections
+import threading
+
+import requests
+
+from minecraft.networking.connection import Connection
+from minecraft.networking.packets import (
+    clientbound, serverbound, PlayerPositionAndLookPacket
+)
+
+from commands import CommandRegistry
+
+REALMS_API_WORLDS     = "https://pc.realms.minecraft.net/worlds"
+
+# The most packets the bot will queue for a realm before discarding replies.
+MAX_QUEUED_PACKETS = 256
+
+def REALM_API_JOIN(server_id):
+    url = f"https://pc.realms.minecraft.net/worlds/v1/{server_id}/join/pc"
+    return url
+
+def coordinate(text):
+    # Command argument type for a block coordinate: any number is accepted,
+    # and kept as it was written.
+    float(text)
+    return text
+
+
+class RealmNotFound(LookupError):
+    """Raised when the account cannot see a realm with the requested name."""
+
+
+class RealmBot(object):
+    """The bot's connection to one realm, with the state that belongs to
+       that realm alone: its commands, its position 'pos_look', and its
+       metrics.
+
+       'metrics' counts: 'connects', 'errors', 'chat' (chat messages
+       received), 'commands' (messages treated as commands), 'dropped'
+       (messages discarded because the command queue was full) and 'unsent'
+       (messages discarded because the realm's outgoing queue was full).
+    """
+    def __init__(self, host, name, home_realm=None):
+        """
+        :param host: The 'RealmHost' providing the shared resources.
+        :param name: The name of the realm, as shown in the Realms list.
+        :param home_realm: The key under which this realm's homes are kept in
+                           the shared 'HomeStore'; by default, 'name'.
+        """
+        self.host = host
+        self.name = name
+        self.home_realm = name if home_realm is None else home_realm
+        self.connection = None
+        self.metrics = collections.Counter()
+
+        self.pos_look = PlayerPositionAndLookPacket.PositionAndLook()
+        self.spawned = threading.Event()
+
+        self.commands = CommandRegistry()
+        self.commands.handle_usage_error = self.usage_error
+        self.commands.register("tp", self.teleport, str, usage="!tp NAME")
+        self.commands.register("sethome", self.sethome,
+                               coordinate, coordinate, coordinate,
+                               usage="!sethome X Y Z")
+        self.commands.register("home", self.home)
+
+    @property
+    def connected(self):
+        return self.connection is not None and self.connection.connected
+
+    def connect(self):
+        """Look up the realm's current address and connect to it, replacing
+           any previous connection.
+        """
+        ip, port = self.host.join_address(self.name).split(":")
+
+        # The bot uses only a few kinds of packet, so the rest are not decoded.
+        # If the realm stops reading, replies are discarded rather than queued
+        # without limit, or blocking the command workers shared by all realms.
+        connection = Connection(
+            ip, int(port), auth_token=self.host.auth_token,
+            handle_exception=self._handle_exception, skip_unused_packets=True,
+            max_queued_packets=MAX_QUEUED_PACKETS, queue_full_policy='drop')
+        connection.register_packet_listener(
+            self._handle_join_game, clientbound.play.JoinGamePacket)
+        connection.register_packet_listener(
+            self._handle_position_and_look, PlayerPositionAndLookPacket)
+        connection.register_packet_listener(
+            self._queue_chat, clientbound.play.ChatMessagePacket)
+
+        if self.connection is not None:
+            self.connection.disconnect()
+        self.connection = connection
+        self.spawned.clear()
+        connection.connect()
+        self.metrics['connects'] += 1
+
+    def disconnect(self):
+        if self.connection is not None:
+            self.connection.disconnect()
+
+    def print(self, text):
+        # Console output is labelled with the realm when there are several.
+        if len(self.host.bots) > 1:
+            text = "[%s] %s" % (self.name, text)
+        print(text)
+
+    def write_chat(self, text):
+        packet = serverbound.play.ChatPacket()
+        packet.message = text
+        if not self.connection.write_packet(packet):
+            self.metrics['unsent'] += 1
+
+    def send_message(self, name, text):
+        self.write_chat("/msg %s %s" % (name, text))
+
+    def usage_error(self, name, command):
+        self.send_message(name, command.usage_error)
+        self.print("%s Failed - %s" % (command.name, command.usage_error))
+
+    def teleport(self, name, target):
+        self.write_chat("/tp %s %s" % (name, target))
+        self.print("Teleported %s to %s" % (name, target))
+
+        self.host.audit.log(f"[{self.name}] Teleported {name} to {target}")
+
+    def sethome(self, name, x, y, z):
+        self.host.homes.set_home(name, x, y, z, realm=self.home_realm)
+
+        self.send_message(name, "Home Set!")
+
+        self.print(f"Set home location to: {x}, {y}, {z}")
+
+        self.host.audit.log(f"[{self.name}] Set {name} home to {x} {y} {z}")
+
+    def home(self, name):
+        row = self.host.homes.get_home(name, realm=self.home_realm)
+
+        if row is None:
+            self.send_message(name, "Failed! - No Home Set :(")
+
+            self.print("Home Failed - No Home Set")
+            return
+
+        self.write_chat("/tp %s %s %s %s" % (name, row[0], row[1], row[2]))
+
+        self.print("Teleported %s to their home" % (name))
+
+        self.host.audit.log(f"[{self.name}] Sent {name} home")
+
+    def _handle_join_game(self, join_game_packet):
+        self.print('Client Connected.')
+
+    def _handle_position_and_look(self, packet):
+        packet.apply(self.pos_look)
+        self.spawned.set()
+
+    # Hand chat off to the command workers, keeping the networking thread free
+    # to read packets. Messages from one sender are handled in order.
+    def _queue_chat(self, chat_packet):
+        if chat_packet.position != clientbound.play.ChatMessagePacket.Position.CHAT:
+            return
+        self.metrics['chat'] += 1
+        # Unless chat is shown on the console, ordinary conversation can be
+        # discarded here without decoding it.
+        if not self.host.echo_chat and not \
+           chat_packet.may_contain_text_starting_with(self.commands.prefix):
+            return
+
+        sender = getattr(chat_packet, 'sender', None)
+        if not self.host.executor.submit(
+                (self.name, sender), self._handle_chat, chat_packet):
+            self.metrics['dropped'] += 1
+            self.print("Dropped chat message - command queue is full")
+
+    # Get name/message from json packet and print if not from client
+    def _handle_chat(self, chat_packet):
+        chat_dict = chat_packet.chat_data
+
+        name = chat_dict['with'][0]['text']
+        message = chat_dict['with'][1]
+
+        if self.host.echo_chat and name != self.host.username:
+            self.print("%s : %s" % (name, message))
+
+        if message is not None and self.commands.dispatch(name, message):
+            self.metrics['commands'] += 1
+
+    def _handle_exception(self, exc, exc_info):
+        self.metrics['errors'] += 1
+        self.print("Connection lost: %r" % (exc,))
+
+
+class RealmHost(object):
+    """Keeps a 'RealmBot' connected to each of a number of realms, all using
+       one account and sharing its authentication token, one HTTP session for
+       the Realms API, and one home store, audit log and command executor.
+
+       Once started, the host checks every 'retry_interval' seconds for bots
+       that have lost their connection, and reconnects them.
+    """
+    def __init__(self, auth_token, username, version, homes, audit, executor,
+                 echo_chat=True, retry_interval=30):
+        """
+        :param auth_token: The account's 'AuthenticationToken'.
+        :param username: The account's username.
+        :param version: The Minecraft version of the realms, e.g. "1.16.3".
+        :param homes: The shared 'HomeStore'.
+        :param audit: The shared 'AuditLog'.
+        :param executor: The shared 'CommandExecutor'.
+        :param echo_chat: Whether to print players' chat to the console.
+        :param retry_interval: Seconds between checks for lost connections.
+        """
+        self.auth_token = auth_token
+        self.username = username
+        self.homes = homes
+        self.audit = audit
+        self.executor = executor
+        self.echo_chat = echo_chat
+        self.retry_interval = retry_interval
+        self.bots = collections.OrderedDict()
+
+        self.session = requests.Session()
+        self.session.cookies.update({
+            "sid": f"token:{auth_token.access_token}:{auth_token.profile.id_}",
+            "user": username,
+            "version": version
+        })
+
+        self._stopped = threading.Event()
+        self._supervisor = None
+
+    def add_realm(self, name, home_realm=None):
+        """Add a realm to be hosted, returning its 'RealmBot'. If the host has
+           already been started, the bot is connected by the next check.
+        """
+        bot = RealmBot(self, name, home_realm=home_realm)
+        self.bots[name] = bot
+        return bot
+
+    def join_address(self, name):
+        """Return the current "address:port" of the realm named 'name'."""
+        servers = self.session.get(REALMS_API_WORLDS).json()['servers']
+        for server in servers:
+            if server['name'] == name:
+                break
+        else:
+            raise RealmNotFound("Cannot access or find Realm %r! Be sure to validate credentials in conf.py and account has accepted invite to Realm" % name)
+
+        connect_info = self.session.get(REALM_API_JOIN(server['id'])).json()
+        return connect_info['address']
+
+    def start(self):
+        """Connect every bot, and start reconnecting them when necessary. A
+           bot which cannot connect at first, e.g. because its realm is not
+           found, is left to be retried by the first check, without
+           affecting the others.
+        """
+        for bot in list(self.bots.values()):
+            try:
+                bot.connect()
+            except Exception as e:
+                bot.metrics['errors'] += 1
+                bot.print("Connect failed: %r" % (e,))
+        self._supervisor = threading.Thread(
+            target=self._supervise, name="Realm Supervisor", daemon=True)
+        self._supervisor.start()
+
+    def stop(self):
+        """Stop reconnecting, and disconnect every bot."""
+        self._stopped.set()
+        for bot in list(self.bots.values()):
+            bot.disconnect()
+        self.session.close()
+
+    def _supervise(self):
+        while not self._stopped.wait(self.retry_interval):
+            for bot in list(self.bots.values()):
+                if bot.connected or self._stopped.is_set():
+                    continue
+                try:
+                    bot.connect()
+                except Exception as e:
+                    bot.metrics['errors'] += 1
+                    bot.print("Reconnect failed: %r" % (e,))
@@ -0,0 +1,253 @@
+"""An implementation of 'Connection' on top of asyncio streams, allowing many
+   connections to share one thread and event loop.
+"""
+import asyncio
+import sys
+
+from .connection import (
+    Connection, LoginReactor, PlayingStatusReactor, StatusReactor,
+    STATE_STATUS, STATE_PLAYING,
+)
+from .framing import ReceiveBuffer
+from .packets import serverbound
+from ..exceptions import InvalidState
+
+
+class AsyncConnection(Connection):
+    """A connection to a Minecraft server run by an asyncio event loop rather
+       than by a networking thread. It uses the same packet classes, packet
+       reactors and listener registration as 'Connection', but:
+
+       - 'connect' and 'status' return an 'asyncio.Task', which completes
+         when the initial packets have been sent, and must be called while
+         the event loop is running;
+
+       - 'write_packet' encodes and writes the packet immediately and returns
+         an awaitable which, if awaited, waits until the stream's write buffer
+         has drained, i.e. 'await connection.write_packet(packet)'. It raises
+         'InvalidState' if no stream is open, rather than queueing the packet;
+
+       - packet listeners may be coroutine functions, which are run as
+         separate tasks. As a result, raising 'IgnorePacket' from such a
+         listener has no effect; and
+
+       - 'wait_closed' is a coroutine which completes when the connection
+         terminates.
+    """
+    # The maximum number of bytes requested from the stream by each read.
+    READ_SIZE = 65536
+
+    def __init__(self, *args, **kwds):
+        super(AsyncConnection, self).__init__(*args, **kwds)
+        self.socket = None
+        self.file_object = None
+        self._reader = self._writer = None
+        self._read_task = None
+        self._listener_tasks = set()
+        # The number of calls to 'connect' and 'status' whose stream has not
+        # yet been opened. While there are any, the closing of a stream is
+        # not an exit.
+        self._opening = 0
+
+    def connect(self):
+        """
+        Attempt to begin connecting to the server, returning a task which
+        completes when the login process has been started.
+        May safely be called multiple times after the first, i.e. to reconnect.
+        """
+        self._opening += 1
+        return asyncio.ensure_future(self._connect_async())
+
+    def status(self, handle_status=None, handle_ping=False):
+        """Issue a status request to the server and then disconnect, returning
+           a task which completes when the request has been sent. See
+           'Connection.status' for the meaning of the arguments.
+        """
+        self._opening += 1
+        return asyncio.ensure_future(
+            self._status_async(handle_status, handle_ping))
+
+    async def wait_closed(self):
+        """Wait until the current connection, if any, terminates."""
+        while self._read_task is not None and not self._read_task.done():
+            await asyncio.wait((self._read_task,))
+
+    def write_packet(self, packet, force=False):
+        """Writes a packet to the server. As writing never blocks the event
+           loop, 'force' has no effect.
+
+        :param packet: The :class:`network.packets.Packet` to write
+        :return: An awaitable which waits for the packet to be flushed.
+        :raises InvalidState: If there is no open stream to write to.
+        """
+        if self.socket is None:
+            raise InvalidState('Cannot write a packet while not connected.')
+        packet.context = self.context
+        self._write_packet(packet)
+        return _Drain(self._writer)
+
+    def register_packet_listener(self, method, *packet_types, **kwds):
+        """As 'Connection.register_packet_listener', except that 'method' may
+           also be a coroutine function, in which case each call to it is run
+           as a new task.
+        """
+        if asyncio.iscoroutinefunction(method):
+            coroutine_function = method
+
+            def method(packet):
+                self._spawn(coroutine_function(packet))
+
+        super(AsyncConnection, self).register_packet_listener(
+            method, *packet_types, **kwds)
+
+    def disconnect(self, immediate=False):
+        """Terminate the existing server connection, if there is one.
+           As packets are written immediately, 'immediate' has no effect.
+        """
+        self.connected = False
+        self._close_stream()
+
+    def _close_stream(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+        self.socket = self.file_object = None
+
+    async def _connect_async(self):
+        # It is important that this is set correctly even when connecting
+        # in status mode, as some servers, e.g. SpigotMC with the
+        # ProtocolSupport plugin, use it to determine the correct response.
+        self.context.protocol_version = max(self.allowed_proto_versions)
+
+        self.spawned = False
+        await self._open()
+        if len(self.allowed_proto_versions) == 1:
+            # There is exactly one allowed protocol version, so skip the
+            # process of determining the server's version, and immediately
+            # connect.
+            self._handshake(next_state=STATE_PLAYING)
+            login_start_packet = serverbound.login.LoginStartPacket()
+            if self.auth_token:
+                login_start_packet.name = self.auth_token.profile.name
+            else:
+                login_start_packet.name = self.username
+            self.write_packet(login_start_packet)
+            self.reactor = LoginReactor(self)
+        else:
+            # Determine the server's protocol version by first performing a
+            # status query.
+            self._handshake(next_state=STATE_STATUS)
+            self.write_packet(serverbound.status.RequestPacket())
+            self.reactor = PlayingStatusReactor(self)
+        await _Drain(self._writer)
+
+    async def _status_async(self, handle_status, handle_ping):
+        await self._open()
+        self._handshake(next_state=STATE_STATUS)
+
+        do_ping = handle_ping is not False
+        self.reactor = StatusReactor(self, do_ping=do_ping)
+
+        if handle_status is False:
+            self.reactor.handle_status = lambda *args, **kwds: None
+        elif handle_status is not None:
+            self.reactor.handle_status = handle_status
+
+        if handle_ping is False:
+            self.reactor.handle_ping = lambda *args, **kwds: None
+        elif handle_ping is not None:
+            self.reactor.handle_ping = handle_ping
+
+        self.write_packet(serverbound.status.RequestPacket())
+        await _Drain(self._writer)
+
+    async def _open(self):
+        # Open a new stream to the server, replacing any existing one, and
+        # start the task which reads from it. 'connected' is not cleared
+        # meanwhile, as replacing the stream is not an exit.
+        self._close_stream()
+        try:
+            reader, writer = await asyncio.open_connection(
+                self.options.address, self.options.port)
+        finally:
+            self._opening -= 1
+        self._reader, self._writer = reader, writer
+        self.socket = _StreamWriterSocket(writer)
+        self.file_object = None
+        self.receive_buffer = ReceiveBuffer()
+        self.options.compression_enabled = False
+        self.options.compression_threshold = -1
+        self.connected = True
+        self._read_task = asyncio.ensure_future(self._run(reader))
+
+    async def _run(self, reader):
+        # Read and react to packets until the stream is closed or replaced.
+        try:
+            while self._reader is reader:
+                data = await reader.read(self.READ_SIZE)
+                if self._reader is not reader:
+                    break
+                if not data:
+                    raise EOFError("Unexpected end of message.")
+
+                # 'LoginReactor' enables encryption by wrapping 'file_object'
+                # in an 'EncryptedFileObjectWrapper'.
+                decryptor = getattr(self.file_object, 'decryptor', None)
+                receive_buffer = self.receive_buffer
+                receive_buffer.feed(data, decryptor)
+
+                while self._reader is reader:
+                    frame = receive_buffer.next_frame()
+                    if frame is None:
+                        break
+                    packet = self.reactor.decode_packet(frame)
+                    if packet is not None:
+                        self._react(packet)
+            # If the stream was closed in order to open another, as when
+            # reconnecting after a status query, the connection continues.
+            if not self._opening:
+                self._handle_exit()
+        except Exception as e:
+            self._handle_exception(e, sys.exc_info())
+
+    def _spawn(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._listener_tasks.add(task)
+        task.add_done_callback(self._listener_done)
+
+    def _listener_done(self, task):
+        self._listener_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            exc = task.exception()
+            self._handle_exception(exc, (type(exc), exc, exc.__traceback__))
+
+
+class _StreamWriterSocket(object):
+    # Presents an 'asyncio.StreamWriter' through the part of the socket
+    # interface used to write packets.
+    __slots__ = 'writer',
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    def send(self, data):
+        self.sendall(data)
+        return len(data)
+
+    def sendall(self, data):
+        # The transport may keep a reference to the data it is given, so
+        # anything that might be a view of a reused buffer is copied.
+        self.writer.write(data if isinstance(data, bytes) else bytes(data))
+
+
+class _Drain(object):
+    # An awaitable waiting for a stream's write buffer to drain. Unlike the
+    # coroutine returned by 'StreamWriter.drain', this need not be awaited.
+    __slots__ = 'writer',
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    def __await__(self):
+        if self.writer is not None:
+            yield from self.writer.drain().__await__()
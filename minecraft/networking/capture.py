@@ -0,0 +1,211 @@
+"""Recording of the packets received by a connection, and their replay through
+   another connection without a server, e.g. to measure the speed of packet
+   decoding and of packet listeners reproducibly.
+
+   A capture file begins with 'MAGIC', followed by a series of records, each
+   beginning with a VarInt whose lowest bit gives its kind, and whose other
+   bits give the number of microseconds since the previous record (or since
+   the capture began). A frame record (kind 0) continues with the VarInt
+   length of a frame, as received after any decryption, and the frame itself,
+   excluding its length prefix. A state record (kind 1) continues with the
+   VarInt protocol version of the frames that follow, and the VarInt
+   compression threshold plus 2, or 0 if compression is disabled.
+"""
+import threading
+import time
+from timeit import default_timer
+
+from .types import VarInt
+from .connection import PlayingReactor
+from ..exceptions import InvalidState
+
+
+__all__ = 'PacketCapture', 'read_capture', 'replay'
+
+MAGIC = b'pyCraft capture\x01'
+
+FRAME_RECORD = 0
+STATE_RECORD = 1
+
+
+class PacketCapture(object):
+    """Records the frames received by one or more connections to 'file', a
+       path or a binary file object, in the format described above. Pass it as
+       the 'capture' argument of 'Connection' to record the frames received in
+       the play state.
+
+       A file given as a path is closed by 'close'; one given as a file object
+       is only flushed. Frames may be recorded from several threads at once,
+       e.g. those of several connections sharing one capture.
+    """
+    __slots__ = '_file', '_close_file', '_start', '_last', '_state', '_lock'
+
+    def __init__(self, file):
+        if isinstance(file, str):
+            self._file, self._close_file = open(file, 'wb'), True
+        else:
+            self._file, self._close_file = file, False
+        self._file.write(MAGIC)
+        self._start = default_timer()
+        self._last = 0     # The time of the last record, in microseconds.
+        self._state = None
+        self._lock = threading.Lock()
+
+    def record(self, frame, connection):
+        """Record 'frame', the data of a frame received by 'connection',
+           excluding its length prefix.
+        """
+        options = connection.options
+        state = (connection.context.protocol_version,
+                 max(options.compression_threshold, -1) + 2
+                 if options.compression_enabled else 0)
+        write = self._file.write
+        with self._lock:
+            if state != self._state:
+                self._state = state
+                write(self._timestamp(STATE_RECORD))
+                write(VarInt.encode(state[0]))
+                write(VarInt.encode(state[1]))
+            write(self._timestamp(FRAME_RECORD))
+            write(VarInt.encode(len(frame)))
+            write(frame)
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._close_file:
+                self._file.close()
+            else:
+                self._file.flush()
+
+    def _timestamp(self, kind):
+        now = int((default_timer() - self._start) * 1000000)
+        delta, self._last = max(now - self._last, 0), now
+        return VarInt.encode(delta << 1 | kind)
+
+
+def read_capture(file):
+    """Iterate over the frames in the capture 'file', a path or a binary file
+       object, which is read into memory in full.
+
+    :return: An iterator of tuples '(time, protocol_version,
+             compression_threshold, frame)', where 'time' is the number of
+             seconds since the capture began, 'compression_threshold' is None
+             if compression was disabled, and 'frame' is a 'memoryview' of the
+             frame's data.
+    """
+    if isinstance(file, str):
+        with open(file, 'rb') as file:
+            data = file.read()
+    else:
+        data = file.read()
+    if not data.startswith(MAGIC):
+        raise ValueError('Not a packet capture file.')
+
+    view = memoryview(data)
+    offset, end = len(MAGIC), len(data)
+    time_us, protocol_version, compression_threshold = 0, None, None
+    while offset < end:
+        header, offset = VarInt.read_from(data, offset)
+        time_us += header >> 1
+        if header & 1 == STATE_RECORD:
+            protocol_version, offset = VarInt.read_from(data, offset)
+            threshold, offset = VarInt.read_from(data, offset)
+            compression_threshold = threshold - 2 if threshold else None
+            continue
+        length, offset = VarInt.read_from(data, offset)
+        if offset + length > end:
+            raise EOFError('Capture ends within a frame.')
+        yield (time_us / 1000000.0, protocol_version, compression_threshold,
+               view[offset:offset + length])
+        offset += length
+
+
+def replay(connection, file, realtime=False, reactor_class=None):
+    """Read and react to the frames in the capture 'file' (see 'read_capture')
+       as if they had been received by 'connection', which must not be
+       connected, so that its packet listeners are called as usual.
+
+       Packets written by the connection's reactor or listeners meanwhile are
+       encoded, and passed to its outgoing packet listeners, but not sent to
+       any server. The connection's reactor, protocol version and compression
+       options are left as at the end of the capture.
+
+    :param realtime: If True, each frame is delayed until the same time after
+                     the replay began as it was received after the capture
+                     began; otherwise, frames are replayed as fast as possible.
+    :param reactor_class: The 'PacketReactor' subclass reacting to the packets,
+                          by default 'PlayingReactor'.
+    :return: The number of packets reacted to, i.e. excluding any skipped.
+    :raises InvalidState: If 'connection' is connected.
+    """
+    if connection.connected:
+        raise InvalidState('Cannot replay a capture through a connection '
+                           'which is connected.')
+    if reactor_class is None:
+        reactor_class = PlayingReactor
+    with connection._write_lock:
+        saved_socket = getattr(connection, 'socket', None)
+        connection.socket = _NullSocket()
+    try:
+        return _replay(connection, file, realtime, reactor_class)
+    finally:
+        with connection._write_lock:
+            connection.socket = saved_socket
+
+
+def _replay(connection, file, realtime, reactor_class):
+    options, context = connection.options, connection.context
+    start = default_timer()
+    count = 0
+    for frame_time, protocol_version, compression_threshold, frame \
+            in read_capture(file):
+        if type(connection.reactor) is not reactor_class or \
+           context.protocol_version != protocol_version:
+            context.protocol_version = protocol_version
+            connection.reactor = reactor_class(connection)
+        options.compression_enabled = compression_threshold is not None
+        options.compression_threshold = -1 if compression_threshold is None \
+            else compression_threshold
+
+        if realtime:
+            delay = start + frame_time - default_timer()
+            if delay > 0:
+                time.sleep(delay)
+
+        packet = connection.reactor.decode_packet(frame)
+        if packet is None:
+            continue
+        connection._react(packet)
+        count += 1
+
+        with connection._write_lock:
+            if connection._outgoing_packet_queue:
+                if connection.socket is None:
+                    # The connection was closed by a disconnect packet.
+                    connection.socket = _NullSocket()
+                while connection._pop_packet():
+                    pass
+                connection._flush_packets()
+    return count
+
+
+class _NullSocket(object):
+    # Stands in for the socket of a connection during a replay, discarding
+    # everything written to it.
+    __slots__ = ()
+
+    def send(self, data):
+        return len(data)
+
+    def sendall(self, data):
+        pass
+
+    def shutdown(self, *args, **kwds):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,95 @@
+"""Control over the compression of outgoing packets, once the server has
+   enabled compression with a threshold.
+"""
+import zlib
+from timeit import default_timer
+
+
+__all__ = 'CompressionPolicy',
+
+
+class CompressionPolicy(object):
+    """Decides how the data of each outgoing packet larger than the server's
+       compression threshold is compressed, and counts the results.
+
+       'level' is the zlib compression level, from 0 (none) to 9 (best), or
+       -1 for zlib's default.
+
+       If 'max_ratio' is given, packets of any class whose data has recently
+       been compressed to more than this fraction of its size, as estimated
+       from the results for that class so far, are sent uncompressed without
+       being compressed first. Every 'probe_interval'th such packet is still
+       compressed, to keep the estimate current; and any packet that
+       compression does not make smaller is sent uncompressed. Note that some
+       servers may refuse uncompressed packets above the threshold, so none
+       are sent by default.
+
+       The counters are: 'packets_compressed', the number of packets above
+       the threshold whose data was compressed; 'packets_skipped', the number
+       sent uncompressed without being compressed; 'bytes_in' and
+       'bytes_out', the total sizes of the data of the compressed packets
+       before compression and as sent; and 'seconds', the time spent
+       compressing them.
+    """
+    __slots__ = ('level', 'max_ratio', 'probe_interval', 'packets_compressed',
+                 'packets_skipped', 'bytes_in', 'bytes_out', 'seconds',
+                 '_estimates')
+
+    # The weight given to each new result in the running estimates of the
+    # compression ratios of packet classes.
+    ESTIMATE_WEIGHT = 0.25
+
+    def __init__(self, level=-1, max_ratio=None, probe_interval=16):
+        self.level = level
+        self.max_ratio = max_ratio
+        self.probe_interval = probe_interval
+        self.packets_compressed = self.packets_skipped = 0
+        self.bytes_in = self.bytes_out = 0
+        self.seconds = 0.0
+        # Maps each packet class to '[ratio, skipped]', its estimated
+        # compression ratio and the number of its packets since sent
+        # uncompressed.
+        self._estimates = {}
+
+    def __repr__(self):
+        return '%s(level=%r, max_ratio=%r, probe_interval=%r)' % (
+            type(self).__name__, self.level, self.max_ratio,
+            self.probe_interval)
+
+    @property
+    def bytes_saved(self):
+        """The number of bytes that compression has saved in total."""
+        return self.bytes_in - self.bytes_out
+
+    def compress(self, data, packet_class=None):
+        """The compressed form of 'data', the data of a packet of the class
+           'packet_class', or None if it is to be sent uncompressed.
+        """
+        estimate = None
+        if self.max_ratio is not None:
+            estimate = self._estimates.get(packet_class)
+            if estimate is not None and estimate[0] > self.max_ratio:
+                estimate[1] += 1
+                if estimate[1] % self.probe_interval:
+                    self.packets_skipped += 1
+                    return None
+
+        start = default_timer()
+        compressed_data = zlib.compress(data, self.level)
+        self.seconds += default_timer() - start
+        self.packets_compressed += 1
+        self.bytes_in += len(data)
+
+        if self.max_ratio is not None:
+            ratio = len(compressed_data) / len(data)
+            if estimate is None:
+                self._estimates[packet_class] = [ratio, 0]
+            else:
+                estimate[0] += self.ESTIMATE_WEIGHT * (ratio - estimate[0])
+                estimate[1] = 0
+            if len(compressed_data) >= len(data):
+                self.bytes_out += len(data)
+                return None
+
+        self.bytes_out += len(compressed_data)
+        return compressed_data
@@ -13,6 +13,8 @@ from .types import VarInt
 from .packets import clientbound, serverbound
 from . import packets
 from . import encryption
+from .framing import ReceiveBuffer
+from .compression import CompressionPolicy
 from .. import SUPPORTED_PROTOCOL_VERSIONS, SUPPORTED_MINECRAFT_VERSIONS
 from ..exceptions import (
     VersionMismatch, LoginDisconnect, IgnorePacket, InvalidState
@@ -34,11 +36,23 @@ class ConnectionContext(object):
 
 class _ConnectionOptions(object):
     def __init__(self, address=None, port=None, compression_threshold=-1,
-                 compression_enabled=False):
+                 compression_enabled=False, skip_unused_packets=False,
+                 lazy_packets=False, write_batch_size=65536,
+                 write_batch_delay=0, max_queued_packets=None,
+                 queue_full_policy='block', compression_policy=None,
+                 capture=None):
         self.address = address
         self.port = port
         self.compression_threshold = compression_threshold
         self.compression_enabled = compression_enabled
+        self.skip_unused_packets = skip_unused_packets
+        self.lazy_packets = lazy_packets
+        self.write_batch_size = write_batch_size
+        self.write_batch_delay = write_batch_delay
+        self.max_queued_packets = max_queued_packets
+        self.queue_full_policy = queue_full_policy
+        self.compression_policy = compression_policy
+        self.capture = capture
 
 
 class Connection(object):
@@ -56,6 +70,14 @@ class Connection(object):
         allowed_versions=None,
         handle_exception=None,
         handle_exit=None,
+        skip_unused_packets=False,
+        lazy_packets=False,
+        write_batch_size=65536,
+        write_batch_delay=0,
+        max_queued_packets=None,
+        queue_full_policy='block',
+        compression_policy=None,
+        capture=None,
     ):
         """Sets up an instance of this object to be able to connect to a
         minecraft server.
@@ -98,11 +120,57 @@ class Connection(object):
                             and not with the intention to automatically
                             reconnect. Exceptions raised from this function
                             will be handled by any matching exception handlers.
+        :param skip_unused_packets: If 'True', incoming packets are only decoded
+                                    if the current reactor or a packet listener
+                                    needs them (see 'PacketReactor.packet_needed');
+                                    any other packets are discarded unread.
+        :param lazy_packets: If 'True', the fields of incoming packets given by
+                             their definitions are decoded only when first
+                             accessed (see 'Packet.read_lazily'), so that
+                             listeners pay nothing for fields they never use.
+        :param write_batch_size: Queued packets are written together, in
+                                 batches of about this many bytes, each sent
+                                 with one call to the socket (and encrypted
+                                 with one call to the cipher).
+        :param write_batch_delay: The longest time, in seconds, that a batch
+                                  of queued packets smaller than
+                                  'write_batch_size' is held back so that
+                                  more packets may join it. The default of 0
+                                  sends each batch as soon as the queue is
+                                  empty, minimising latency; larger values
+                                  trade latency for fewer, larger writes.
+        :param max_queued_packets: The greatest number of packets that may wait
+                                   in the outgoing queue (see 'write_packet'),
+                                   or None for no limit. Packets written by
+                                   the networking thread itself, such as the
+                                   responses of reactors and packet listeners,
+                                   are always queued.
+        :param queue_full_policy: What 'write_packet' does with a packet when
+                                  the queue is full: 'block' waits until there
+                                  is room; 'drop' discards the packet; and
+                                  'coalesce' discards the oldest queued packet
+                                  of the same class and queues the new one at
+                                  the end, or otherwise discards the new one.
+                                  'dropped_packets' counts the packets
+                                  discarded.
+        :param compression_policy: A 'CompressionPolicy' deciding how
+                                   outgoing packets are compressed once the
+                                   server enables compression, and counting
+                                   the bytes saved and time spent. By
+                                   default, a new 'CompressionPolicy()',
+                                   which compresses as before.
+        :param capture: A 'PacketCapture' to which the frames received in the
+                        play state are recorded, so that they may later be
+                        replayed without a server (see 'capture.replay').
         """  # NOQA
 
         # This lock is re-entrant because it may be acquired in a re-entrant
         # manner from within an outgoing packet
         self._write_lock = RLock()
+        # Notified when a packet is taken from the outgoing queue, or the
+        # networking thread stops.
+        self._queue_not_full = threading.Condition(self._write_lock)
+        self._outgoing_packet_queue = deque()
 
         self.networking_thread = None
         self.new_networking_thread = None
@@ -110,6 +178,17 @@ class Connection(object):
         self.early_packet_listeners = []
         self.outgoing_packet_listeners = []
         self.early_outgoing_packet_listeners = []
+        self._write_batch = _WriteBatch()
+
+        # Each packet is dispatched only to the listeners for its class.
+        self._listener_index = packets.PacketListenerIndex(
+            self.packet_listeners)
+        self._early_listener_index = packets.PacketListenerIndex(
+            self.early_packet_listeners)
+        self._outgoing_listener_index = packets.PacketListenerIndex(
+            self.outgoing_packet_listeners)
+        self._early_outgoing_listener_index = packets.PacketListenerIndex(
+            self.early_outgoing_packet_listeners)
         self._exception_handlers = []
 
         def proto_version(version):
@@ -140,6 +219,21 @@ class Connection(object):
         self.options = _ConnectionOptions()
         self.options.address = address
         self.options.port = port
+        self.options.skip_unused_packets = skip_unused_packets
+        self.options.lazy_packets = lazy_packets
+        self.options.write_batch_size = write_batch_size
+        self.options.write_batch_delay = write_batch_delay
+        if queue_full_policy not in ('block', 'drop', 'coalesce'):
+            raise ValueError('Unknown queue_full_policy: %r.'
+                             % queue_full_policy)
+        self.options.max_queued_packets = max_queued_packets
+        self.options.queue_full_policy = queue_full_policy
+        if compression_policy is None:
+            compression_policy = CompressionPolicy()
+        self.options.compression_policy = compression_policy
+        self.options.capture = capture
+        # The number of packets discarded because the queue was full.
+        self.dropped_packets = 0
         self.auth_token = auth_token
         self.username = username
         self.connected = False
@@ -176,17 +270,54 @@ class Connection(object):
         and write the packet out immediately, and as such may block.
 
         If force is false then the packet will be added to the end of the
-        packet writing queue to be sent 'as soon as possible'
+        packet writing queue to be sent 'as soon as possible'. If the queue
+        already holds 'max_queued_packets' packets, 'queue_full_policy'
+        decides whether to wait for room or to discard a packet.
 
         :param packet: The :class:`network.packets.Packet` to write
         :param force(bool): Specifies if the packet write should be immediate
+        :return: False if the packet was discarded because the queue was full,
+                 otherwise True.
         """
         packet.context = self.context
         if force:
             with self._write_lock:
-                self._write_packet(packet)
-        else:
-            self._outgoing_packet_queue.append(packet)
+                self._write_packet(packet, self._write_batch)
+                self._flush_packets()
+            return True
+
+        queue, limit = self._outgoing_packet_queue, \
+            self.options.max_queued_packets
+        if limit is None or len(queue) < limit or \
+           threading.current_thread() is self.networking_thread:
+            queue.append(packet)
+            return True
+
+        with self._queue_not_full:
+            policy = self.options.queue_full_policy
+            if policy == 'block':
+                while len(self._outgoing_packet_queue) >= limit and \
+                        self.networking_thread is not None:
+                    self._queue_not_full.wait()
+                self._outgoing_packet_queue.append(packet)
+                return True
+
+            queue = self._outgoing_packet_queue
+            if len(queue) < limit:
+                queue.append(packet)
+                return True
+            self.dropped_packets += 1
+            if policy == 'coalesce':
+                # Other threads, such as the networking thread, may append
+                # to the queue without the lock, so a copy is searched. Its
+                # indices remain valid, as packets are only removed from the
+                # front of the queue while the lock is held.
+                for index, queued_packet in enumerate(list(queue)):
+                    if type(queued_packet) is type(packet):
+                        del queue[index]
+                        queue.append(packet)
+                        return True
+            return False
 
     def listener(self, *packet_types, **kwds):
         """
@@ -238,11 +369,13 @@ class Connection(object):
         """
         outgoing = kwds.pop('outgoing', False)
         early = kwds.pop('early', False)
-        target = self.packet_listeners if not early and not outgoing \
-            else self.early_packet_listeners if early and not outgoing \
-            else self.outgoing_packet_listeners if not early \
-            else self.early_outgoing_packet_listeners
-        target.append(packets.PacketListener(method, *packet_types, **kwds))
+        index = self._listener_index if not early and not outgoing \
+            else self._early_listener_index if early and not outgoing \
+            else self._outgoing_listener_index if not early \
+            else self._early_outgoing_listener_index
+        index.listeners.append(
+            packets.PacketListener(method, *packet_types, **kwds))
+        index.invalidate()
 
     def register_exception_handler(self, handler_func, *exc_types, **kwds):
         """
@@ -283,8 +416,9 @@ class Connection(object):
             self._exception_handlers.append((handler_func, exc_types))
 
     def _pop_packet(self):
-        # Pops the topmost packet off the outgoing queue and writes it out
-        # through the socket
+        # Pops the topmost packet off the outgoing queue and writes it into
+        # the current batch, which is sent through the socket by
+        # '_flush_packets', or here once it reaches 'write_batch_size' bytes.
         #
         # Mostly an internal convenience function, caller should make sure
         # they have the write lock acquired to avoid issues caused by
@@ -294,23 +428,53 @@ class Connection(object):
         if len(self._outgoing_packet_queue) == 0:
             return False
         else:
-            self._write_packet(self._outgoing_packet_queue.popleft())
+            self._write_packet(self._outgoing_packet_queue.popleft(),
+                               self._write_batch)
+            self._queue_not_full.notify()
+            if len(self._write_batch.data) >= self.options.write_batch_size:
+                self._flush_packets()
             return True
 
-    def _write_packet(self, packet):
-        # Immediately writes the given packet to the network. The caller must
-        # have the write lock acquired before calling this method.
+    def _flush_packets(self, due=False):
+        # Sends the batch of packets written by '_pop_packet' through the
+        # socket. If 'due' is True, a batch smaller than 'write_batch_size'
+        # is only sent once it has been held for 'write_batch_delay' seconds.
+        # Returns the time in seconds until a batch that is held will be due,
+        # or None if there is none. The caller must have the write lock
+        # acquired before calling this method.
+        batch = self._write_batch
+        if not batch.data:
+            return None
+        if due:
+            wait = batch.started + self.options.write_batch_delay \
+                - timeit.default_timer()
+            if wait > 0 and len(batch.data) < self.options.write_batch_size:
+                return wait
+        self.socket.sendall(batch.data)
+        del batch.data[:]
+        return None
+
+    def _write_packet(self, packet, socket=None):
+        # Immediately writes the given packet to 'socket', by default the
+        # connection's socket. The caller must have the write lock acquired
+        # before calling this method.
+        if socket is None:
+            socket = self.socket
+        packet_class = type(packet)
         try:
-            for listener in self.early_outgoing_packet_listeners:
-                listener.call_packet(packet)
+            for callback in self._early_outgoing_listener_index.callbacks(
+                    packet_class):
+                callback(packet)
 
             if self.options.compression_enabled:
-                packet.write(self.socket, self.options.compression_threshold)
+                packet.write(socket, self.options.compression_threshold,
+                             self.options.compression_policy)
             else:
-                packet.write(self.socket)
+                packet.write(socket)
 
-            for listener in self.outgoing_packet_listeners:
-                listener.call_packet(packet)
+            for callback in self._outgoing_listener_index.callbacks(
+                    packet_class):
+                callback(packet)
         except IgnorePacket:
             pass
 
@@ -395,11 +559,12 @@ class Connection(object):
     def _connect(self):
         # Connect a socket to the server and create a file object from the
         # socket.
-        # The file object is used to read any and all data from the socket
-        # since it's "guaranteed" to read the number of bytes specified,
-        # the socket itself will mostly be used to write data upstream to
-        # the server.
+        # The file object is used to read any and all data from the socket,
+        # in large chunks, into the receive buffer, from which packets are
+        # then taken; the socket itself will mostly be used to write data
+        # upstream to the server.
         self._outgoing_packet_queue = deque()
+        self._write_batch = _WriteBatch()
 
         info = socket.getaddrinfo(self.options.address, self.options.port,
                                   0, socket.SOCK_STREAM)
@@ -414,7 +579,12 @@ class Connection(object):
 
         self.socket = socket.socket(ai_faml, ai_type, ai_prot)
         self.socket.connect(ai_addr)
+        if ai_faml in (socket.AF_INET, socket.AF_INET6):
+            # Packets are already written in batches (see '_pop_packet'), so
+            # waiting to coalesce them further would only add latency.
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         self.file_object = self.socket.makefile("rb", 0)
+        self.receive_buffer = ReceiveBuffer()
         self.options.compression_enabled = False
         self.options.compression_threshold = -1
         self.connected = True
@@ -430,6 +600,7 @@ class Connection(object):
                 # Flush any packets remaining in the queue.
                 while self._pop_packet():
                     pass
+                self._flush_packets()
 
             if self.networking_thread is not None:
                 self.networking_thread.interrupt = True
@@ -517,17 +688,40 @@ class Connection(object):
             self.handle_exit()
 
     def _react(self, packet):
+        packet_class = type(packet)
         try:
-            for listener in self.early_packet_listeners:
-                listener.call_packet(packet)
+            for callback in self._early_listener_index.callbacks(packet_class):
+                callback(packet)
             self.reactor.react(packet)
-            for listener in self.packet_listeners:
-                listener.call_packet(packet)
+            for callback in self._listener_index.callbacks(packet_class):
+                callback(packet)
         except IgnorePacket:
             pass
 
 
+class _WriteBatch(object):
+    # The frames of packets taken from a connection's outgoing queue, to be
+    # sent to the server together.
+    __slots__ = 'data', 'started'
+
+    def __init__(self):
+        self.data = bytearray()
+        self.started = None  # When the first of the frames was written.
+
+    def send(self, data):
+        if not self.data:
+            self.started = timeit.default_timer()
+        self.data += data
+
+
 class NetworkingThread(threading.Thread):
+    # Each iteration of the networking loop writes at most 'write_limit'
+    # packets, and reads from the network at most 'read_limit' times, after
+    # which every packet already received is still processed. These limits
+    # adapt to the traffic, within the following bounds:
+    MIN_WRITE_LIMIT, MAX_WRITE_LIMIT = 300, 4800
+    MIN_READ_LIMIT, MAX_READ_LIMIT = 1, 64
+
     def __init__(self, connection, previous=None):
         threading.Thread.__init__(self)
         self.interrupt = False
@@ -537,6 +731,9 @@ class NetworkingThread(threading.Thread):
 
         self.previous_thread = previous
 
+        self.write_limit = self.MIN_WRITE_LIMIT
+        self.read_limit = self.MIN_READ_LIMIT
+
     def run(self):
         try:
             if self.previous_thread is not None:
@@ -553,37 +750,73 @@ class NetworkingThread(threading.Thread):
         finally:
             with self.connection._write_lock:
                 self.connection.networking_thread = None
+                self.connection._queue_not_full.notify_all()
 
     def _run(self):
         while not self.interrupt:
-            # Attempt to write out as many as 300 packets.
+            # Attempt to write out as many as 'write_limit' packets. These are
+            # written together in batches (see '_pop_packet'), and the last
+            # batch is sent unless it is to be held back for longer.
             num_packets = 0
+            flush_wait = None
             with self.connection._write_lock:
                 try:
                     while not self.interrupt and self.connection._pop_packet():
                         num_packets += 1
-                        if num_packets >= 300:
+                        if num_packets >= self.write_limit:
                             break
+                    flush_wait = self.connection._flush_packets(due=True)
                     exc_info = None
                 except IOError:
                     exc_info = sys.exc_info()
 
                 # If any packets remain to be written, resume writing as soon
                 # as possible after reading any available packets; otherwise,
-                # wait for up to 50ms (1 tick) for new packets to arrive.
+                # wait for up to 50ms (1 tick) for new packets to arrive, or
+                # until the batch being held is due to be sent.
                 if self.connection._outgoing_packet_queue:
                     read_timeout = 0
+                    writes_pending = True
+                else:
+                    read_timeout = 0.05 if flush_wait is None else \
+                        min(0.05, flush_wait)
+                    writes_pending = False
+
+            # Raise the write limit while a backlog persists, and let it fall
+            # back once the queue is being emptied easily.
+            if writes_pending and num_packets >= self.write_limit:
+                self.write_limit = min(
+                    2 * self.write_limit, self.MAX_WRITE_LIMIT)
+            elif num_packets < self.write_limit // 2:
+                self.write_limit = max(
+                    self.write_limit // 2, self.MIN_WRITE_LIMIT)
+
+            # Wait once for data to arrive, and then read and react to every
+            # packet that has been received, going back to the network for
+            # more data at most 'read_limit' times. Stop early if any packets
+            # are queued in response, so that they are not delayed; the rest
+            # of the received packets will be read in the next iteration.
+            num_reads = 0
+            num_queued = len(self.connection._outgoing_packet_queue)
+            while not self.interrupt:
+                connection = self.connection
+                if len(connection._outgoing_packet_queue) > num_queued:
+                    writes_pending = True
+                    break
+                frame = connection.receive_buffer.next_frame()
+                if frame is not None:
+                    packet = connection.reactor.decode_packet(frame)
+                    if packet is None:
+                        continue
+                elif num_reads < self.read_limit:
+                    num_reads += 1
+                    packet = connection.reactor.read_packet(
+                        connection.file_object, timeout=read_timeout)
+                    if not packet:
+                        break
                 else:
-                    read_timeout = 0.05
-
-            # Read and react to as many as 50 packets.
-            while num_packets < 50 and not self.interrupt:
-                packet = self.connection.reactor.read_packet(
-                    self.connection.file_object, timeout=read_timeout)
-                if not packet:
                     break
-                num_packets += 1
-                self.connection._react(packet)
+                connection._react(packet)
                 read_timeout = 0
 
                 # Ignore the earlier exception if a disconnect packet is
@@ -592,6 +825,14 @@ class NetworkingThread(threading.Thread):
                 if exc_info is not None and packet.packet_name == "disconnect":
                     exc_info = None
 
+            # Allow more reads per iteration during a flood of incoming data,
+            # unless outgoing packets are waiting to be written.
+            if num_reads >= self.read_limit and not writes_pending:
+                self.read_limit = min(2 * self.read_limit, self.MAX_READ_LIMIT)
+            elif writes_pending or num_reads < self.read_limit:
+                self.read_limit = max(
+                    self.read_limit // 2, self.MIN_READ_LIMIT)
+
             if exc_info is not None:
                 exc_value, exc_tb = exc_info[1:]
                 raise exc_value.with_traceback(exc_tb)
@@ -606,57 +847,159 @@ class PacketReactor(object):
     # Handshaking is considered the "default" state
     get_clientbound_packets = staticmethod(clientbound.handshake.get_packets)
 
+    # The 'packet_name's of the packets to which 'react' may respond, or None
+    # if it may respond to any packet. This is only used if it is defined in
+    # the same class as 'react', so a subclass overriding 'react' must also
+    # define it to allow any packets to be skipped.
+    react_packet_names = None
+
+    # The greatest size of the data of a compressed packet, once decompressed,
+    # beyond which the packet is rejected, as by the vanilla client.
+    max_decompressed_size = 2 ** 23
+
+    # Whether the frames decoded by this reactor are recorded by the
+    # connection's 'PacketCapture', if it has one. Only the play state is
+    # recorded, as replaying the others would repeat the login.
+    capture_frames = False
+
     def __init__(self, connection):
         self.connection = connection
-        context = self.connection.context
-        self.clientbound_packets = {
-            packet.get_id(context): packet
-            for packet in self.__class__.get_clientbound_packets(context)}
+
+        for cls in type(self).__mro__:
+            if 'react' in cls.__dict__:
+                self._react_packet_names = \
+                    cls.__dict__.get('react_packet_names')
+                break
+
+        # A read-only table shared by all reactors for the same state and
+        # protocol version. To receive other packets, a subclass should
+        # override 'get_clientbound_packets'.
+        registry = packets.ProtocolRegistry.for_context(
+            self.connection.context)
+        self.clientbound_packets = registry.packets_by_id(
+            self.__class__.get_clientbound_packets)
 
     def read_packet(self, stream, timeout=0):
-        # Block for up to `timeout' seconds waiting for `stream' to become
-        # readable, returning `None' if the timeout elapses.
-        ready_to_read = select.select([stream], [], [], timeout)[0]
-
-        if ready_to_read:
-            length = VarInt.read(stream)
-
-            packet_data = packets.PacketBuffer()
-            packet_data.send(stream.read(length))
-            # Ensure we read all the packet
-            while len(packet_data.get_writable()) < length:
-                packet_data.send(
-                    stream.read(length - len(packet_data.get_writable())))
-            packet_data.reset_cursor()
-
-            if self.connection.options.compression_enabled:
-                decompressed_size = VarInt.read(packet_data)
-                if decompressed_size > 0:
-                    decompressor = zlib.decompressobj()
-                    decompressed_packet = decompressor.decompress(
-                                                       packet_data.read())
-                    assert len(decompressed_packet) == decompressed_size, \
-                        'decompressed length %d, but expected %d' % \
-                        (len(decompressed_packet), decompressed_size)
-                    packet_data.reset()
-                    packet_data.send(decompressed_packet)
-                    packet_data.reset_cursor()
-
-            packet_id = VarInt.read(packet_data)
-
-            # If we know the structure of the packet, attempt to parse it
-            # otherwise, just return an instance of the base Packet class.
-            if packet_id in self.clientbound_packets:
-                packet = self.clientbound_packets[packet_id]()
-                packet.context = self.connection.context
-                packet.read(packet_data)
+        # Return the next packet from the connection's receive buffer. If no
+        # complete packet has been buffered, block for up to `timeout' seconds
+        # waiting for `stream' to become readable, returning `None' if the
+        # timeout elapses, and then read until a whole packet is buffered.
+        # Packets skipped by `decode_packet' are passed over; if every frame
+        # read from `stream' is skipped, `None' is also returned, rather than
+        # waiting again, so that the caller may first write any packets
+        # queued meanwhile.
+        receive_buffer = self.connection.receive_buffer
+        filled = False
+        while True:
+            frame = receive_buffer.next_frame()
+            if frame is None:
+                if filled:
+                    return None
+                ready_to_read = select.select([stream], [], [], timeout)[0]
+                if not ready_to_read:
+                    return None
+                receive_buffer.fill(stream)
+                frame = receive_buffer.next_frame()
+                while frame is None:
+                    receive_buffer.fill(stream)
+                    frame = receive_buffer.next_frame()
+                filled = True
+            packet = self.decode_packet(frame)
+            if packet is not None:
+                return packet
+
+    def decode_packet(self, frame):
+        # Decode a packet from the data of a single frame, i.e. excluding its
+        # length prefix, but including any compression header. If the
+        # connection skips unused packets, return None for a packet which is
+        # not needed.
+        if self.capture_frames:
+            capture = self.connection.options.capture
+            if capture is not None:
+                capture.record(frame, self.connection)
+        packet_data = packets.PacketView(frame)
+
+        decompressor = None
+        if self.connection.options.compression_enabled:
+            decompressed_size = VarInt.read(packet_data)
+            if decompressed_size > 0:
+                if decompressed_size > self.max_decompressed_size:
+                    raise ValueError(
+                        'Compressed packet of %d bytes exceeds the maximum '
+                        'of %d.' % (decompressed_size,
+                                    self.max_decompressed_size))
+                # At first, only enough is decompressed to read the packet
+                # ID, so that the rest need not be if the packet is unused.
+                decompressor = zlib.decompressobj()
+                packet_data = packets.PacketView(decompressor.decompress(
+                    packet_data.data[packet_data.offset:], VarInt.max_bytes))
+
+        packet_id = VarInt.read(packet_data)
+        packet_class = self.clientbound_packets.get(packet_id)
+
+        if self.connection.options.skip_unused_packets and \
+           not self.packet_needed(packet_class or packets.Packet):
+            return None
+
+        if decompressor is not None and packet_class is not None:
+            packet_data = self._decompress_rest(
+                decompressor, packet_data, decompressed_size)
+
+        # If we know the structure of the packet, attempt to parse it
+        # otherwise, just return an instance of the base Packet class.
+        if packet_class is not None:
+            packet = packet_class()
+            packet.context = self.connection.context
+            if self.connection.options.lazy_packets:
+                if not isinstance(packet_data.data.obj, bytes):
+                    # The frame lies in the receive buffer, which will be
+                    # reused, so the remaining data must be kept in a copy.
+                    packet_data = packets.PacketView(
+                        packet_data.data[packet_data.offset:].tobytes())
+                packet.read_lazily(packet_data)
             else:
-                packet = packets.Packet()
-                packet.context = self.connection.context
-                packet.id = packet_id
-            return packet
+                packet.read(packet_data)
         else:
-            return None
+            packet = packets.Packet()
+            packet.context = self.connection.context
+            packet.id = packet_id
+        return packet
+
+    @staticmethod
+    def _decompress_rest(decompressor, packet_data, decompressed_size):
+        # Given a 'PacketView' of the start of a compressed packet's data, as
+        # decompressed so far by 'decompressor', return one of all its data,
+        # read as far as the original. No more than 'decompressed_size' bytes
+        # are ever decompressed, so that a packet which is not as long as it
+        # claims cannot exhaust the available memory.
+        start = packet_data.data.obj
+        remaining = decompressed_size - len(start)
+        rest = decompressor.decompress(decompressor.unconsumed_tail,
+                                       remaining) if remaining > 0 else b''
+        length = len(start) + len(rest)
+        if length > decompressed_size or not decompressor.eof and \
+           decompressor.decompress(decompressor.unconsumed_tail, 1):
+            raise ValueError('decompressed length exceeds the expected %d'
+                             % decompressed_size)
+        if length < decompressed_size:
+            raise ValueError('decompressed length %d, but expected %d'
+                             % (length, decompressed_size))
+        offset = packet_data.offset
+        packet_data = packets.PacketView(start + rest)
+        packet_data.offset = offset
+        return packet_data
+
+    def packet_needed(self, packet_class):
+        """Whether incoming packets of the given class must be decoded,
+           because they may be used by 'react' or by a packet listener.
+        """
+        names = self._react_packet_names
+        if names is None or packet_class.packet_name in names:
+            return True
+        connection = self.connection
+        return bool(
+            connection._early_listener_index.callbacks(packet_class) or
+            connection._listener_index.callbacks(packet_class))
 
     def react(self, packet):
         """Called with each incoming packet after early packet listeners are
@@ -677,6 +1020,10 @@ class PacketReactor(object):
 class LoginReactor(PacketReactor):
     get_clientbound_packets = staticmethod(clientbound.login.get_packets)
 
+    react_packet_names = frozenset({
+        "encryption request", "disconnect", "login success",
+        "set compression", "login plugin request"})
+
     def react(self, packet):
         if packet.packet_name == "encryption request":
 
@@ -740,6 +1087,12 @@ class LoginReactor(PacketReactor):
 class PlayingReactor(PacketReactor):
     get_clientbound_packets = staticmethod(clientbound.play.get_packets)
 
+    react_packet_names = frozenset({
+        "set compression", "keep alive", "player position and look",
+        "disconnect"})
+
+    capture_frames = True
+
     def react(self, packet):
         if packet.packet_name == "set compression":
             self.connection.options.compression_threshold = packet.threshold
@@ -777,6 +1130,8 @@ class StatusReactor(PacketReactor):
         super(StatusReactor, self).__init__(connection)
         self.do_ping = do_ping
 
+    react_packet_names = frozenset({"response", "ping"})
+
     def react(self, packet):
         if packet.packet_name == "response":
             status_dict = json.loads(packet.json_response)
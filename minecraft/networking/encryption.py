@@ -63,6 +63,10 @@ def _number_from_bytes(b, signed=False):
 
 
 class EncryptedFileObjectWrapper(object):
+    # 'update_into' needs this much room in its output buffer beyond the
+    # length of its input, i.e. one AES block less one byte.
+    UPDATE_INTO_SLACK = algorithms.AES.block_size // 8 - 1
+
     def __init__(self, file_object, decryptor):
         self.actual_file_object = file_object
         self.decryptor = decryptor
@@ -70,6 +74,21 @@ class EncryptedFileObjectWrapper(object):
     def read(self, length):
         return self.decryptor.update(self.actual_file_object.read(length))
 
+    def readinto(self, buffer):
+        # Each chunk received is decrypted in place, with one call to the
+        # decryptor, leaving room at the end of 'buffer' for 'update_into'.
+        view = memoryview(buffer)
+        if len(view) <= self.UPDATE_INTO_SLACK:
+            length = self.actual_file_object.readinto(view)
+            if length:
+                view[:length] = self.decryptor.update(view[:length])
+            return length
+        length = self.actual_file_object.readinto(
+            view[:len(view) - self.UPDATE_INTO_SLACK])
+        if length:
+            self.decryptor.update_into(view[:length], view)
+        return length
+
     def fileno(self):
         return self.actual_file_object.fileno()
 
@@ -87,7 +106,13 @@ class EncryptedSocketWrapper(object):
         return self.decryptor.update(self.actual_socket.recv(length))
 
     def send(self, data):
-        self.actual_socket.send(self.encryptor.update(data))
+        # Once encrypted, data must be sent in full, as the encryptor's state
+        # has already advanced past it: so this is the same as 'sendall'.
+        self.sendall(data)
+        return len(data)
+
+    def sendall(self, data):
+        self.actual_socket.sendall(self.encryptor.update(data))
 
     def fileno(self):
         return self.actual_socket.fileno()
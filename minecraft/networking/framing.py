@@ -0,0 +1,131 @@
+"""Splits the stream of data received from a server into packet frames, each
+   consisting of a VarInt length followed by that many bytes of packet data.
+"""
+from .types import VarInt
+
+
+class ReceiveBuffer(object):
+    """A reusable buffer into which data is received in large chunks, and
+       from which complete frames are taken without being copied.
+
+       Data is read with 'readinto' into the free space at the end of a single
+       'bytearray'. When that space runs out, the unconsumed data is moved back
+       to the start of the buffer (or, if a frame is larger than the buffer,
+       into a new, larger buffer) rather than the buffer being reallocated
+       after every read.
+
+       The frames returned by 'next_frame' are 'memoryview' objects referring
+       to the buffer itself, so they remain valid only until the next call to
+       'fill'. Anything that must outlive that should be copied.
+    """
+    __slots__ = '_buffer', '_view', '_start', '_end', '_wanted'
+
+    # The least amount of free space that is made available for each read.
+    MIN_READ_SIZE = 4096
+
+    # The greatest length of a frame, beyond which it is rejected, as by the
+    # vanilla client, whose length prefixes are at most 3 bytes long.
+    MAX_FRAME_SIZE = 2 ** 21 - 1
+
+    def __init__(self, size=65536):
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        self._start = 0   # The index of the first unconsumed byte.
+        self._end = 0     # The index just after the last received byte.
+        self._wanted = 0  # The size of the incomplete frame at '_start'.
+
+    def __len__(self):
+        """The number of bytes received but not yet taken as frames."""
+        return self._end - self._start
+
+    def clear(self):
+        """Discard all received data."""
+        self._start = self._end = self._wanted = 0
+
+    def next_frame(self):
+        """Take the next complete frame from the buffer.
+
+        :return: A 'memoryview' of the frame's data, excluding its length
+                 prefix, or None if no complete frame has been received.
+        """
+        start, end = self._start, self._end
+        if start == end:
+            return None
+        length = self._buffer[start]
+        if length < 0x80:
+            pos = start + 1
+        else:
+            # The buffer is read directly, so the length prefix may seem to
+            # extend into stale data after 'end', if it is incomplete.
+            try:
+                length, pos = VarInt.read_from(self._buffer, start)
+            except (EOFError, ValueError):
+                if end - start >= VarInt.max_bytes:
+                    raise
+                return None
+            if pos > end:
+                return None
+
+        if length > self.MAX_FRAME_SIZE:
+            raise ValueError('frame length %d exceeds the maximum of %d'
+                             % (length, self.MAX_FRAME_SIZE))
+        if end - pos < length:
+            self._wanted = pos - start + length
+            return None
+
+        self._start, self._wanted = pos + length, 0
+        return self._view[pos:pos + length]
+
+    def fill(self, stream):
+        """Read as much data as is available from 'stream', which must
+           support 'readinto', blocking until at least one byte is read.
+
+        :return: The number of bytes read.
+        """
+        pending = self._end - self._start
+        if pending == 0:
+            self._start = self._end = 0
+        free = len(self._buffer) - self._end
+        if free < self.MIN_READ_SIZE or \
+           free < self._wanted - pending and self._start > 0:
+            # The buffer grows only with the data actually received, not to
+            # the size given by the length prefix of an incomplete frame,
+            # which the server could overstate; but an incomplete frame is
+            # moved to the start of the buffer if it would not fit after it.
+            self._make_space(pending + self.MIN_READ_SIZE)
+
+        length = stream.readinto(self._view[self._end:])
+        if not length:
+            raise EOFError("Unexpected end of message.")
+        self._end += length
+        return length
+
+    def feed(self, data, decryptor=None):
+        """Append 'data', which has been received by some other means, to the
+           buffer. If 'decryptor' is given, 'data' is decrypted with it
+           directly into the buffer.
+        """
+        pending = self._end - self._start
+        # 'update_into' needs room for up to one AES block less one byte
+        # beyond the length of its input.
+        size = len(data) if decryptor is None else len(data) + 15
+        if len(self._buffer) - self._end < size:
+            self._make_space(pending + size)
+        if decryptor is None:
+            self._view[self._end:self._end + len(data)] = data
+            length = len(data)
+        else:
+            length = decryptor.update_into(data, self._view[self._end:])
+        self._end += length
+
+    def _make_space(self, size):
+        # Move the unconsumed data to the start of a buffer of at least 'size'
+        # bytes, creating a new buffer if the current one is too small.
+        start, end = self._start, self._end
+        if size > len(self._buffer):
+            buffer = bytearray(max(size, 2 * len(self._buffer)))
+            buffer[:end - start] = self._view[start:end]
+            self._buffer, self._view = buffer, memoryview(buffer)
+        elif start > 0:
+            self._view[:end - start] = self._view[start:end]
+        self._start, self._end = 0, end - start
@@ -9,8 +9,10 @@ packets.serverbound.* instead.
 '''
 
 # Packet-Related Utilities
-from .packet_buffer import PacketBuffer
-from .packet_listener import PacketListener
+from .packet_buffer import PacketBuffer, PacketView
+from .packet_listener import PacketListener, PacketListenerIndex
+from .codec import PacketCodec
+from .registry import ProtocolRegistry
 
 # Abstract Packet Classes
 from .packet import Packet
@@ -80,6 +82,7 @@ __all_legacy_packets__ = (
 )
 
 __all_other__ = (
-    Packet, PacketBuffer, PacketListener,
+    Packet, PacketBuffer, PacketView, PacketListener, PacketListenerIndex,
+    PacketCodec, ProtocolRegistry,
     AbstractKeepAlivePacket, AbstractPluginMessagePacket,
 )
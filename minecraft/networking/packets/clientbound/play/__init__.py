@@ -1,3 +1,5 @@
+import json
+
 from minecraft.networking.packets import (
     Packet, AbstractKeepAlivePacket, AbstractPluginMessagePacket
 )
@@ -119,6 +121,26 @@ class ChatMessagePacket(Packet):
         SYSTEM = 1     # The result of running a command.
         GAME_INFO = 2  # Displayed above the hotbar in vanilla clients.
 
+    @property
+    def chat_data(self):
+        """ The value of 'json_data' decoded from JSON. It is decoded when
+            first accessed, and again only if 'json_data' is changed.
+        """
+        json_data = self.json_data
+        cached = self.__dict__.get('_chat_data')
+        if cached is None or cached[0] is not json_data:
+            cached = self._chat_data = json_data, json.loads(json_data)
+        return cached[1]
+
+    def may_contain_text_starting_with(self, prefix):
+        """ A fast test, which does not decode 'json_data', of whether any
+            string in the message can start with 'prefix'. If this returns
+            False, no text component of the message starts with 'prefix'; if
+            it returns True, one may or may not. 'prefix' should not contain
+            characters which are escaped in JSON strings, such as quotes.
+        """
+        return ('"' + prefix) in self.json_data
+
 
 class DisconnectPacket(Packet):
     @staticmethod
@@ -1,3 +1,8 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from minecraft.networking.packets import Packet
 from minecraft.networking.types import (
     VarInt, Byte, Boolean, UnsignedByte, VarIntPrefixedByteArray, String,
@@ -47,26 +52,76 @@ class MapPacket(Packet):
         __slots__ = ('id', 'scale', 'icons', 'pixels', 'width', 'height',
                      'is_tracking_position', 'is_locked')
 
-        def __init__(self, id=None, scale=None, width=128, height=128):
+        def __init__(self, id=None, scale=None, width=128, height=128,
+                     use_numpy=False):
+            """
+            :param use_numpy: If True, 'pixels' is a one-dimensional
+                              'numpy.ndarray' of 'uint8', rather than a
+                              'bytearray', so that
+                              'pixels.reshape(height, width)' gives a view of
+                              the map indexed by '[z, x]'. Requires NumPy.
+            """
             self.id = id
             self.scale = scale
             self.icons = []
             self.width = width
             self.height = height
-            self.pixels = bytearray(0 for i in range(width*height))
+            if use_numpy:
+                if numpy is None:
+                    raise ImportError('NumPy is required for use_numpy=True.')
+                self.pixels = numpy.zeros(width*height, dtype=numpy.uint8)
+            else:
+                self.pixels = bytearray(width*height)
             self.is_tracking_position = True
             self.is_locked = False
 
-    class MapSet(object):
-        __slots__ = 'maps_by_id'
+        def __eq__(self, other):
+            # Pixels are compared through the buffer protocol, as comparing
+            # NumPy arrays with '==' does not give a single truth value.
+            return type(self) is type(other) and all(
+                memoryview(getattr(self, a)) == memoryview(getattr(other, a))
+                if a == 'pixels' else getattr(self, a) == getattr(other, a)
+                for a in self._all_slots())
 
-        def __init__(self, *maps):
+    class MapSet(object):
+        __slots__ = 'maps_by_id', 'use_numpy'
+
+        def __init__(self, *maps, **kwds):
+            """
+            :param use_numpy: Whether maps created by applying packets to this
+                              set store their pixels in NumPy arrays.
+            """
+            self.use_numpy = kwds.pop('use_numpy', False)
+            assert not kwds, 'Unexpected keyword arguments: %r' % (kwds,)
             self.maps_by_id = {map.id: map for map in maps}
 
         def __repr__(self):
             maps = (repr(map) for map in self.maps_by_id.values())
             return 'MapSet(%s)' % ', '.join(maps)
 
+        def apply_packets(self, packets):
+            """Apply each of a sequence of 'MapPacket's to this set, in order,
+               with the same result as calling 'apply_to_map_set' on each.
+
+               A packet is skipped altogether if a later packet in the
+               sequence updates every pixel of the same map, as that packet
+               also replaces all of the earlier one's other fields.
+            """
+            packets = list(packets)
+            last_whole = {}
+            for index, packet in enumerate(packets):
+                map = self.maps_by_id.get(packet.map_id)
+                width, height = (128, 128) if map is None else \
+                                (map.width, map.height)
+                if packet.pixels is not None and packet.offset == (0, 0) \
+                   and packet.width == width and packet.height == height:
+                    last_whole[packet.map_id] = index
+
+            for index, packet in enumerate(packets):
+                if last_whole.get(packet.map_id, index) > index:
+                    continue
+                packet.apply_to_map_set(self)
+
     def read(self, file_object):
         self.map_id = VarInt.read(file_object)
         self.scale = Byte.read(file_object)
@@ -117,17 +172,49 @@ class MapPacket(Packet):
         map.scale = self.scale
         map.icons[:] = self.icons
         if self.pixels is not None:
-            for i in range(len(self.pixels)):
-                x = self.offset[0] + i % self.width
-                z = self.offset[1] + i // self.width
-                map.pixels[x + map.width * z] = self.pixels[i]
+            self._apply_pixels(map)
         map.is_tracking_position = self.is_tracking_position
         map.is_locked = self.is_locked
 
+    def _apply_pixels(self, map):
+        # Copy the updated rectangle into the map one row at a time, or in one
+        # step if the rows are contiguous in the map.
+        width, (x, z) = self.width, self.offset
+        height = len(self.pixels) // width
+        if x + width > map.width or z + height > map.height:
+            raise ValueError('Map update of size %dx%d at %r does not fit '
+                             'within map of size %dx%d.' % (
+                                 width, height, self.offset,
+                                 map.width, map.height))
+
+        if numpy is not None and isinstance(map.pixels, numpy.ndarray):
+            source = numpy.frombuffer(self.pixels, dtype=numpy.uint8,
+                                      count=width*height)
+            map.pixels.reshape(map.height, map.width)[
+                z:z+height, x:x+width] = source.reshape(height, width)
+            return
+
+        source = memoryview(self.pixels)[:width*height]
+        start = x + map.width * z
+        if width == map.width:
+            map.pixels[start:start + width*height] = source
+            return
+        if width < height:
+            # A narrow rectangle is copied one column at a time instead, each
+            # column being an extended slice of the map.
+            end = start + map.width * height
+            for column in range(width):
+                map.pixels[start + column:end + column:map.width] = \
+                    source[column::width]
+            return
+        for row in range(height):
+            map.pixels[start:start + width] = source[row*width:(row+1)*width]
+            start += map.width
+
     def apply_to_map_set(self, map_set):
         map = map_set.maps_by_id.get(self.map_id)
         if map is None:
-            map = MapPacket.Map(self.map_id)
+            map = MapPacket.Map(self.map_id, use_numpy=map_set.use_numpy)
             map_set.maps_by_id[self.map_id] = map
         self.apply_to_map(map)
 
@@ -136,6 +223,8 @@ class MapPacket(Packet):
         Byte.send(self.scale, packet_buffer)
         if self.context.protocol_version >= 107:
             Boolean.send(self.is_tracking_position, packet_buffer)
+        if self.context.protocol_version >= 452:
+            Boolean.send(self.is_locked, packet_buffer)
 
         VarInt.send(len(self.icons), packet_buffer)
         for icon in self.icons:
@@ -0,0 +1,242 @@
+"""Compilation of packet definitions into specialised readers and writers.
+
+   A packet's definition, as returned by 'Packet.get_definition', is a list of
+   fields, each of which is read or written by a call to its data type. A
+   'PacketCodec' does the same work with fewer calls: consecutive fields whose
+   types have a fixed-width representation are read and written together
+   using a single precompiled 'struct.Struct', and the values read are stored
+   in the packet all at once.
+
+   A codec can also read a packet lazily, decoding each field only when it is
+   first accessed: see 'PacketCodec.read_lazily'.
+"""
+import struct
+from operator import attrgetter
+
+from minecraft.networking.types import (
+    Type, Boolean, UnsignedByte, Byte, Short, UnsignedShort, Integer, Long,
+    UnsignedLong, Float, Double, Angle, FixedPoint, read_in_place,
+)
+
+
+__all__ = 'PacketCodec',
+
+
+# Maps each fixed-width data type to its 'struct' format character. Only these
+# exact types are compiled; subclasses, which may override 'read' or 'send',
+# are treated like any other type.
+FIXED_WIDTH_FORMATS = {
+    Boolean: '?',
+    UnsignedByte: 'B',
+    Byte: 'b',
+    Short: 'h',
+    UnsignedShort: 'H',
+    Integer: 'i',
+    Long: 'q',
+    UnsignedLong: 'Q',
+    Float: 'f',
+    Double: 'd',
+}
+
+
+def _fixed_width_format(data_type):
+    # Return '(format, from_raw, to_raw)' if 'data_type' can be read as part
+    # of a 'struct.Struct', where 'from_raw' and 'to_raw' convert between the
+    # unpacked and the actual values, or are None if no conversion is needed;
+    # or return None for any other type.
+    if data_type is Angle:
+        return ('B', lambda value: 360 * value / 256,
+                lambda value: round(256 * ((value % 360) / 360)))
+    if type(data_type) is FixedPoint:
+        format = FIXED_WIDTH_FORMATS.get(data_type.integer_type)
+        if format is None:
+            return None
+        denominator = data_type.denominator
+        return (format, lambda value: value / denominator,
+                lambda value: int(value * denominator))
+    if isinstance(data_type, type) and issubclass(data_type, Type):
+        format = FIXED_WIDTH_FORMATS.get(data_type)
+        if format is not None:
+            return format, None, None
+    return None
+
+
+class PacketCodec(object):
+    """Reads and writes the fields given by a packet definition.
+
+       The codecs of packet classes are normally obtained from
+       'ProtocolRegistry.codec', which compiles each packet class's
+       definition only once for each protocol version.
+    """
+    __slots__ = ('names', 'lazy', '_positions', '_readers', '_writers',
+                 '_set_attributes')
+
+    def __init__(self, definition, packet_class=None):
+        """
+        :param definition: A list of fields, each a dict mapping attribute
+                           names to data types, as in 'Packet.definition'.
+        :param packet_class: The class of the packets to be read, if known.
+                             Reading is faster when none of the fields are
+                             data descriptors of this class.
+        """
+        fields = [(name, data_type) for field in definition
+                  for name, data_type in field.items()]
+        self.names = tuple(name for name, _data_type in fields)
+        self._positions = {name: i for i, name in enumerate(self.names)}
+        self._readers = []
+        self._writers = []
+
+        # Values can only be stored directly in the instance dictionary if
+        # doing so is not intercepted by a descriptor, such as a property.
+        self._set_attributes = packet_class is None or any(
+            hasattr(getattr(packet_class, name, None), '__set__')
+            for name in self.names)
+
+        # Fields can only be decoded on demand by 'Packet.__getattr__', which
+        # is not called for names found in the class, such as default values.
+        self.lazy = packet_class is not None and not any(
+            hasattr(packet_class, name) for name in self.names)
+
+        run = []
+        for name, data_type in fields:
+            fixed = _fixed_width_format(data_type)
+            if fixed is not None:
+                run.append((name,) + fixed)
+                continue
+            if run:
+                self._compile_run(run)
+                run = []
+            self._compile_field(name, data_type)
+        if run:
+            self._compile_run(run)
+
+    def read(self, packet, file_object):
+        """Read the fields of 'packet' from 'file_object'."""
+        values = []
+        context = packet.context
+        for reader in self._readers:
+            reader(file_object, context, values)
+        if self._set_attributes:
+            for name, value in zip(self.names, values):
+                setattr(packet, name, value)
+        else:
+            packet.__dict__.update(zip(self.names, values))
+
+    def read_lazily(self, packet, file_object):
+        """Prepare to read the fields of 'packet' from 'file_object' as they
+           are accessed, which must be possible according to 'lazy'. Each
+           access decodes the fields preceding the one accessed that have not
+           yet been decoded, so that offsets are found incrementally, and
+           fields after it are left undecoded.
+
+           'file_object' is kept by 'packet' until all of its fields are
+           decoded, so it must not be modified in the meantime. Any error in
+           the data is raised only when the field concerned is accessed.
+        """
+        assert self.lazy, 'Fields of %s cannot be read lazily.' % \
+            type(packet).__name__
+        packet.__dict__['_lazy_reader'] = _LazyReader(self, file_object)
+
+    def write(self, packet, packet_buffer):
+        """Write the fields of 'packet' to 'packet_buffer'."""
+        context = packet.context
+        for writer in self._writers:
+            writer(packet, packet_buffer, context)
+
+    def _compile_field(self, name, data_type):
+        read_with_context = data_type.read_with_context
+        send_with_context = data_type.send_with_context
+        get_value = attrgetter(name)
+
+        def read_field(file_object, context, values):
+            values.append(read_with_context(file_object, context))
+
+        def write_field(packet, packet_buffer, context):
+            send_with_context(get_value(packet), packet_buffer, context)
+
+        self._readers.append(read_field)
+        self._writers.append(write_field)
+
+    def _compile_run(self, run):
+        # Compile a run of consecutive fixed-width fields, given as a list of
+        # '(name, format, from_raw, to_raw)', into one reader and one writer.
+        names = tuple(field[0] for field in run)
+        packer = struct.Struct('>' + ''.join(field[1] for field in run))
+        unpack, unpack_from = packer.unpack, packer.unpack_from
+        pack, size = packer.pack, packer.size
+        get_values = attrgetter(*names)
+        from_raw = [field[2] for field in run]
+        to_raw = [field[3] for field in run]
+
+        def unpack_run_from(data, offset):
+            return unpack_from(data, offset), offset + size
+
+        def unpack_run_file(file_object):
+            return unpack(file_object.read(size))
+
+        if not any(from_raw):
+            def read_run(file_object, context, values):
+                values.extend(read_in_place(
+                    file_object, unpack_run_from, unpack_run_file))
+
+            if len(names) == 1:
+                def write_run(packet, packet_buffer, context):
+                    packet_buffer.send(pack(get_values(packet)))
+            else:
+                def write_run(packet, packet_buffer, context):
+                    packet_buffer.send(pack(*get_values(packet)))
+        else:
+            def read_run(file_object, context, values):
+                values.extend(
+                    value if convert is None else convert(value)
+                    for convert, value in zip(from_raw, read_in_place(
+                        file_object, unpack_run_from, unpack_run_file)))
+
+            def write_run(packet, packet_buffer, context):
+                values = get_values(packet)
+                if len(names) == 1:
+                    values = values,
+                packet_buffer.send(pack(*(
+                    value if convert is None else convert(value)
+                    for convert, value in zip(to_raw, values))))
+
+        self._readers.append(read_run)
+        self._writers.append(write_run)
+
+
+class _LazyReader(object):
+    # The state of a packet whose fields are being read lazily, as stored in
+    # its '_lazy_reader' attribute by 'PacketCodec.read_lazily'.
+    __slots__ = 'codec', 'file_object', 'reader_index', 'count'
+
+    def __init__(self, codec, file_object):
+        self.codec = codec
+        self.file_object = file_object
+        self.reader_index = 0  # The index of the next reader to be called.
+        self.count = 0         # The number of fields decoded so far.
+
+    def read_until(self, packet, name):
+        # Decode the fields of 'packet' up to and including 'name', returning
+        # False if there is no such field still to be decoded. Values already
+        # given to the packet's attributes are not overwritten.
+        codec = self.codec
+        position = codec._positions.get(name)
+        if position is None or position < self.count:
+            return False
+        names, readers = codec.names, codec._readers
+        attributes, context = packet.__dict__, packet.context
+        values = []
+        while self.count <= position:
+            readers[self.reader_index](self.file_object, context, values)
+            self.reader_index += 1
+            for value in values:
+                attributes.setdefault(names[self.count], value)
+                self.count += 1
+            del values[:]
+        if self.count == len(names):
+            del attributes['_lazy_reader']
+        return True
+
+    def read_all(self, packet):
+        # Decode all the fields of 'packet' not yet decoded.
+        self.read_until(packet, self.codec.names[-1])
@@ -1,6 +1,6 @@
-from zlib import compress
-
-from .packet_buffer import PacketBuffer
+from .packet_buffer import FrameBuffer
+from .codec import PacketCodec
+from .registry import ProtocolRegistry, registries
 from minecraft.networking.types import (
     VarInt, Enum, overridable_property,
 )
@@ -20,9 +20,17 @@ class Packet(object):
     def get_id(cls, _context):
         return getattr(cls, 'id')
 
+    # The result of 'get_id' is looked up in the 'ProtocolRegistry' for the
+    # packet's protocol version, so that it is computed only once.
     @overridable_property
     def id(self):
-        return None if self.context is None else self.get_id(self.context)
+        context = self.context
+        if context is None:
+            return None
+        try:
+            return registries[context.protocol_version].ids[type(self)]
+        except KeyError:
+            return ProtocolRegistry.for_context(context).packet_id(type(self))
 
     # To define the network data layout of a packet, either:
     #  1. Define the attribute `definition', a list of fields, each of which
@@ -37,10 +45,33 @@ class Packet(object):
     def get_definition(cls, _context):
         return getattr(cls, 'definition')
 
+    # As with 'id', the result of 'get_definition' is looked up in the
+    # 'ProtocolRegistry'.
     @overridable_property
     def definition(self):
-        return None if self.context is None else \
-               self.get_definition(self.context)
+        context = self.context
+        if context is None:
+            return None
+        try:
+            return registries[context.protocol_version].definitions[type(self)]
+        except KeyError:
+            return ProtocolRegistry.for_context(context).definition(type(self))
+
+    # The 'PacketCodec' used by the default implementations of 'read' and
+    # 'write_fields', compiled from the packet's definition. Codecs of packet
+    # classes are kept in the 'ProtocolRegistry', so each is compiled once per
+    # protocol version.
+    @overridable_property
+    def codec(self):
+        context = self.context
+        if context is None:
+            return None
+        if 'definition' in self.__dict__:
+            return PacketCodec(self.definition, type(self))
+        try:
+            return registries[context.protocol_version].codecs[type(self)]
+        except KeyError:
+            return ProtocolRegistry.for_context(context).codec(type(self))
 
     # In general, a packet instance must have its 'context' attribute set to an
     # instance of 'ConnectionContext', for example to decide on version-
@@ -64,52 +95,55 @@ class Packet(object):
         return self
 
     def read(self, file_object):
-        for field in self.definition:  # pylint: disable=not-an-iterable
-            for var_name, data_type in field.items():
-                value = data_type.read_with_context(file_object, self.context)
-                setattr(self, var_name, value)
-
-    # Writes a packet buffer to the socket with the appropriate headers
-    # and compressing the data if necessary
-    def _write_buffer(self, socket, packet_buffer, compression_threshold):
-        # compression_threshold of None means compression is disabled
-        if compression_threshold is not None:
-            if len(packet_buffer.get_writable()) > compression_threshold != -1:
-                # compress the current payload
-                packet_data = packet_buffer.get_writable()
-                compressed_data = compress(packet_data)
-                packet_buffer.reset()
-                # write out the length of the uncompressed payload
-                VarInt.send(len(packet_data), packet_buffer)
-                # write the compressed payload itself
-                packet_buffer.send(compressed_data)
-            else:
-                # write out a 0 to indicate uncompressed data
-                packet_data = packet_buffer.get_writable()
-                packet_buffer.reset()
-                VarInt.send(0, packet_buffer)
-                packet_buffer.send(packet_data)
-
-        VarInt.send(len(packet_buffer.get_writable()), socket)  # Packet Size
-        socket.send(packet_buffer.get_writable())  # Packet Payload
-
-    def write(self, socket, compression_threshold=None):
-        # buffer the data since we need to know the length of each packet's
-        # payload
-        packet_buffer = PacketBuffer()
-        # write packet's id right off the bat in the header
-        VarInt.send(self.id, packet_buffer)
-        # write every individual field
+        self.codec.read(self, file_object)
+
+    def read_lazily(self, file_object):
+        # As 'read', but if the packet's fields are given by its definition,
+        # each is decoded from 'file_object' only when first accessed (see
+        # 'PacketCodec.read_lazily'), so that 'file_object' must not change
+        # until then. Otherwise, all fields are read immediately.
+        codec = type(self).read is Packet.read and self.codec
+        if codec and codec.lazy:
+            codec.read_lazily(self, file_object)
+        else:
+            self.read(file_object)
+
+    def __getattr__(self, name):
+        # Called only when 'name' is not otherwise found, to decode any field
+        # of that name not yet read after a call to 'read_lazily'. This is
+        # also called when a property raises AttributeError, so otherwise the
+        # attribute is looked up again, to raise the original error.
+        reader = self.__dict__.get('_lazy_reader')
+        if reader is None or not reader.read_until(self, name):
+            return object.__getattribute__(self, name)
+        return self.__dict__[name]
+
+    def __getstate__(self):
+        # Copying or pickling a packet read lazily first decodes the fields
+        # not yet read, as its reader cannot be shared with the copy.
+        reader = self.__dict__.get('_lazy_reader')
+        if reader is not None:
+            reader.read_all(self)
+        return self.__dict__
+
+    def write(self, socket, compression_threshold=None,
+              compression_policy=None):
+        # Write the packet's ID and fields into a single buffer, which is then
+        # given the appropriate headers, compressing the data if necessary
+        # (as decided by 'compression_policy', if given), and sent all at once.
+        # A real socket may send only part of the data given to 'send', so
+        # 'sendall' is used instead where it is available.
+        packet_buffer = FrameBuffer()
+        packet_buffer.send(VarInt.encode(self.id))
         self.write_fields(packet_buffer)
-        self._write_buffer(socket, packet_buffer, compression_threshold)
+        send = getattr(socket, 'sendall', None) or socket.send
+        send(packet_buffer.frame(
+            compression_threshold, compression_policy, type(self)))
 
     def write_fields(self, packet_buffer):
         # Write the fields comprising the body of the packet (excluding the
         # length, packet ID, compression and encryption) into a PacketBuffer.
-        for field in self.definition:  # pylint: disable=not-an-iterable
-            for var_name, data_type in field.items():
-                data = getattr(self, var_name)
-                data_type.send_with_context(data, packet_buffer, self.context)
+        self.codec.write(self, packet_buffer)
 
     def __repr__(self):
         str = type(self).__name__
@@ -1,4 +1,7 @@
 from io import BytesIO
+from zlib import compress
+
+from minecraft.networking.types import VarInt
 
 
 class PacketBuffer(object):
@@ -26,3 +29,100 @@ class PacketBuffer(object):
 
     def get_writable(self):
         return self.bytes.getvalue()
+
+
+class PacketView(object):
+    """A read-only counterpart of 'PacketBuffer' over existing data, such as a
+       frame in a 'ReceiveBuffer', which is read in place rather than first
+       being copied into a new buffer.
+    """
+    __slots__ = 'data', 'offset'
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def read(self, length=None):
+        start = self.offset
+        end = len(self.data) if length is None else \
+            min(start + length, len(self.data))
+        self.offset = end
+        return self.data[start:end].tobytes()
+
+    def recv(self, length=None):
+        return self.read(length)
+
+    def reset_cursor(self):
+        self.offset = 0
+
+    def get_writable(self):
+        return self.data.tobytes()
+
+
+class FrameBuffer(object):
+    """A write-only counterpart of 'PacketBuffer' into which a packet's ID and
+       fields are written, to be sent as one frame.
+
+       Space is reserved at the start of a single 'bytearray' for the frame's
+       length prefix and compression header, which are filled in by 'frame'
+       once the packet's data is complete, so that the data need not be copied
+       to be preceded by them.
+    """
+    __slots__ = 'data',
+
+    # The space reserved for the length prefix and compression header, each a
+    # VarInt of at most 'VarInt.max_bytes' bytes.
+    HEADER_SIZE = 2 * VarInt.max_bytes
+
+    def __init__(self):
+        self.data = bytearray(self.HEADER_SIZE)
+
+    def send(self, value):
+        """
+        Writes the given bytes to the buffer, designed to emulate socket.send
+        :param value: The bytes to write
+        """
+        self.data += value
+
+    def get_writable(self):
+        return bytes(self.data[self.HEADER_SIZE:])
+
+    def frame(self, compression_threshold=None, compression_policy=None,
+              packet_class=None):
+        """Complete the frame holding the data written so far, compressing the
+           data if 'compression_threshold' is given and not exceeded by its
+           size, unless the threshold is -1. If 'compression_threshold' is
+           None, compression is disabled and the frame has no compression
+           header.
+
+           If a 'CompressionPolicy' is given as 'compression_policy', it
+           compresses the data, which is that of a packet of the class
+           'packet_class', or decides to leave it uncompressed.
+
+        :return: A 'memoryview' of the frame, which must be released before
+                 anything more is written to the buffer.
+        """
+        data, start = self.data, self.HEADER_SIZE
+        if compression_threshold is not None:
+            data_length = len(data) - start
+            if data_length > compression_threshold != -1:
+                if compression_policy is None:
+                    compressed_data = compress(memoryview(data)[start:])
+                else:
+                    compressed_data = compression_policy.compress(
+                        memoryview(data)[start:], packet_class)
+                if compressed_data is None:
+                    data_length = 0
+                else:
+                    del data[start:]
+                    data += compressed_data
+            else:
+                # A data length of 0 indicates uncompressed data.
+                data_length = 0
+            start -= VarInt.size(data_length)
+            VarInt.write_into(data_length, data, start)
+
+        length = len(data) - start
+        start -= VarInt.size(length)
+        VarInt.write_into(length, data, start)
+        return memoryview(data)[start:]
@@ -15,3 +15,50 @@ class PacketListener(object):
                 self.callback(packet)
                 return True
         return False
+
+
+class PacketListenerIndex(object):
+    """Maps packet classes to the callbacks of the 'PacketListener's in a list
+       which listen to packets of that class, in the order of the list, so
+       that a packet can be dispatched without testing every listener.
+
+       The callbacks for each packet class are found, when first needed, by
+       looking for the types listened to by each listener in the class's MRO.
+       The index is rebuilt when listeners are added to or removed from the
+       list, or when 'invalidate' is called.
+    """
+    __slots__ = 'listeners', '_callbacks', '_size'
+
+    def __init__(self, listeners):
+        """
+        :param listeners: The list of 'PacketListener's to be indexed.
+        """
+        self.listeners = listeners
+        self.invalidate()
+
+    def invalidate(self):
+        """Discard the index, which must be done if any listener in the list
+           is changed or replaced.
+        """
+        self._callbacks = {}
+        self._size = len(self.listeners)
+
+    def callbacks(self, packet_class):
+        """A tuple of the callbacks to be called with a packet of the given
+           class, as 'PacketListener.call_packet' would call them.
+        """
+        # The dictionary is fetched once, so that if the index is invalidated
+        # by another thread meanwhile, a stale result is not stored in the new
+        # dictionary.
+        if len(self.listeners) != self._size:
+            self.invalidate()
+        callbacks_by_class = self._callbacks
+        try:
+            return callbacks_by_class[packet_class]
+        except KeyError:
+            mro = frozenset(packet_class.__mro__)
+            callbacks = tuple(
+                listener.callback for listener in list(self.listeners)
+                if any(t in mro for t in listener.packets_to_listen))
+            callbacks_by_class[packet_class] = callbacks
+            return callbacks
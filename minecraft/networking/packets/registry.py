@@ -0,0 +1,135 @@
+"""Tables of the IDs, definitions and codecs of packets, computed once for
+   each protocol version instead of being evaluated for every packet.
+"""
+import threading
+from types import MappingProxyType
+
+from .codec import PacketCodec
+
+
+__all__ = 'ProtocolRegistry',
+
+
+# Maps each protocol version to its 'ProtocolRegistry'. This may be read
+# directly where speed matters, falling back on 'ProtocolRegistry.for_context'
+# if the version is absent.
+registries = {}
+
+
+class ProtocolRegistry(object):
+    """The IDs and definitions of all packet classes known to pyCraft, as
+       given by their 'get_id' and 'get_definition' methods for one protocol
+       version, and the 'PacketCodec' compiled from each definition.
+
+       'ids' and 'definitions' are read-only mappings from packet classes,
+       filled in full when the registry is created. Each definition is frozen
+       as a tuple of read-only mappings. Other packet classes, such as those
+       defined outside pyCraft, are looked up by 'packet_id' and 'definition'
+       without being cached.
+
+       'packets_by_id' gives the read-only table used by a 'PacketReactor' to
+       find the class of each packet it receives.
+
+       There is one registry per protocol version, shared by all connections
+       and obtained with 'ProtocolRegistry.for_context'. Packet IDs and
+       definitions must therefore depend only on the context's
+       'protocol_version'.
+    """
+    __slots__ = ('protocol_version', 'context', 'ids', 'definitions', 'codecs',
+                 '_tables')
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def for_context(cls, context):
+        """The registry for the protocol version of 'context'."""
+        registry = registries.get(context.protocol_version)
+        if registry is None:
+            registry = cls.for_version(context.protocol_version)
+        return registry
+
+    @classmethod
+    def for_version(cls, protocol_version):
+        """The registry for 'protocol_version', created if necessary."""
+        with cls._lock:
+            registry = registries.get(protocol_version)
+            if registry is None:
+                registry = cls(protocol_version)
+                registries[protocol_version] = registry
+        return registry
+
+    def __init__(self, protocol_version):
+        # Imported here, as the packet modules themselves import this one.
+        from minecraft.networking.connection import ConnectionContext
+        from . import clientbound, serverbound
+
+        self.protocol_version = protocol_version
+        self.context = ConnectionContext(protocol_version=protocol_version)
+
+        ids, definitions, tables = {}, {}, {}
+        for direction in clientbound, serverbound:
+            for state in (direction.handshake, direction.status,
+                          direction.login, direction.play):
+                table = tables[state.get_packets] = {}
+                for packet_class in state.get_packets(self.context):
+                    packet_id = packet_class.get_id(self.context)
+                    ids[packet_class] = packet_id
+                    table[packet_id] = packet_class
+                    try:
+                        definition = packet_class.get_definition(self.context)
+                    except AttributeError:
+                        continue
+                    if definition is not None:
+                        definitions[packet_class] = tuple(
+                            MappingProxyType(dict(field))
+                            for field in definition)
+
+        self.ids = MappingProxyType(ids)
+        self.definitions = MappingProxyType(definitions)
+        # Maps each 'get_packets' function to its table of packets by ID.
+        self._tables = {get_packets: MappingProxyType(table)
+                        for get_packets, table in tables.items()}
+        # Maps packet classes to their codecs, which are compiled on demand.
+        self.codecs = {}
+
+    def __repr__(self):
+        return 'ProtocolRegistry(%r)' % self.protocol_version
+
+    def packet_id(self, packet_class):
+        """The ID of 'packet_class' in this protocol version."""
+        packet_id = self.ids.get(packet_class)
+        if packet_id is None:
+            packet_id = packet_class.get_id(self.context)
+        return packet_id
+
+    def definition(self, packet_class):
+        """The definition of 'packet_class' in this protocol version."""
+        definition = self.definitions.get(packet_class)
+        if definition is None:
+            definition = packet_class.get_definition(self.context)
+        return definition
+
+    def codec(self, packet_class):
+        """The codec reading and writing the fields of 'packet_class' in this
+           protocol version, compiled on first use.
+        """
+        codec = self.codecs.get(packet_class)
+        if codec is None:
+            codec = PacketCodec(self.definition(packet_class), packet_class)
+            self.codecs[packet_class] = codec
+        return codec
+
+    def packets_by_id(self, get_packets):
+        """A read-only mapping from packet ID to packet class, for the packet
+           classes returned by 'get_packets', such as
+           'clientbound.play.get_packets'. The tables for the packets of each
+           state in each direction are built with the registry, and any other
+           is built on first use.
+        """
+        table = self._tables.get(get_packets)
+        if table is None:
+            table = MappingProxyType({
+                self.packet_id(packet_class): packet_class
+                for packet_class in get_packets(self.context)})
+            self._tables[get_packets] = table
+        return table
@@ -12,14 +12,28 @@ from .utility import Vector, class_and_instancemethod
 
 
 __all__ = (
-    'Type', 'Boolean', 'UnsignedByte', 'Byte', 'Short', 'UnsignedShort',
-    'Integer', 'FixedPoint', 'FixedPointInteger', 'Angle', 'VarInt', 'VarLong',
-    'Long', 'UnsignedLong', 'Float', 'Double', 'ShortPrefixedByteArray',
-    'VarIntPrefixedByteArray', 'TrailingByteArray', 'String', 'UUID',
-    'Position', 'NBT', 'PrefixedArray',
+    'Type', 'FixedWidthType', 'Boolean', 'UnsignedByte', 'Byte', 'Short',
+    'UnsignedShort', 'Integer', 'FixedPoint', 'FixedPointInteger', 'Angle',
+    'VarInt', 'VarLong', 'Long', 'UnsignedLong', 'Float', 'Double',
+    'ShortPrefixedByteArray', 'VarIntPrefixedByteArray', 'TrailingByteArray',
+    'String', 'UUID', 'Position', 'NBT', 'PrefixedArray', 'read_in_place',
 )
 
 
+def read_in_place(file_object, read_from, read):
+    """Read a value from 'file_object'. Objects that expose their data and
+       position, such as 'PacketView', are read in place by 'read_from', which
+       is given the data and position and returns '(value, position)', as does
+       'VarInt.read_from', and their position is then advanced. Other objects
+       are passed to 'read', which reads the value from them as from a file.
+    """
+    offset = getattr(file_object, 'offset', None)
+    if offset is None:
+        return read(file_object)
+    value, file_object.offset = read_from(file_object.data, offset)
+    return value
+
+
 class Type(object):
     # pylint: disable=no-self-argument
     __slots__ = ()
@@ -51,64 +65,73 @@ class Type(object):
                             'call "send_with_context" instead of "send".')
 
 
-class Boolean(Type):
-    @staticmethod
-    def read(file_object):
-        return struct.unpack('?', file_object.read(1))[0]
+class FixedWidthType(Type):
+    """A type whose values each have a representation of the same size, given
+       by the 'struct.Struct' in the 'packer' attribute of each subclass.
 
-    @staticmethod
-    def send(value, socket):
-        socket.send(struct.pack('?', value))
+       Besides 'read' and 'send', values can be read from and written into
+       buffers at a given offset with 'read_from' and 'write_into', which use
+       'unpack_from' and 'pack_into' and so avoid copying any data.
+    """
+    packer = None
 
+    @classmethod
+    def read(cls, file_object):
+        return read_in_place(file_object, cls.read_from, cls._read_file)
 
-class UnsignedByte(Type):
-    @staticmethod
-    def read(file_object):
-        return struct.unpack('>B', file_object.read(1))[0]
+    @classmethod
+    def _read_file(cls, file_object):
+        packer = cls.packer
+        return packer.unpack(file_object.read(packer.size))[0]
 
-    @staticmethod
-    def send(value, socket):
-        socket.send(struct.pack('>B', value))
+    @classmethod
+    def read_from(cls, data, offset=0):
+        """Decode a value from the bytes-like object 'data' at 'offset'.
 
+        :return: The tuple '(value, offset)', where 'offset' is the position
+                 in 'data' just after the value.
+        """
+        packer = cls.packer
+        return packer.unpack_from(data, offset)[0], offset + packer.size
 
-class Byte(Type):
-    @staticmethod
-    def read(file_object):
-        return struct.unpack('>b', file_object.read(1))[0]
+    @classmethod
+    def write_into(cls, value, buffer, offset=0):
+        """Encode 'value' into the 'bytearray' (or writable 'memoryview')
+           'buffer' at 'offset', where there must be room for it.
 
-    @staticmethod
-    def send(value, socket):
-        socket.send(struct.pack('>b', value))
+        :return: The position in 'buffer' just after the value.
+        """
+        packer = cls.packer
+        packer.pack_into(buffer, offset, value)
+        return offset + packer.size
 
+    @classmethod
+    def send(cls, value, socket):
+        socket.send(cls.packer.pack(value))
 
-class Short(Type):
-    @staticmethod
-    def read(file_object):
-        return struct.unpack('>h', file_object.read(2))[0]
 
-    @staticmethod
-    def send(value, socket):
-        socket.send(struct.pack('>h', value))
+class Boolean(FixedWidthType):
+    packer = struct.Struct('?')
 
 
-class UnsignedShort(Type):
-    @staticmethod
-    def read(file_object):
-        return struct.unpack('>H', file_object.read(2))[0]
+class UnsignedByte(FixedWidthType):
+    packer = struct.Struct('>B')
 
-    @staticmethod
-    def send(value, socket):
-        socket.send(struct.pack('>H', value))
 
+class Byte(FixedWidthType):
+    packer = struct.Struct('>b')
 
-class Integer(Type):
-    @staticmethod
-    def read(file_object):
-        return struct.unpack('>i', file_object.read(4))[0]
 
-    @staticmethod
-    def send(value, socket):
-        socket.send(struct.pack('>i', value))
+class Short(FixedWidthType):
+    packer = struct.Struct('>h')
+
+
+class UnsignedShort(FixedWidthType):
+    packer = struct.Struct('>H')
+
+
+class Integer(FixedWidthType):
+    packer = struct.Struct('>i')
 
 
 class FixedPoint(Type):
@@ -122,7 +145,7 @@ class FixedPoint(Type):
         return self.integer_type.read(file_object) / self.denominator
 
     def send(self, value, socket):
-        self.integer_type.send(int(value * self.denominator))
+        self.integer_type.send(int(value * self.denominator), socket)
 
 
 # This named instance is retained for backward compatibility:
@@ -142,107 +165,128 @@ class Angle(Type):
 
 
 class VarInt(Type):
+    """Variable-length integers, of at most 'max_bytes' bytes, each holding 7
+       bits of the value and a flag indicating whether another byte follows.
+
+       Besides 'read' and 'send', which work with file-like objects, VarInts
+       can be decoded from and encoded into buffers with 'read_from' and
+       'write_into', which avoid creating intermediate objects.
+    """
     max_bytes = 5
 
     @classmethod
     def read(cls, file_object):
-        number = 0
+        return read_in_place(file_object, cls.read_from, cls._read_file)
+
+    @classmethod
+    def _read_file(cls, file_object):
+        number = shift = 0
         # Limit of 'cls.max_bytes' bytes, otherwise its possible to cause
         # a DOS attack by sending VarInts that just keep going
-        bytes_encountered = 0
-        while True:
+        end = 7 * cls.max_bytes
+        while shift < end:
             byte = file_object.read(1)
-            if len(byte) < 1:
+            if not byte:
                 raise EOFError("Unexpected end of message.")
 
-            byte = ord(byte)
-            number |= (byte & 0x7F) << 7 * bytes_encountered
-            if not byte & 0x80:
-                break
+            byte = byte[0]
+            if byte < 0x80:
+                return number | byte << shift
+            number |= (byte & 0x7F) << shift
+            shift += 7
+        raise ValueError("Tried to read too long of a VarInt")
 
-            bytes_encountered += 1
-            if bytes_encountered > cls.max_bytes:
-                raise ValueError("Tried to read too long of a VarInt")
-        return number
+    @classmethod
+    def read_from(cls, data, offset=0):
+        """Decode a VarInt from the bytes-like object 'data' at 'offset'.
+
+        :return: The tuple '(value, offset)', where 'offset' is the position
+                 in 'data' just after the VarInt.
+        """
+        try:
+            number = data[offset]
+            if number < 0x80:
+                return number, offset + 1
+
+            number &= 0x7F
+            shift, end = 7, offset + cls.max_bytes
+            offset += 1
+            while offset < end:
+                byte = data[offset]
+                offset += 1
+                if byte < 0x80:
+                    return number | byte << shift, offset
+                number |= (byte & 0x7F) << shift
+                shift += 7
+        except IndexError:
+            raise EOFError("Unexpected end of message.")
+        raise ValueError("Tried to read too long of a VarInt")
 
-    @staticmethod
-    def send(value, socket):
-        out = bytes()
-        while True:
-            byte = value & 0x7F
+    @classmethod
+    def write_into(cls, value, buffer, offset=0):
+        """Encode 'value' into the 'bytearray' (or writable 'memoryview')
+           'buffer' at 'offset', where there must be room for 'size(value)'
+           bytes.
+
+        :return: The position in 'buffer' just after the VarInt.
+        """
+        if value < 0:
+            raise ValueError("Negative integer: %d" % value)
+        while value > 0x7F:
+            buffer[offset] = value & 0x7F | 0x80
             value >>= 7
-            out += struct.pack("B", byte | (0x80 if value > 0 else 0))
-            if value == 0:
-                break
-        socket.send(out)
+            offset += 1
+        buffer[offset] = value
+        return offset + 1
 
-    @staticmethod
-    def size(value):
-        for max_value, size in VARINT_SIZE_TABLE.items():
-            if value < max_value:
-                return size
-        raise ValueError("Integer too large")
+    @classmethod
+    def encode(cls, value):
+        """The encoding of 'value' as a 'bytes' object."""
+        if 0 <= value < 0x80:
+            return VARINT_BYTES[value]
+        if value < 0:
+            raise ValueError("Negative integer: %d" % value)
+        encoding = []
+        while value > 0x7F:
+            encoding.append(value & 0x7F | 0x80)
+            value >>= 7
+        encoding.append(value)
+        return bytes(encoding)
 
+    @classmethod
+    def send(cls, value, socket):
+        socket.send(cls.encode(value))
 
-class VarLong(VarInt):
-    max_bytes = 10
+    @classmethod
+    def size(cls, value):
+        size = (value.bit_length() + 6) // 7 or 1
+        if size > cls.max_bytes:
+            raise ValueError("Integer too large")
+        return size
 
 
-# Maps (maximum integer value -> size of VarInt in bytes)
-VARINT_SIZE_TABLE = {
-    2 ** 7: 1,
-    2 ** 14: 2,
-    2 ** 21: 3,
-    2 ** 28: 4,
-    2 ** 35: 5,
-    2 ** 42: 6,
-    2 ** 49: 7,
-    2 ** 56: 8,
-    2 ** 63: 9,
-    2 ** 70: 10,
-    2 ** 77: 11,
-    2 ** 84: 12
-}
-
-
-class Long(Type):
-    @staticmethod
-    def read(file_object):
-        return struct.unpack('>q', file_object.read(8))[0]
+class VarLong(VarInt):
+    max_bytes = 10
 
-    @staticmethod
-    def send(value, socket):
-        socket.send(struct.pack('>q', value))
 
+# The encodings of the VarInts consisting of a single byte, by value.
+VARINT_BYTES = tuple(bytes((value,)) for value in range(0x80))
 
-class UnsignedLong(Type):
-    @staticmethod
-    def read(file_object):
-        return struct.unpack('>Q', file_object.read(8))[0]
 
-    @staticmethod
-    def send(value, socket):
-        socket.send(struct.pack('>Q', value))
+class Long(FixedWidthType):
+    packer = struct.Struct('>q')
 
 
-class Float(Type):
-    @staticmethod
-    def read(file_object):
-        return struct.unpack('>f', file_object.read(4))[0]
+class UnsignedLong(FixedWidthType):
+    packer = struct.Struct('>Q')
 
-    @staticmethod
-    def send(value, socket):
-        socket.send(struct.pack('>f', value))
 
+class Float(FixedWidthType):
+    packer = struct.Struct('>f')
 
-class Double(Type):
-    @staticmethod
-    def read(file_object):
-        return struct.unpack('>d', file_object.read(8))[0]
 
-    @staticmethod
-    def send(value, socket):
-        socket.send(struct.pack('>d', value))
+class Double(FixedWidthType):
+    packer = struct.Struct('>d')
 
 
 class ShortPrefixedByteArray(Type):
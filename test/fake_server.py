@@ -0,0 +1,138 @@
+"""A minimal offline-mode Minecraft server, for exercising clients locally.
+
+   'FakeServer' listens on a local port, answers status queries, logs each
+   client in without encryption, and then hands the client's connection to
+   'play', which subclasses override to send their packets.
+"""
+import json
+import socket
+import threading
+import zlib
+
+from minecraft import SUPPORTED_PROTOCOL_VERSIONS
+from minecraft.networking.connection import ConnectionContext
+from minecraft.networking.framing import ReceiveBuffer
+from minecraft.networking.packets import (
+    clientbound, serverbound, PacketView
+)
+from minecraft.networking.types import VarInt
+
+PLAYER_UUID = '12345678-1234-5678-1234-567812345678'
+
+
+class FakeClientConnection(object):
+    """The server's side of the connection to one client."""
+    def __init__(self, server, client_socket):
+        self.server = server
+        self.socket = client_socket
+        self.file_object = client_socket.makefile('rb', 0)
+        self.receive_buffer = ReceiveBuffer()
+        self.context = ConnectionContext(
+            protocol_version=server.protocol_version)
+        self.compression_threshold = None
+        self._write_lock = threading.Lock()
+
+    def write_packet(self, packet):
+        packet.context = self.context
+        with self._write_lock:
+            packet.write(self.socket, self.compression_threshold)
+
+    def read_frame(self):
+        """The data of the next frame sent by the client, as a 'PacketView'
+           positioned after its packet ID, and that ID.
+
+        :raises EOFError: If the client closes the connection.
+        """
+        while True:
+            frame = self.receive_buffer.next_frame()
+            if frame is not None:
+                break
+            self.receive_buffer.fill(self.file_object)
+        packet_data = PacketView(bytes(frame))
+        if self.compression_threshold is not None:
+            if VarInt.read(packet_data):
+                packet_data = PacketView(zlib.decompress(
+                    packet_data.data[packet_data.offset:]))
+        return VarInt.read(packet_data), packet_data
+
+    def close(self):
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        self.socket.close()
+
+
+class FakeServer(object):
+    """Listens for clients on a local port, serving each on its own thread.
+
+    :param protocol_version: The protocol version offered to clients; by
+                             default, the latest supported.
+    :param compression_threshold: If not None, compression is enabled for
+                                  each client with this threshold.
+    """
+    def __init__(self, protocol_version=None, compression_threshold=None):
+        if protocol_version is None:
+            protocol_version = max(SUPPORTED_PROTOCOL_VERSIONS)
+        self.protocol_version = protocol_version
+        self.compression_threshold = compression_threshold
+        self.listen_socket = socket.socket()
+        self.listen_socket.bind(('127.0.0.1', 0))
+        self.listen_socket.listen(128)
+        self.address, self.port = self.listen_socket.getsockname()
+        self.connections = []
+        self._thread = threading.Thread(
+            target=self._accept, name='Fake Server', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.listen_socket.close()
+        for connection in list(self.connections):
+            connection.close()
+
+    def play(self, connection):
+        """Called on the client's thread once it has logged in."""
+
+    def _accept(self):
+        while True:
+            try:
+                client_socket, _address = self.listen_socket.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(client_socket,),
+                             name='Fake Client', daemon=True).start()
+
+    def _serve(self, client_socket):
+        connection = FakeClientConnection(self, client_socket)
+        self.connections.append(connection)
+        try:
+            _packet_id, handshake = connection.read_frame()
+            packet = serverbound.handshake.HandShakePacket(connection.context)
+            packet.read(handshake)
+            if packet.next_state == 1:
+                self._status(connection)
+            else:
+                self._login(connection)
+                self.play(connection)
+        except (EOFError, OSError):
+            pass
+        finally:
+            connection.close()
+            self.connections.remove(connection)
+
+    def _status(self, connection):
+        connection.read_frame()  # The status request.
+        connection.write_packet(clientbound.status.ResponsePacket(
+            json_response=json.dumps({'version': {
+                'name': 'fake', 'protocol': self.protocol_version}})))
+        while True:
+            connection.read_frame()
+
+    def _login(self, connection):
+        connection.read_frame()  # The login start packet.
+        if self.compression_threshold is not None:
+            connection.write_packet(clientbound.login.SetCompressionPacket(
+                threshold=self.compression_threshold))
+            connection.compression_threshold = self.compression_threshold
+        connection.write_packet(clientbound.login.LoginSuccessPacket(
+            UUID=PLAYER_UUID, Username='bot'))
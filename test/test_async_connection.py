@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import unittest
+
+from minecraft.exceptions import InvalidState
+from minecraft.networking.async_connection import AsyncConnection
+from minecraft.networking.packets import clientbound, serverbound
+
+from test.fake_server import FakeServer
+
+
+class KeepAliveServer(FakeServer):
+    """Sends one keep-alive to each client, records the ID of the client's
+       response, and then waits for the client to close the connection.
+    """
+    def __init__(self, **kwds):
+        super(KeepAliveServer, self).__init__(**kwds)
+        self.responses = []
+
+    def play(self, connection):
+        connection.write_packet(
+            clientbound.play.KeepAlivePacket(keep_alive_id=7))
+        keep_alive_id = serverbound.play.KeepAlivePacket.get_id(
+            connection.context)
+        while True:
+            packet_id, packet_data = connection.read_frame()
+            if packet_id == keep_alive_id:
+                packet = serverbound.play.KeepAlivePacket(connection.context)
+                packet.read(packet_data)
+                self.responses.append(packet.keep_alive_id)
+
+
+class AsyncConnectionTest(unittest.TestCase):
+    def setUp(self):
+        self.server = KeepAliveServer()
+        self.addCleanup(self.server.stop)
+
+    def test_connect(self):
+        server, exits = self.server, []
+        connection = AsyncConnection(
+            server.address, server.port, username='bot',
+            handle_exit=lambda: exits.append(True))
+
+        async def run():
+            received = asyncio.Event()
+
+            async def handle_keep_alive(packet):
+                received.set()
+            connection.register_packet_listener(
+                handle_keep_alive, clientbound.play.KeepAlivePacket)
+
+            # The server's version is found by a status query, after which
+            # the connection is reopened to log in, which is not an exit.
+            await connection.connect()
+            await asyncio.wait_for(received.wait(), 5)
+            self.assertEqual(exits, [])
+            self.assertTrue(connection.connected)
+
+            connection.disconnect()
+            await asyncio.wait_for(connection.wait_closed(), 5)
+            self.assertEqual(exits, [True])
+
+        asyncio.run(run())
+        self.assertEqual(server.responses, [7])
+
+    def test_write_unconnected(self):
+        connection = AsyncConnection(self.server.address, self.server.port)
+        with self.assertRaises(InvalidState):
+            connection.write_packet(serverbound.play.ChatPacket(message='x'))
+
+        async def run():
+            await connection.connect()
+            connection.disconnect()
+            with self.assertRaises(InvalidState):
+                connection.write_packet(
+                    serverbound.play.ChatPacket(message='x'))
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
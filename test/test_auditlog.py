@@ -0,0 +1,111 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import unittest
+
+from auditlog import AuditLog, JSONL
+
+LINE = re.compile(r'\[\d\d/\d\d/\d{4} \d\d:\d\d:\d\d\] (.*)\n')
+
+
+class AuditLogTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.path = os.path.join(self.directory, 'log.txt')
+
+    def audit_log(self, **kwds):
+        # By default, messages are only written when flushed explicitly.
+        kwds.setdefault('flush_size', 1000)
+        kwds.setdefault('flush_interval', 3600)
+        audit = AuditLog(self.path, **kwds)
+        self.addCleanup(audit.close)
+        return audit
+
+    def read(self, suffix=''):
+        with open(self.path + suffix, encoding='utf-8') as file:
+            return file.read()
+
+    def messages(self, suffix=''):
+        with open(self.path + suffix, encoding='utf-8') as file:
+            return [LINE.fullmatch(line).group(1) for line in file]
+
+    def test_text(self):
+        audit = self.audit_log()
+        audit.log('Teleported a to b')
+        audit.log('Sent a home')
+        audit.close()
+        self.assertEqual(self.messages(), ['Teleported a to b', 'Sent a home'])
+
+    def test_jsonl(self):
+        audit = self.audit_log(format=JSONL)
+        audit.log('Sent a home')
+        audit.close()
+        record, = [json.loads(line) for line in self.read().splitlines()]
+        self.assertEqual(record['message'], 'Sent a home')
+        self.assertIsInstance(record['time'], float)
+
+    def test_close_flushes(self):
+        audit = self.audit_log()
+        audit.log('Sent a home')
+        self.assertEqual(self.read(), '')
+        audit.close()
+        self.assertEqual(self.messages(), ['Sent a home'])
+        audit.close()
+        self.assertEqual(self.messages(), ['Sent a home'])
+
+    def test_flush_size(self):
+        audit = self.audit_log(flush_size=2)
+        audit.log('one')
+        audit.log('two')
+        deadline = time.time() + 5
+        while not self.read() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.messages(), ['one', 'two'])
+
+    def test_dropped(self):
+        audit = self.audit_log(capacity=2)
+        for message in ('one', 'two', 'three'):
+            audit.log(message)
+        audit.close()
+        self.assertEqual(audit.dropped, 1)
+        self.assertEqual(self.messages(), ['two', 'three'])
+
+    def test_size_rotation(self):
+        # Each message is longer than 'max_bytes', so each batch is rotated.
+        audit = self.audit_log(max_bytes=50, backups=2)
+        for index in range(4):
+            audit.log('%d %s' % (index, 'x' * 50))
+            audit.flush()
+        audit.close()
+        self.assertEqual(self.read(), '')
+        self.assertEqual([message[0] for message in self.messages('.1')],
+                         ['3'])
+        self.assertEqual([message[0] for message in self.messages('.2')],
+                         ['2'])
+        self.assertFalse(os.path.exists(self.path + '.3'))
+
+    def test_rotation_without_backups(self):
+        audit = self.audit_log(max_bytes=40, backups=0)
+        audit.log('x' * 40)
+        audit.flush()
+        audit.log('Sent a home')
+        audit.close()
+        self.assertEqual(self.messages(), ['Sent a home'])
+        self.assertFalse(os.path.exists(self.path + '.1'))
+
+    def test_time_rotation(self):
+        audit = self.audit_log(rotate_interval=0)
+        audit.log('one')
+        audit.flush()
+        audit.log('two')
+        audit.flush()
+        self.assertEqual(self.messages('.1'), ['two'])
+        self.assertEqual(self.messages('.2'), ['one'])
+
+
+if __name__ == '__main__':
+    unittest.main()
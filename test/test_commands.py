@@ -0,0 +1,80 @@
+import unittest
+
+from commands import CommandRegistry
+
+
+class CommandRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.errors = []
+        self.unknown = []
+        commands = self.commands = CommandRegistry()
+        commands.handle_usage_error = \
+            lambda sender, command: self.errors.append((sender, command.name))
+        commands.handle_unknown = \
+            lambda sender, name: self.unknown.append((sender, name))
+
+        @commands.command("tp", str, usage="!tp NAME")
+        def teleport(sender, target):
+            self.calls.append(('tp', sender, target))
+
+        @commands.command("sethome", int, int, int)
+        def sethome(sender, x, y, z):
+            self.calls.append(('sethome', sender, x, y, z))
+
+        commands.register(
+            "home", lambda sender: self.calls.append(('home', sender)))
+
+    def test_dispatch(self):
+        commands = self.commands
+        self.assertTrue(commands.dispatch('a', '!tp b'))
+        self.assertTrue(commands.dispatch('a', '!sethome 1 -2  3'))
+        self.assertTrue(commands.dispatch('a', '!home'))
+        self.assertEqual(self.calls, [('tp', 'a', 'b'),
+                                      ('sethome', 'a', 1, -2, 3),
+                                      ('home', 'a')])
+        self.assertEqual(self.errors + self.unknown, [])
+
+    def test_not_a_command(self):
+        for message in ('hello', '', '!', 'home !home'):
+            self.assertFalse(self.commands.is_command(message), message)
+            self.assertFalse(self.commands.dispatch('a', message), message)
+        self.assertEqual(self.calls + self.errors + self.unknown, [])
+
+    def test_unknown(self):
+        self.assertTrue(self.commands.dispatch('a', '!warp spawn'))
+        self.assertEqual(self.unknown, [('a', '!warp')])
+        self.assertEqual(self.calls + self.errors, [])
+
+    def test_arity(self):
+        # '!home now' was once treated as '!home', but commands now take
+        # exactly the arguments with which they were registered.
+        for message in ('!tp', '!tp b c', '!sethome 1 2', '!home now'):
+            self.assertTrue(self.commands.dispatch('a', message), message)
+        self.assertEqual(self.errors, [('a', 'tp'), ('a', 'tp'),
+                                       ('a', 'sethome'), ('a', 'home')])
+        self.assertEqual(self.calls + self.unknown, [])
+
+    def test_type(self):
+        self.assertTrue(self.commands.dispatch('a', '!sethome 1 two 3'))
+        self.assertEqual(self.errors, [('a', 'sethome')])
+        self.assertEqual(self.calls, [])
+
+    def test_usage(self):
+        commands = self.commands.commands
+        self.assertEqual(commands['!tp'].usage_error,
+                         'Failed! - Usage: !tp NAME')
+        self.assertEqual(commands['!sethome'].usage,
+                         '!sethome INT INT INT')
+        self.assertEqual(commands['!home'].usage, '!home')
+
+    def test_prefix(self):
+        commands = CommandRegistry(prefix='#')
+        commands.register('home', self.calls.append)
+        self.assertFalse(commands.dispatch('a', '!home'))
+        self.assertTrue(commands.dispatch('a', '#home'))
+        self.assertEqual(self.calls, ['a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import zlib
+from unittest import mock
+
+from minecraft import SUPPORTED_PROTOCOL_VERSIONS
+from minecraft.networking.connection import Connection, PlayingReactor
+from minecraft.networking.packets import PacketBuffer, clientbound
+from minecraft.networking.types import VarInt
+
+from test.test_packets import sample_packet
+
+
+def packet_data(packet):
+    # The ID and fields of 'packet', as in an uncompressed frame.
+    packet_buffer = PacketBuffer()
+    VarInt.send(packet.id, packet_buffer)
+    packet.write_fields(packet_buffer)
+    return packet_buffer.get_writable()
+
+
+def compressed_frame(data, claimed_size=None):
+    # A compressed frame of 'data', which claims to decompress to
+    # 'claimed_size' bytes, by default the actual size of 'data'.
+    if claimed_size is None:
+        claimed_size = len(data)
+    return VarInt.encode(claimed_size) + zlib.compress(data)
+
+
+class RecordingDecompressor(object):
+    """Wraps a zlib decompress object, counting the bytes it decompresses."""
+    # The original function, as 'zlib.decompressobj' is patched by the tests.
+    decompressobj = zlib.decompressobj
+
+    def __init__(self, decompressed):
+        self._decompressor = self.decompressobj()
+        self._decompressed = decompressed
+
+    def decompress(self, data, max_length=0):
+        result = self._decompressor.decompress(data, max_length)
+        self._decompressed.append(len(result))
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._decompressor, name)
+
+
+class DecompressionTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = Connection('localhost')
+        self.connection.context.protocol_version = \
+            max(SUPPORTED_PROTOCOL_VERSIONS)
+        self.connection.options.compression_enabled = True
+        self.reactor = PlayingReactor(self.connection)
+        self.packet = sample_packet(clientbound.play.ChatMessagePacket,
+                                    self.connection.context)
+        self.data = packet_data(self.packet)
+
+        # The number of bytes returned by each call to 'decompress'.
+        self.decompressed = []
+        patch = mock.patch('zlib.decompressobj',
+                           lambda: RecordingDecompressor(self.decompressed))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def decode(self, frame):
+        del self.decompressed[:]
+        return self.reactor.decode_packet(frame)
+
+    def test_round_trip(self):
+        packet = self.decode(compressed_frame(self.data))
+        self.assertEqual(packet_data(packet), self.data)
+        self.assertEqual(sum(self.decompressed), len(self.data))
+
+        # A data length of 0 marks a frame that is not compressed.
+        packet = self.reactor.decode_packet(b'\x00' + self.data)
+        self.assertEqual(packet_data(packet), self.data)
+
+    def test_wrong_size(self):
+        for claimed_size in (len(self.data) - 1, len(self.data) + 1, 1):
+            with self.subTest(claimed_size=claimed_size), \
+                    self.assertRaises(ValueError):
+                self.decode(compressed_frame(self.data, claimed_size))
+
+    def test_bomb(self):
+        # A packet claiming to be small but decompressing to 16 MB is
+        # rejected after decompressing no more than one byte beyond its
+        # claimed size.
+        bomb = self.data + bytes(2 ** 24)
+        for claimed_size in len(self.data), 100:
+            with self.assertRaises(ValueError):
+                self.decode(compressed_frame(bomb, claimed_size))
+            self.assertLessEqual(sum(self.decompressed), claimed_size + 1)
+
+    def test_skipped_bomb(self):
+        # A skipped packet is not decompressed beyond its packet ID.
+        self.connection.options.skip_unused_packets = True
+        unused = VarInt.encode(0x7F) + bytes(2 ** 20)
+        self.assertNotIn(0x7F, self.reactor.clientbound_packets)
+        self.assertIsNone(self.decode(compressed_frame(unused)))
+        self.assertLessEqual(sum(self.decompressed), VarInt.max_bytes)
+
+    def test_max_decompressed_size(self):
+        self.reactor.max_decompressed_size = len(self.data)
+        packet = self.decode(compressed_frame(self.data))
+        self.assertEqual(packet_data(packet), self.data)
+
+        # A packet claiming to exceed the maximum is rejected before any of
+        # it is decompressed, whatever its actual size.
+        self.reactor.max_decompressed_size = len(self.data) - 1
+        with self.assertRaises(ValueError):
+            self.decode(compressed_frame(self.data))
+        self.assertEqual(self.decompressed, [])
+
+        del self.reactor.max_decompressed_size
+        self.assertEqual(self.reactor.max_decompressed_size, 2 ** 23)
+        with self.assertRaises(ValueError):
+            self.decode(compressed_frame(self.data, 2 ** 23 + 1))
+        self.assertEqual(self.decompressed, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+import threading
+import time
+import unittest
+
+from minecraft import SUPPORTED_PROTOCOL_VERSIONS
+from minecraft.networking.connection import Connection, ConnectionContext
+from minecraft.networking.packets import (
+    clientbound, serverbound, PacketBuffer
+)
+from minecraft.networking.types import VarInt
+
+from test.fake_server import FakeServer
+from test.test_packets import sample_packet
+
+
+class FloodServer(FakeServer):
+    """Sends an 'EntityLookPacket' every 'interval' seconds for 'duration'
+       seconds, and records the time at which each chat message is received.
+    """
+    def __init__(self, interval=0.01, duration=2.0, **kwds):
+        super(FloodServer, self).__init__(**kwds)
+        self.interval, self.duration = interval, duration
+        self.playing = threading.Event()
+        self.chat_times = []
+
+    def play(self, connection):
+        reader = threading.Thread(target=self._read, args=(connection,),
+                                  name='Fake Client Reader', daemon=True)
+        reader.start()
+        packet = sample_packet(clientbound.play.EntityLookPacket,
+                               connection.context)
+        self.playing.set()
+        end = time.perf_counter() + self.duration
+        while time.perf_counter() < end:
+            connection.write_packet(packet)
+            time.sleep(self.interval)
+
+    def _read(self, connection):
+        chat_id = serverbound.play.ChatPacket.get_id(connection.context)
+        while True:
+            packet_id, _packet_data = connection.read_frame()
+            if packet_id == chat_id:
+                self.chat_times.append(time.perf_counter())
+
+
+class SkippedPacketFloodTest(unittest.TestCase):
+    def write_during_flood(self, skip_unused_packets):
+        # The delay between writing a chat message while the server floods
+        # the client with packets, and the server receiving it.
+        server = FloodServer()
+        connection = Connection(
+            server.address, server.port, username='bot',
+            skip_unused_packets=skip_unused_packets)
+        try:
+            connection.connect()
+            self.assertTrue(server.playing.wait(5))
+            time.sleep(0.2)
+            sent = time.perf_counter()
+            connection.write_packet(serverbound.play.ChatPacket(message='x'))
+            deadline = sent + server.duration
+            while not server.chat_times and time.perf_counter() < deadline:
+                time.sleep(0.005)
+            self.assertTrue(server.chat_times, 'the chat message was not '
+                            'sent during the flood')
+            return server.chat_times[0] - sent
+        finally:
+            connection.disconnect(immediate=True)
+            server.stop()
+
+    def test_write_during_flood(self):
+        # The skipped packets once kept the networking thread reading, so
+        # that queued packets were not sent until a needed packet arrived.
+        for skip_unused_packets in (False, True):
+            with self.subTest(skip_unused_packets=skip_unused_packets):
+                self.assertLess(self.write_during_flood(skip_unused_packets),
+                                0.1)
+
+
+class QueueFullPolicyTest(unittest.TestCase):
+    def connection(self, policy, limit=2):
+        return Connection('localhost', max_queued_packets=limit,
+                          queue_full_policy=policy)
+
+    def chat(self, message='x'):
+        return serverbound.play.ChatPacket(message=message)
+
+    def test_drop(self):
+        connection = self.connection('drop')
+        packets = [self.chat(), self.chat(), self.chat()]
+        self.assertEqual([connection.write_packet(packet)
+                          for packet in packets], [True, True, False])
+        self.assertEqual(list(connection._outgoing_packet_queue), packets[:2])
+        self.assertEqual(connection.dropped_packets, 1)
+
+    def test_coalesce(self):
+        connection = self.connection('coalesce')
+        chat, keep_alive = self.chat(), \
+            serverbound.play.KeepAlivePacket(keep_alive_id=1)
+        connection.write_packet(chat)
+        connection.write_packet(keep_alive)
+
+        new_chat = self.chat('y')
+        self.assertTrue(connection.write_packet(new_chat))
+        self.assertEqual(list(connection._outgoing_packet_queue),
+                         [keep_alive, new_chat])
+        self.assertEqual(connection.dropped_packets, 1)
+
+        # A packet of a class not already queued is discarded.
+        status = serverbound.play.ClientStatusPacket(action_id=0)
+        self.assertFalse(connection.write_packet(status))
+        self.assertEqual(list(connection._outgoing_packet_queue),
+                         [keep_alive, new_chat])
+        self.assertEqual(connection.dropped_packets, 2)
+
+    def test_block(self):
+        connection = self.connection('block')
+        # Writers only wait for room while there is a networking thread.
+        connection.networking_thread = threading.Thread()
+        connection.write_packet(self.chat())
+        connection.write_packet(self.chat())
+        last = self.chat()
+        writer = threading.Thread(target=connection.write_packet,
+                                  args=(last,), daemon=True)
+        writer.start()
+        writer.join(0.1)
+        self.assertTrue(writer.is_alive())
+
+        with connection._queue_not_full:
+            connection._outgoing_packet_queue.popleft()
+            connection._queue_not_full.notify()
+        writer.join(5)
+        self.assertFalse(writer.is_alive())
+        self.assertIs(connection._outgoing_packet_queue[-1], last)
+        self.assertEqual(connection.dropped_packets, 0)
+
+    def test_coalesce_during_appends(self):
+        # The queue was once searched while the networking thread, which
+        # appends to it without the lock, could change it, failing with
+        # "deque mutated during iteration".
+        connection = self.connection('coalesce', limit=50)
+        stop = threading.Event()
+
+        def networking_thread():
+            keep_alive = serverbound.play.KeepAlivePacket(keep_alive_id=1)
+            while not stop.is_set():
+                connection.write_packet(keep_alive)
+                if len(connection._outgoing_packet_queue) > 5000:
+                    with connection._write_lock:
+                        connection._outgoing_packet_queue.clear()
+
+        connection.networking_thread = threading.Thread(
+            target=networking_thread, daemon=True)
+        connection.networking_thread.start()
+        try:
+            for _ in range(5000):
+                connection.write_packet(self.chat())
+        finally:
+            stop.set()
+            connection.networking_thread.join()
+
+
+class PacketWriteTest(unittest.TestCase):
+    def test_partial_send(self):
+        # 'Packet.write' once used 'send', and ignored how much was sent.
+        class PartialSocket(object):
+            def __init__(self):
+                self.data = bytearray()
+
+            def send(self, data):
+                self.data += data[:1]
+                return 1
+
+            def sendall(self, data):
+                self.data += data
+
+        packet = serverbound.play.ChatPacket(
+            ConnectionContext(protocol_version=max(
+                SUPPORTED_PROTOCOL_VERSIONS)), message='x' * 100)
+        partial_socket = PartialSocket()
+        packet.write(partial_socket)
+        frame_buffer = PacketBuffer()
+        VarInt.send(packet.id, frame_buffer)
+        packet.write_fields(frame_buffer)
+        frame = frame_buffer.get_writable()
+        self.assertEqual(bytes(partial_socket.data),
+                         VarInt.encode(len(frame)) + frame)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import random
+import socket
+import threading
+import unittest
+
+from minecraft.networking import encryption
+from minecraft.networking.framing import ReceiveBuffer
+
+from test.test_framing import ChunkedStream, frame
+
+
+class DecryptionTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.cipher = encryption.create_AES_cipher(rng.randbytes(16))
+        self.frames = [rng.randbytes(length) for length in
+                       (0, 1, 14, 15, 16, 17, 127, 128, 5000, 70000, 3)]
+        self.data = b''.join(frame(data) for data in self.frames)
+        self.encrypted = self.cipher.encryptor().update(self.data)
+
+    def read_frames(self, receive_buffer, stream):
+        frames = []
+        while len(frames) < len(self.frames):
+            data = receive_buffer.next_frame()
+            if data is None:
+                receive_buffer.fill(stream)
+            else:
+                frames.append(bytes(data))
+        return frames
+
+    def test_readinto(self):
+        # Chunks of every size, including those no larger than the room
+        # 'update_into' needs beyond its input, are decrypted in place.
+        for size in (1, 15, 16, 17, 100, 4096, len(self.data) + 100):
+            with self.subTest(size=size):
+                wrapper = encryption.EncryptedFileObjectWrapper(
+                    ChunkedStream(self.encrypted, len(self.data)),
+                    self.cipher.decryptor())
+                data = bytearray()
+                buffer = bytearray(size)
+                length = wrapper.readinto(buffer)
+                while length:
+                    data += buffer[:length]
+                    length = wrapper.readinto(buffer)
+                self.assertEqual(data, self.data)
+
+    def test_fill(self):
+        for chunk_size in (1, 15, 16, 4096, len(self.data)):
+            with self.subTest(chunk_size=chunk_size):
+                wrapper = encryption.EncryptedFileObjectWrapper(
+                    ChunkedStream(self.encrypted, chunk_size),
+                    self.cipher.decryptor())
+                self.assertEqual(
+                    self.read_frames(ReceiveBuffer(), wrapper), self.frames)
+
+    def test_feed(self):
+        for chunk_size in (1, 15, 16, 4096, len(self.data)):
+            with self.subTest(chunk_size=chunk_size):
+                receive_buffer = ReceiveBuffer()
+                decryptor = self.cipher.decryptor()
+                frames = []
+                for start in range(0, len(self.encrypted), chunk_size):
+                    receive_buffer.feed(
+                        self.encrypted[start:start + chunk_size], decryptor)
+                    data = receive_buffer.next_frame()
+                    while data is not None:
+                        frames.append(bytes(data))
+                        data = receive_buffer.next_frame()
+                self.assertEqual(frames, self.frames)
+
+    def test_socket(self):
+        # Data sent through one 'EncryptedSocketWrapper' is received in full
+        # through the file object of another.
+        server, client = socket.socketpair()
+        self.addCleanup(server.close)
+        self.addCleanup(client.close)
+        sender = encryption.EncryptedSocketWrapper(
+            server, self.cipher.encryptor(), self.cipher.decryptor())
+        stream = encryption.EncryptedFileObjectWrapper(
+            client.makefile('rb', 0), self.cipher.decryptor())
+        thread = threading.Thread(target=sender.sendall, args=(self.data,))
+        thread.start()
+        try:
+            self.assertEqual(
+                self.read_frames(ReceiveBuffer(), stream), self.frames)
+        finally:
+            thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import io
+import unittest
+
+from minecraft.networking.framing import ReceiveBuffer
+from minecraft.networking.types import VarInt
+
+
+class ChunkedStream(object):
+    """A stream from which 'readinto' reads at most 'chunk_size' bytes."""
+    def __init__(self, data, chunk_size):
+        self.file = io.BytesIO(data)
+        self.chunk_size = chunk_size
+
+    def readinto(self, buffer):
+        return self.file.readinto(buffer[:self.chunk_size])
+
+
+def frame(data):
+    return VarInt.encode(len(data)) + data
+
+
+class ReceiveBufferTest(unittest.TestCase):
+    def read_frames(self, receive_buffer, stream, count):
+        frames = []
+        while len(frames) < count:
+            data = receive_buffer.next_frame()
+            if data is None:
+                receive_buffer.fill(stream)
+            else:
+                frames.append(bytes(data))
+        return frames
+
+    def test_chunks(self):
+        # Frames whose length prefixes and data are split between reads,
+        # including frames larger than the buffer.
+        frames = [bytes([index % 256]) * length for index, length in
+                  enumerate((0, 1, 127, 128, 300, 5000, 16384, 100000, 3))]
+        data = b''.join(frame(data) for data in frames)
+        for chunk_size in (1, 2, 3, 127, 4096, 65536, len(data)):
+            with self.subTest(chunk_size=chunk_size):
+                receive_buffer = ReceiveBuffer(size=8192)
+                stream = ChunkedStream(data, chunk_size)
+                self.assertEqual(
+                    self.read_frames(receive_buffer, stream, len(frames)),
+                    frames)
+                self.assertEqual(len(receive_buffer), 0)
+                self.assertIsNone(receive_buffer.next_frame())
+                with self.assertRaises(EOFError):
+                    receive_buffer.fill(stream)
+
+    def test_feed(self):
+        receive_buffer = ReceiveBuffer(size=16)
+        data = frame(b'abc') + frame(b'x' * 100)
+        receive_buffer.feed(data[:3])
+        self.assertIsNone(receive_buffer.next_frame())
+        receive_buffer.feed(data[3:])
+        self.assertEqual(bytes(receive_buffer.next_frame()), b'abc')
+        self.assertEqual(bytes(receive_buffer.next_frame()), b'x' * 100)
+
+    def test_max_frame_size(self):
+        # A frame of the greatest size is awaited, but a longer one rejected.
+        receive_buffer = ReceiveBuffer()
+        receive_buffer.feed(VarInt.encode(ReceiveBuffer.MAX_FRAME_SIZE))
+        self.assertIsNone(receive_buffer.next_frame())
+
+        receive_buffer = ReceiveBuffer()
+        receive_buffer.feed(VarInt.encode(ReceiveBuffer.MAX_FRAME_SIZE + 1))
+        with self.assertRaises(ValueError):
+            receive_buffer.next_frame()
+
+    def test_overlong_length_prefix(self):
+        receive_buffer = ReceiveBuffer()
+        receive_buffer.feed(b'\xff' * 4)
+        self.assertIsNone(receive_buffer.next_frame())
+        receive_buffer.feed(b'\xff')
+        with self.assertRaises(ValueError):
+            receive_buffer.next_frame()
+
+    def test_growth_follows_data(self):
+        # The buffer once grew to the length given by the prefix of an
+        # incomplete frame, which a server could overstate.
+        size = 65536
+        receive_buffer = ReceiveBuffer(size=size)
+        stream = ChunkedStream(
+            VarInt.encode(ReceiveBuffer.MAX_FRAME_SIZE) + b'x' * 10, size)
+        receive_buffer.fill(stream)
+        self.assertIsNone(receive_buffer.next_frame())
+        self.assertEqual(len(receive_buffer._buffer), size)
+
+        # It grows as the data of the frame arrives.
+        data = b'y' * 200000
+        receive_buffer = ReceiveBuffer(size=size)
+        stream = ChunkedStream(frame(data), 1000)
+        receive_buffer.fill(stream)
+        self.assertIsNone(receive_buffer.next_frame())
+        self.assertEqual(len(receive_buffer._buffer), size)
+        self.assertEqual(self.read_frames(receive_buffer, stream, 1), [data])
+        self.assertLess(len(receive_buffer._buffer), 4 * len(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
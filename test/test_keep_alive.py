@@ -0,0 +1,158 @@
+"""Measures how long the bot takes to answer keep-alives while many players
+   send it commands at once. The commands are run by the command workers,
+   so the networking thread should answer keep-alives as promptly as when
+   the bot is idle, even though every command waits on a slow home store.
+
+   Run as a script to print the latencies:
+
+       python -m test.test_keep_alive
+"""
+import contextlib
+import io
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+import types
+import unittest
+
+from minecraft.networking.packets import clientbound, serverbound
+
+from auditlog import AuditLog
+from executor import CommandExecutor
+from homes import HomeStore
+from host import RealmHost
+
+from test.fake_server import FakeServer
+
+# The time taken by each home store lookup, as if the disk were busy.
+LOOKUP_DELAY = 0.001
+
+
+class ChatSpamServer(FakeServer):
+    """Sends 'bursts' keep-alives, 'interval' seconds apart, each preceded by
+       a '!home' command from each of 'players' players, and records the time
+       taken by the client to answer each keep-alive, and the number of chat
+       messages it sends in reply to the commands.
+    """
+    def __init__(self, players, bursts=20, interval=0.05, **kwds):
+        super(ChatSpamServer, self).__init__(**kwds)
+        self.players, self.bursts, self.interval = players, bursts, interval
+        self.latencies = []
+        self.replies = 0
+        self.finished = threading.Event()
+        self._sent = {}
+
+    def play(self, connection):
+        reader = threading.Thread(target=self._read, args=(connection,),
+                                  name='Fake Client Reader', daemon=True)
+        reader.start()
+        for burst in range(self.bursts):
+            for player in range(self.players):
+                connection.write_packet(self._command(player))
+            self._sent[burst] = time.perf_counter()
+            connection.write_packet(
+                clientbound.play.KeepAlivePacket(keep_alive_id=burst))
+            time.sleep(self.interval)
+        reader.join()
+
+    def _command(self, player):
+        name = 'player%d' % player
+        return clientbound.play.ChatMessagePacket(
+            json_data='{"translate": "chat.type.text", "with": '
+                      '[{"text": "%s"}, "!home"]}' % name,
+            position=clientbound.play.ChatMessagePacket.Position.CHAT,
+            sender='00000000-0000-0000-0000-%012d' % player)
+
+    def _read(self, connection):
+        keep_alive_id = serverbound.play.KeepAlivePacket.get_id(
+            connection.context)
+        chat_id = serverbound.play.ChatPacket.get_id(connection.context)
+        expected_replies = self.players * self.bursts
+        try:
+            while len(self.latencies) < self.bursts or \
+                    self.replies < expected_replies:
+                packet_id, packet_data = connection.read_frame()
+                if packet_id == keep_alive_id:
+                    packet = serverbound.play.KeepAlivePacket(
+                        connection.context)
+                    packet.read(packet_data)
+                    self.latencies.append(
+                        time.perf_counter() - self._sent[packet.keep_alive_id])
+                elif packet_id == chat_id:
+                    self.replies += 1
+        finally:
+            self.finished.set()
+
+
+class LocalRealmHost(RealmHost):
+    # A 'RealmHost' whose realms are all served by 'server'.
+    def __init__(self, server, *args, **kwds):
+        super(LocalRealmHost, self).__init__(*args, **kwds)
+        self.server = server
+
+    def join_address(self, name):
+        return '%s:%d' % (self.server.address, self.server.port)
+
+
+class SlowHomeStore(HomeStore):
+    def get_home(self, *args, **kwds):
+        time.sleep(LOOKUP_DELAY)
+        return super(SlowHomeStore, self).get_home(*args, **kwds)
+
+
+def measure(players, bursts=20, timeout=30):
+    """Run the bot against a 'ChatSpamServer', returning the server."""
+    server = ChatSpamServer(players, bursts=bursts)
+    directory = tempfile.mkdtemp()
+    homes = SlowHomeStore(os.path.join(directory, 'homes.db'))
+    audit = AuditLog(os.path.join(directory, 'log.txt'))
+    executor = CommandExecutor()
+    auth_token = types.SimpleNamespace(
+        access_token='token',
+        profile=types.SimpleNamespace(id_='0', name='bot'))
+    host = LocalRealmHost(server, auth_token, 'bot', '1.16.3', homes, audit,
+                          executor, echo_chat=False)
+    host.add_realm('realm')
+    # Each command, and the end of the connection, prints to the console.
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            host.start()
+            server.finished.wait(timeout)
+        finally:
+            host.stop()
+            executor.shutdown()
+            audit.close()
+            homes.close()
+            server.stop()
+            shutil.rmtree(directory, ignore_errors=True)
+    return server
+
+
+class KeepAliveLatencyTest(unittest.TestCase):
+    def test_latency_under_command_load(self):
+        idle = measure(players=0)
+        loaded = measure(players=100)
+        for server in (idle, loaded):
+            self.assertEqual(len(server.latencies), server.bursts)
+        self.assertEqual(loaded.replies, loaded.players * loaded.bursts)
+
+        # Were the commands run on the networking thread, each burst would
+        # delay the keep-alive after it by at least 100 lookups, i.e. 100ms.
+        self.assertLess(statistics.median(loaded.latencies),
+                        statistics.median(idle.latencies) + 0.05)
+
+
+def main():
+    for players in (0, 100):
+        server = measure(players)
+        latencies = sorted(server.latencies)
+        print('%3d players: keep-alive latency median %.2f ms, max %.2f ms; '
+              '%d replies' % (players, 1000 * statistics.median(latencies),
+                              1000 * latencies[-1], server.replies))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+import random
+import unittest
+
+from minecraft import SUPPORTED_PROTOCOL_VERSIONS
+from minecraft.networking.connection import ConnectionContext
+from minecraft.networking.packets import clientbound
+from minecraft.networking.packets.clientbound.play import map_packet
+
+MapPacket = clientbound.play.MapPacket
+
+
+def apply_pixels_per_pixel(packet, map):
+    # The former way of applying a packet's pixels to a map.
+    for i in range(len(packet.pixels)):
+        x = packet.offset[0] + i % packet.width
+        z = packet.offset[1] + i // packet.width
+        map.pixels[x + map.width * z] = packet.pixels[i]
+
+
+def map_update(map_id, x, z, width, height, seed=0):
+    context = ConnectionContext(
+        protocol_version=max(SUPPORTED_PROTOCOL_VERSIONS))
+    pixels = random.Random(seed).randbytes(width * height)
+    return MapPacket(context, map_id=map_id, scale=0, icons=[],
+                     is_tracking_position=True, is_locked=False,
+                     width=width, height=height, offset=(x, z),
+                     pixels=pixels)
+
+
+class MapPacketTest(unittest.TestCase):
+    def check_updates(self, use_numpy):
+        rng = random.Random(1)
+        map = MapPacket.Map(1, use_numpy=use_numpy)
+        expected = MapPacket.Map(1)
+        for seed in range(40):
+            width, height = rng.randint(1, 128), rng.randint(1, 128)
+            x, z = rng.randint(0, 128 - width), rng.randint(0, 128 - height)
+            packet = map_update(1, x, z, width, height, seed)
+            packet.apply_to_map(map)
+            apply_pixels_per_pixel(packet, expected)
+            self.assertEqual(bytes(map.pixels), bytes(expected.pixels),
+                             (x, z, width, height))
+
+    def test_rows(self):
+        # The rows of each update are copied as by the former per-pixel loop.
+        self.check_updates(use_numpy=False)
+
+    @unittest.skipIf(map_packet.numpy is None, 'NumPy is not installed.')
+    def test_rows_numpy(self):
+        self.check_updates(use_numpy=True)
+
+    def test_out_of_bounds(self):
+        map = MapPacket.Map(1)
+        for x, z, width, height in ((1, 0, 128, 1), (0, 120, 10, 9),
+                                    (127, 127, 2, 2)):
+            with self.assertRaises(ValueError):
+                map_update(1, x, z, width, height).apply_to_map(map)
+        self.assertEqual(map.pixels, bytearray(128 * 128))
+
+    def test_apply_packets(self):
+        applied = []
+
+        class RecordingMapPacket(MapPacket):
+            def apply_to_map_set(self, map_set):
+                applied.append(self)
+                super(RecordingMapPacket, self).apply_to_map_set(map_set)
+
+        packets = [map_update(1, 0, 0, 10, 10, seed=1),
+                   map_update(2, 5, 5, 10, 10, seed=2),
+                   map_update(1, 0, 0, 128, 128, seed=3),
+                   map_update(1, 3, 4, 10, 10, seed=4),
+                   map_update(2, 0, 0, 128, 128, seed=5),
+                   map_update(2, 0, 0, 128, 127, seed=6)]
+        for packet in packets:
+            packet.__class__ = RecordingMapPacket
+
+        expected = MapPacket.MapSet()
+        for packet in packets:
+            packet.apply_to_map_set(expected)
+        del applied[:]
+
+        map_set = MapPacket.MapSet()
+        map_set.apply_packets(packets)
+        self.assertEqual(map_set.maps_by_id, expected.maps_by_id)
+        # Each packet followed by a whole update of the same map is skipped.
+        self.assertEqual(applied, [packets[2], packets[3], packets[4],
+                                   packets[5]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+import copy
+import unittest
+
+from minecraft import SUPPORTED_PROTOCOL_VERSIONS
+from minecraft.networking.connection import ConnectionContext
+from minecraft.networking.packets import (
+    clientbound, Packet, PacketBuffer, PacketView
+)
+from minecraft.networking import types
+
+UUID = '12345678-1234-5678-1234-567812345678'
+
+
+def sample_value(data_type):
+    """A value of the given field type, used to fill in packet definitions,
+       or None if there is no sample for the type.
+    """
+    samples = {
+        types.Boolean: True, types.UnsignedByte: 200, types.Byte: -5,
+        types.Short: -300, types.UnsignedShort: 60000,
+        types.Integer: -70000, types.Long: -2 ** 40,
+        types.UnsignedLong: 2 ** 63, types.Float: 1.5, types.Double: 2.25,
+        types.Angle: 90.0, types.VarLong: 2 ** 40, types.String: 'abc\xe9',
+        types.UUID: UUID, types.Position: types.Position(1, 2, 3),
+        types.VarIntPrefixedByteArray: b'xyz',
+        types.ShortPrefixedByteArray: b'xyz',
+        types.TrailingByteArray: b'xyz',
+    }
+    if data_type in samples:
+        return samples[data_type]
+    if isinstance(data_type, types.FixedPoint):
+        return 1.5
+    if isinstance(data_type, types.PrefixedArray):
+        element = sample_value(data_type.element_type)
+        return None if element is None else [element] * 2
+    if data_type is types.NBT:
+        import pynbt
+        return {'a': pynbt.TAG_Int(1)}
+    if not isinstance(data_type, type):
+        return None
+    if issubclass(data_type, types.VarInt):
+        return 300
+    if data_type.__name__ == 'EffectPosition':
+        return types.Vector(1.0, 2.0, 3.0)
+    if data_type.__name__ == 'Pitch':
+        return 2.0  # Exactly representable in every protocol version.
+    if issubclass(data_type, types.Vector):
+        return data_type(1, 2, 3)
+    if issubclass(data_type, types.MutableRecord):
+        return data_type(x=1, y=2, z=3, block_state_id=5)
+    return None
+
+
+def definition_packets(context):
+    # The clientbound play packet classes read and written only through
+    # their definitions, rather than by overriding 'read' or 'write_fields'.
+    for packet_class in clientbound.play.get_packets(context):
+        if packet_class.read is Packet.read and \
+           packet_class.write_fields is Packet.write_fields:
+            yield packet_class
+
+
+def sample_packet(packet_class, context):
+    # An instance of 'packet_class' with every field of its definition set.
+    fields = {}
+    for field in packet_class.get_definition(context):
+        for name, data_type in field.items():
+            fields[name] = sample_value(data_type)
+    return packet_class(context, **fields)
+
+
+class DefinitionRoundTripTest(unittest.TestCase):
+    """Every definition-based clientbound play packet, at every supported
+       protocol version, is written by its compiled codec exactly as by
+       writing each field with its own type, and read back unchanged.
+    """
+    def test_clientbound_play(self):
+        for protocol_version in sorted(SUPPORTED_PROTOCOL_VERSIONS):
+            context = ConnectionContext(protocol_version=protocol_version)
+            for packet_class in definition_packets(context):
+                with self.subTest(packet=packet_class.__name__,
+                                  protocol_version=protocol_version):
+                    self._test_packet(sample_packet(packet_class, context))
+
+    def _test_packet(self, packet):
+        context, definition = packet.context, packet.definition
+        for field in definition:
+            for name, data_type in field.items():
+                self.assertIsNotNone(
+                    getattr(packet, name),
+                    'no sample value for %r' % (data_type,))
+
+        expected = PacketBuffer()
+        for field in definition:
+            for name, data_type in field.items():
+                data_type.send_with_context(
+                    getattr(packet, name), expected, context)
+        packet_buffer = PacketBuffer()
+        packet.write_fields(packet_buffer)
+        self.assertEqual(packet_buffer.get_writable(),
+                         expected.get_writable())
+
+        for file_object in (PacketView(expected.get_writable()),
+                            expected):
+            expected.reset_cursor()
+            read_packet = type(packet)(context)
+            read_packet.read(file_object)
+            self.assertEqual(file_object.read(), b'')
+            for field in definition:
+                for name, data_type in field.items():
+                    value = getattr(read_packet, name)
+                    if not hasattr(value, 'save'):  # NBT tags lack __eq__.
+                        self.assertEqual(value, getattr(packet, name), name)
+            rewritten = PacketBuffer()
+            read_packet.write_fields(rewritten)
+            self.assertEqual(rewritten.get_writable(),
+                             expected.get_writable())
+
+
+class CustomRoundTripTest(unittest.TestCase):
+    """The clientbound play packets with hand-written 'read' and
+       'write_fields' methods round-trip unchanged.
+    """
+    def samples(self, context):
+        play = clientbound.play
+        protocol_version = context.protocol_version
+        combat = play.CombatEventPacket
+        yield combat(context, event=combat.EntityDeadEvent(
+            player_id=1, entity_id=2, message='x'))
+        yield combat(context, event=combat.EndCombatEvent(
+            duration=1, entity_id=2))
+        yield combat(context, event=combat.EnterCombatEvent())
+        yield play.FacePlayerPacket(
+            context, origin=1, x=1.0, y=2.0, z=3.0, entity_id=None)
+        yield play.FacePlayerPacket(
+            context, origin=1, x=1.0, y=2.0, z=3.0, entity_id=4,
+            entity_origin=0)
+        yield play.MapPacket(
+            context, map_id=1, scale=2, is_tracking_position=True,
+            is_locked=protocol_version >= 452,
+            icons=[play.MapPacket.MapIcon(
+                1, 2, (3, 4), 'n' if protocol_version >= 364 else None)],
+            width=2, height=1, offset=(3, 4), pixels=b'\x01\x02')
+        yield play.SpawnObjectPacket(
+            context, entity_id=1, object_uuid=UUID, type_id=2,
+            x=1 if protocol_version < 100 else 1.0, y=2, z=3, pitch=90.0,
+            yaw=180.0, data=1, velocity_x=1, velocity_y=2, velocity_z=3)
+        player_list = play.PlayerListItemPacket
+        yield player_list(
+            context, action_type=player_list.AddPlayerAction,
+            actions=[player_list.AddPlayerAction(
+                uuid=UUID, name='a', gamemode=1, ping=2, display_name='d',
+                properties=[player_list.PlayerProperty(
+                    name='t', value='v', signature=None)])])
+        yield player_list(
+            context, action_type=player_list.RemovePlayerAction,
+            actions=[player_list.RemovePlayerAction(uuid=UUID)])
+
+    def test_clientbound_play(self):
+        for protocol_version in sorted(SUPPORTED_PROTOCOL_VERSIONS):
+            context = ConnectionContext(protocol_version=protocol_version)
+            packet_classes = clientbound.play.get_packets(context)
+            for packet in self.samples(context):
+                if type(packet) not in packet_classes:
+                    continue
+                with self.subTest(packet=type(packet).__name__,
+                                  protocol_version=protocol_version):
+                    packet_buffer = PacketBuffer()
+                    packet.write_fields(packet_buffer)
+                    packet_buffer.reset_cursor()
+                    read_packet = type(packet)(context)
+                    read_packet.read(packet_buffer)
+                    self.assertEqual(packet_buffer.read(), b'')
+                    rewritten = PacketBuffer()
+                    read_packet.write_fields(rewritten)
+                    self.assertEqual(rewritten.get_writable(),
+                                     packet_buffer.get_writable())
+
+    def test_map_packet_is_locked(self):
+        # 'is_locked' was once read, but not written.
+        context = ConnectionContext(
+            protocol_version=max(SUPPORTED_PROTOCOL_VERSIONS))
+        for is_locked in (False, True):
+            packet = clientbound.play.MapPacket(
+                context, map_id=1, scale=2, is_tracking_position=True,
+                is_locked=is_locked, icons=[], width=0)
+            packet_buffer = PacketBuffer()
+            packet.write_fields(packet_buffer)
+            packet_buffer.reset_cursor()
+            read_packet = clientbound.play.MapPacket(context)
+            read_packet.read(packet_buffer)
+            self.assertEqual(read_packet.is_locked, is_locked)
+
+
+class LazyPacketTest(unittest.TestCase):
+    def setUp(self):
+        self.context = ConnectionContext(
+            protocol_version=max(SUPPORTED_PROTOCOL_VERSIONS))
+
+    def lazy_packet(self):
+        packet_class = clientbound.play.ChatMessagePacket
+        packet_buffer = PacketBuffer()
+        sample_packet(packet_class, self.context).write_fields(packet_buffer)
+        packet = packet_class(self.context)
+        packet.read_lazily(PacketView(packet_buffer.get_writable()))
+        return packet
+
+    def test_copy(self):
+        # A copy once shared the reader of the original, so that each
+        # decoded fields from where the other had left off.
+        for copy_function in (copy.copy, copy.deepcopy):
+            packet = self.lazy_packet()
+            packet_copy = copy_function(packet)
+            for name in packet.fields:
+                self.assertEqual(getattr(packet_copy, name),
+                                 getattr(packet, name), name)
+
+    def test_property_error(self):
+        # An AttributeError raised by a property was once replaced by one
+        # naming the property.
+        class BrokenPacket(Packet):
+            @property
+            def broken(self):
+                return self.missing
+
+        with self.assertRaisesRegex(AttributeError, "'missing'"):
+            BrokenPacket(self.context).broken
+
+
+class FixedPointTest(unittest.TestCase):
+    def test_send(self):
+        # 'FixedPoint.send' once failed to pass on its socket.
+        packet_buffer = PacketBuffer()
+        types.FixedPointInteger.send(-2.5, packet_buffer)
+        packet_buffer.reset_cursor()
+        self.assertEqual(types.FixedPointInteger.read(packet_buffer), -2.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
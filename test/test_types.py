@@ -0,0 +1,138 @@
+import io
+import unittest
+
+from minecraft.networking.packets import PacketBuffer, PacketView
+from minecraft.networking import types
+from minecraft.networking.types import VarInt, VarLong
+
+
+def boundaries(max_bytes):
+    # The least and greatest values encoded in each number of bytes.
+    for size in range(1, max_bytes + 1):
+        yield 2 ** (7 * (size - 1)) if size > 1 else 0
+        yield 2 ** (7 * size) - 1
+
+
+class VarIntTest(unittest.TestCase):
+    def test_round_trip(self):
+        for varint in VarInt, VarLong:
+            for value in boundaries(varint.max_bytes):
+                with self.subTest(type=varint.__name__, value=value):
+                    encoding = varint.encode(value)
+                    self.assertEqual(len(encoding), varint.size(value))
+
+                    packet_buffer = PacketBuffer()
+                    varint.send(value, packet_buffer)
+                    self.assertEqual(packet_buffer.get_writable(), encoding)
+
+                    packet_buffer.reset_cursor()
+                    self.assertEqual(varint.read(packet_buffer), value)
+                    view = PacketView(encoding + b'x')
+                    self.assertEqual(varint.read(view), value)
+                    self.assertEqual(view.offset, len(encoding))
+
+    def test_offsets(self):
+        values = [0, 1, 127, 128, 300, 2 ** 21, 2 ** 31 - 1, 5]
+        buffer = bytearray(3 + sum(map(VarInt.size, values)) + 2)
+        offset = 3
+        for value in values:
+            end = VarInt.write_into(value, buffer, offset)
+            self.assertEqual(buffer[offset:end], VarInt.encode(value))
+            offset = end
+        self.assertEqual(offset, len(buffer) - 2)
+
+        # Each value is read in place from any bytes-like object.
+        for data in bytes(buffer), buffer, memoryview(buffer):
+            offset = 3
+            for value in values:
+                read, end = VarInt.read_from(data, offset)
+                self.assertEqual(read, value)
+                self.assertEqual(end, offset + VarInt.size(value))
+                offset = end
+        self.assertEqual(VarInt.read_from(b'\x05'), (5, 1))
+
+    def test_max_bytes(self):
+        for varint in VarInt, VarLong:
+            max_bytes = varint.max_bytes
+            longest = b'\x80' * (max_bytes - 1) + b'\x01'
+            value = 2 ** (7 * (max_bytes - 1))
+            self.assertEqual(varint.read_from(longest), (value, max_bytes))
+            self.assertEqual(varint.read(io.BytesIO(longest)), value)
+
+            too_long = b'\x80' * max_bytes + b'\x00'
+            for read in (lambda: varint.read_from(too_long),
+                         lambda: varint.read(io.BytesIO(too_long)),
+                         lambda: varint.read(PacketView(too_long))):
+                with self.subTest(type=varint.__name__), \
+                        self.assertRaises(ValueError):
+                    read()
+            with self.assertRaises(ValueError):
+                varint.size(2 ** (7 * max_bytes))
+
+    def test_truncated(self):
+        for data in b'', b'\x80', b'\xff\xff':
+            with self.subTest(data=data):
+                with self.assertRaises(EOFError):
+                    VarInt.read_from(data)
+                with self.assertRaises(EOFError):
+                    VarInt.read(io.BytesIO(data))
+
+    def test_negative(self):
+        with self.assertRaises(ValueError):
+            VarInt.encode(-1)
+        with self.assertRaises(ValueError):
+            VarInt.write_into(-1, bytearray(5))
+        with self.assertRaises(ValueError):
+            VarLong.send(-2 ** 40, PacketBuffer())
+
+    def test_size(self):
+        # 'size' is computed from 'bit_length' rather than by encoding.
+        for value in list(range(1 << 15)) + \
+                [2 ** bits + delta for bits in range(15, 70)
+                 for delta in (-1, 0, 1)]:
+            self.assertEqual(VarLong.size(value), len(VarLong.encode(value)))
+        self.assertEqual(VarInt.size(2 ** 35 - 1), 5)
+
+
+class FixedWidthTypeTest(unittest.TestCase):
+    # '(type, value)' of each fixed-width type, with an extreme value.
+    FIELDS = ((types.Boolean, True), (types.UnsignedByte, 255),
+              (types.Byte, -128), (types.Short, -2 ** 15),
+              (types.UnsignedShort, 2 ** 16 - 1), (types.Integer, -2 ** 31),
+              (types.Long, 2 ** 63 - 1), (types.UnsignedLong, 2 ** 64 - 1),
+              (types.Float, -1.5), (types.Double, 2.0 ** -1000))
+
+    def test_offsets(self):
+        packet_buffer = PacketBuffer()
+        packet_buffer.send(b'abc')
+        for data_type, value in self.FIELDS:
+            data_type.send(value, packet_buffer)
+        data = packet_buffer.get_writable()
+
+        buffer = bytearray(len(data))
+        buffer[:3] = b'abc'
+        offset = 3
+        for data_type, value in self.FIELDS:
+            with self.subTest(type=data_type.__name__):
+                end = data_type.write_into(value, buffer, offset)
+                self.assertEqual(end - offset, data_type.packer.size)
+                self.assertEqual(data_type.read_from(data, offset),
+                                 (value, end))
+                offset = end
+        self.assertEqual(buffer, data)
+
+    def test_read(self):
+        # Values are read alike from streams and, in place, from views.
+        packet_buffer = PacketBuffer()
+        for data_type, value in self.FIELDS:
+            data_type.send(value, packet_buffer)
+        packet_buffer.reset_cursor()
+        view = PacketView(packet_buffer.get_writable())
+        for data_type, value in self.FIELDS:
+            self.assertEqual(data_type.read(packet_buffer), value)
+            self.assertEqual(data_type.read(view), value)
+        self.assertEqual(view.offset, len(view.data))
+
+
+if __name__ == '__main__':
+    unittest.main()